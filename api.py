@@ -1,74 +1,381 @@
 """API handler moved out of project.py for modularity.
 
 Provides APIHandler for weather and bird facts used by the game.
+
+The getters are called from the draw path (hub_ui.draw_home_screen) and
+from update_stats, so they must never wait on the network. Each value
+lives in a `StaleWhileRevalidate` cache: a getter returns whatever is
+cached right away. Once the value is older than its interval, the
+getter also starts one background refresh on a small thread pool, and
+the new value shows up on a later frame. Failed or timed-out refreshes
+keep the stale value and retry after a back-off.
+
+Where the data comes from is a `Provider`. By default weather is
+simulated in-process and facts come from the shipped corpus
+(fact_corpus.py); both are cheap, so they are fetched inline and there
+is a value on the very first call. Set MANGO_API_URL to fetch JSON over HTTP
+instead: ``<url>/weather`` and ``<url>/fact``. api_stub_server.py serves
+both locally for offline testing.
+
+HTTP providers given a `http_cache.ResponseCache` keep their last
+response on disk. The caches are seeded from it on startup, so the game
+draws the previous weather mood and fact at once. If that data is older
+than the interval, a conditional request (ETag / Last-Modified)
+revalidates it in the background.
 """
+import os
+import sys
 import time
+import json
 import random
+import threading
+
+from mango_log import get_logger
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+# Seconds a network provider may take before the refresh counts as failed
+DEFAULT_TIMEOUT = 3.0
+# First retry delay after a failure; doubles up to the cache's TTL
+RETRY_BACKOFF = 15.0
+
+WEATHER_CONDITIONS = ["sunny", "cloudy", "rainy", "stormy", "snowy"]
+BIRD_FACTS = [
+    "Lovebirds are native to Africa and Madagascar!",
+    "Lovebirds can live up to 15 years in captivity!",
+    "These birds got their name because they form strong pair bonds!",
+    "Lovebirds are very social and can learn to mimic sounds!",
+    "They can recognize themselves in mirrors!",
+    "Lovebirds sleep with their heads tucked under their wings!",
+    "They can fly up to 35 miles per hour!",
+    "Lovebirds have excellent color vision!",
+    "They communicate through various chirps and calls!",
+    "These birds are known for their playful personalities!"
+]
+FALLBACK_WEATHER = {"temperature": 20, "condition": "sunny", "description": "Sunny weather, 20°C"}
+FALLBACK_FACT = "Birds are amazing creatures! 🦜"
+
+
+def make_weather(temperature, condition):
+    return {
+        "temperature": temperature,
+        "condition": condition,
+        "description": f"{condition.title()} weather, {temperature}°C"
+    }
+
+
+# --- providers -----------------------------------------------------------------
+class Provider:
+    """Source of one value. fetch() may block; it runs off the render loop.
+
+    Providers whose fetch is instant set ``inline = True`` and are called
+    directly instead of going through the thread pool.
+    """
+
+    name = 'provider'
+    inline = False
+
+    def fetch(self, timeout):
+        raise NotImplementedError
+
+    def cached(self):
+        """Return (value, fetched_at) persisted from an earlier run, or None."""
+        return None
+
+
+class SimulatedWeather(Provider):
+    name = 'weather'
+    inline = True
+
+    def fetch(self, timeout):
+        return make_weather(random.randint(-10, 35), random.choice(WEATHER_CONDITIONS))
+
+
+class SimulatedFact(Provider):
+    name = 'fact'
+    inline = True
+
+    def fetch(self, timeout):
+        return random.choice(BIRD_FACTS)
+
+
+class CorpusFact(Provider):
+    """Facts drawn without repeats from the shipped corpus (see fact_corpus.py)."""
+    name = 'fact'
+    inline = True
+
+    def __init__(self, corpus, tags=None):
+        self.corpus = corpus
+        self.tags = tags
+
+    def fetch(self, timeout):
+        fact = self.corpus.sample(self.tags)
+        if fact is None:
+            raise LookupError(f'no facts tagged {self.tags}')
+        return fact
+
+
+def local_fact_provider():
+    """CorpusFact for the current language, or the built-in list if there is no corpus."""
+    try:
+        import fact_corpus
+        path = fact_corpus.corpus_path()
+        if path:
+            return CorpusFact(fact_corpus.FactCorpus(path))
+    except Exception as e:
+        get_logger('api').warning('fact corpus unavailable: %s', e)
+    return SimulatedFact()
+
+
+class HttpJsonProvider(Provider):
+    """GET a JSON document with urllib (no extra dependency) and parse it.
+
+    With a ResponseCache the body is stored on disk and later requests
+    are conditional; a 304 reuses the stored body.
+    """
+
+    def __init__(self, url, name=None, cache=None):
+        self.url = url
+        self.cache = cache
+        if name:
+            self.name = name
+
+    def fetch(self, timeout):
+        import urllib.request
+        import urllib.error
+        entry = self.cache.get(self.url) if self.cache is not None else None
+        headers = {'Accept': 'application/json'}
+        if entry is not None:
+            headers.update(self.cache.conditional_headers(entry))
+        req = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                body = resp.read().decode('utf-8')
+                etag, modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or entry is None:
+                raise
+            self.cache.touch(self.url)
+            return self.parse(json.loads(entry['body']))
+        value = self.parse(json.loads(body))
+        if self.cache is not None:
+            self.cache.put(self.url, body, etag, modified)
+        return value
+
+    def cached(self):
+        entry = self.cache.get(self.url) if self.cache is not None else None
+        if entry is None:
+            return None
+        try:
+            return self.parse(json.loads(entry['body'])), entry['fetched_at']
+        except Exception:
+            return None
+
+    def parse(self, data):
+        return data
+
+
+class HttpWeather(HttpJsonProvider):
+    name = 'weather'
+
+    def parse(self, data):
+        return make_weather(int(data['temperature']), str(data['condition']))
+
+
+class HttpFact(HttpJsonProvider):
+    name = 'fact'
+
+    def parse(self, data):
+        fact = data.get('fact') if isinstance(data, dict) else data
+        if not isinstance(fact, str) or not fact:
+            raise ValueError('no fact in response')
+        return fact
+
+
+def default_providers(base_url=None, cache=None):
+    """Return (weather, fact) providers: HTTP when MANGO_API_URL is set."""
+    base_url = base_url or os.environ.get('MANGO_API_URL')
+    if base_url and not IS_WASM:
+        base_url = base_url.rstrip('/')
+        return HttpWeather(base_url + '/weather', cache=cache), HttpFact(base_url + '/fact', cache=cache)
+    return SimulatedWeather(), local_fact_provider()
+
+
+# --- fetching ------------------------------------------------------------------
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Shared two-thread pool for provider fetches (None in the browser)."""
+    global _executor
+    if IS_WASM:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='mango-api')
+        return _executor
+
+
+class StaleWhileRevalidate:
+    """One cached value refreshed in the background when it goes stale.
+
+    get() never blocks on a non-inline provider: it returns the cached
+    value (or `fallback` before the first success) and, if the value is
+    older than `ttl` and no refresh is running, submits one. A refresh
+    still running after `timeout` is abandoned (its late result is
+    ignored) and treated as a failure.
+    """
+
+    def __init__(self, provider, ttl, fallback=None, timeout=DEFAULT_TIMEOUT,
+                 executor=None, clock=time.time):
+        self.provider = provider
+        self.ttl = ttl
+        self.fallback = fallback
+        self.timeout = timeout
+        self.executor = executor
+        self.clock = clock
+        self.value = None
+        self.updated_at = 0.0
+        self._next_try = 0.0
+        self._backoff = RETRY_BACKOFF
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._started = None
+        self.stats = {'refreshes': 0, 'errors': 0, 'timeouts': 0}
+        try:
+            seed = provider.cached()
+        except Exception:
+            seed = None
+        if seed is not None:
+            # last run's value; stale() decides whether it needs revalidating
+            self.value, self.updated_at = seed
+
+    @property
+    def refreshing(self):
+        return self._started is not None
+
+    def stale(self, now=None):
+        now = self.clock() if now is None else now
+        return self.value is None or now - self.updated_at > self.ttl
+
+    def get(self):
+        now = self.clock()
+        with self._lock:
+            if self._started is not None and now - self._started > self.timeout:
+                self.stats['timeouts'] += 1
+                self._failed(now, 'timed out')
+            start = self._started is None and self.stale(now) and now >= self._next_try
+            if start:
+                self._gen += 1
+                self._started = now
+                gen = self._gen
+        if start:
+            self._refresh(gen)
+        value = self.value
+        return value if value is not None else self.fallback
+
+    def _refresh(self, gen):
+        executor = self.executor
+        if self.provider.inline or executor is None:
+            self._run(gen)
+            return
+        try:
+            executor.submit(self._run, gen)
+        except Exception as e:
+            with self._lock:
+                self._failed(self.clock(), e)
+
+    def _run(self, gen):
+        try:
+            value = self.provider.fetch(self.timeout)
+        except Exception as e:
+            with self._lock:
+                if gen == self._gen:
+                    self.stats['errors'] += 1
+                    self._failed(self.clock(), e)
+            return
+        with self._lock:
+            if gen != self._gen or value is None:
+                return
+            self.value = value
+            self.updated_at = self.clock()
+            self._started = None
+            self._backoff = RETRY_BACKOFF
+            self.stats['refreshes'] += 1
+
+    def _failed(self, now, reason):
+        # caller holds the lock; bumping the generation drops a late result
+        self._gen += 1
+        self._started = None
+        self._next_try = now + min(self._backoff, self.ttl)
+        self._backoff = min(self._backoff * 2, self.ttl)
+        get_logger('api').warning('%s refresh failed: %s', self.provider.name, reason)
+
+    def invalidate(self):
+        """Make the next get() start a refresh."""
+        with self._lock:
+            self.updated_at = 0.0
+            self._next_try = 0.0
+
 
 class APIHandler:
     """Handle external API calls for weather, time, and bird facts."""
-    
-    def __init__(self):
-        self.weather_data = None
-        self.bird_fact = None
-        self.last_weather_update = 0
-        self.last_bird_fact_update = 0
+
+    def __init__(self, weather_provider=None, fact_provider=None, executor=None,
+                 timeout=DEFAULT_TIMEOUT, cache=None):
+        if weather_provider is None or fact_provider is None:
+            default_weather, default_fact = default_providers(cache=cache)
+            weather_provider = weather_provider or default_weather
+            fact_provider = fact_provider or default_fact
+        if executor is None:
+            executor = get_executor()
         self.weather_update_interval = 1800  # 30 minutes
         self.bird_fact_update_interval = 3600  # 1 hour
-    
+        self.weather = StaleWhileRevalidate(weather_provider, self.weather_update_interval,
+                                            FALLBACK_WEATHER, timeout, executor)
+        self.facts = StaleWhileRevalidate(fact_provider, self.bird_fact_update_interval,
+                                          FALLBACK_FACT, timeout, executor)
+
+    # cached values, for code that read the old attributes
+    @property
+    def weather_data(self):
+        return self.weather.value
+
+    @property
+    def bird_fact(self):
+        return self.facts.value
+
+    @property
+    def last_weather_update(self):
+        return self.weather.updated_at
+
+    @property
+    def last_bird_fact_update(self):
+        return self.facts.updated_at
+
     def get_weather(self):
-        """Get current weather data (using a free weather API).
+        """Get current weather data without blocking.
 
-        For the purposes of the game this returns simulated weather data if
-        no external API key is configured. The method caches results briefly.
+        Returns the cached weather (or a mild default before the first
+        fetch completes) and refreshes it in the background every
+        weather_update_interval seconds.
         """
-        current_time = time.time()
-        if current_time - self.last_weather_update > self.weather_update_interval:
-            try:
-                weather_conditions = ["sunny", "cloudy", "rainy", "stormy", "snowy"]
-                temperature = random.randint(-10, 35)
-                condition = random.choice(weather_conditions)
-                self.weather_data = {
-                    "temperature": temperature,
-                    "condition": condition,
-                    "description": f"{condition.title()} weather, {temperature}°C"
-                }
-                self.last_weather_update = current_time
-            except Exception as e:
-                print(f"Weather API error: {e}")
-                self.weather_data = {
-                    "temperature": 20,
-                    "condition": "sunny",
-                    "description": "Sunny weather, 20°C"
-                }
-        return self.weather_data
+        self.weather.ttl = self.weather_update_interval
+        return self.weather.get()
 
     def get_bird_fact(self):
-        """Get a random bird fact.
+        """Get a bird fact without blocking; a new one every bird_fact_update_interval."""
+        self.facts.ttl = self.bird_fact_update_interval
+        return self.facts.get()
 
-        Caches a fact for a while to avoid frequent lookups.
-        """
-        current_time = time.time()
-        if current_time - self.last_bird_fact_update > self.bird_fact_update_interval:
-            try:
-                bird_facts = [
-                    "Lovebirds are native to Africa and Madagascar!",
-                    "Lovebirds can live up to 15 years in captivity!",
-                    "These birds got their name because they form strong pair bonds!",
-                    "Lovebirds are very social and can learn to mimic sounds!",
-                    "They can recognize themselves in mirrors!",
-                    "Lovebirds sleep with their heads tucked under their wings!",
-                    "They can fly up to 35 miles per hour!",
-                    "Lovebirds have excellent color vision!",
-                    "They communicate through various chirps and calls!",
-                    "These birds are known for their playful personalities!"
-                ]
-                self.bird_fact = random.choice(bird_facts)
-                self.last_bird_fact_update = current_time
-            except Exception as e:
-                print(f"Bird facts API error: {e}")
-                self.bird_fact = "Birds are amazing creatures! 🦜"
-        return self.bird_fact
+    def set_fact_tags(self, *tags):
+        """Only show facts with one of these tags (none = any); takes effect now."""
+        provider = self.facts.provider
+        if hasattr(provider, 'tags'):
+            provider.tags = tags or None
+            self.facts.invalidate()
 
     def get_weather_mood_effect(self):
         """Get how weather affects Mango's mood (positive/negative integer).
@@ -77,7 +384,8 @@ class APIHandler:
         values reduce mood; positive values increase it.
         """
         weather = self.get_weather()
-        if not weather:
+        if not weather or self.weather_data is None:
+            # nothing fetched yet; don't let the placeholder move the mood
             return 0
         condition = weather["condition"]
         temperature = weather["temperature"]
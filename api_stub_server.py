@@ -0,0 +1,133 @@
+"""Local stand-in for the weather and bird-fact services.
+
+Serves the JSON that api.HttpWeather / api.HttpFact expect so the
+networked APIHandler path can be exercised offline:
+
+    GET /weather  -> {"temperature": 18, "condition": "cloudy"}
+    GET /fact     -> {"fact": "..."}
+
+Responses carry an ETag and Last-Modified header and answer matching
+conditional requests with 304, so the on-disk cache can be tested. The
+content only changes when rotate() is called (or every --rotate seconds).
+--delay makes every response slow, and --fail-every N turns every Nth
+request into a 503, for testing timeouts and stale-while-revalidate.
+
+    python api_stub_server.py --port 8765 --delay 0.5
+    MANGO_API_URL=http://127.0.0.1:8765 python main.py
+"""
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from api import BIRD_FACTS, WEATHER_CONDITIONS
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        srv = self.server
+        with srv.lock:
+            srv.requests += 1
+            n = srv.requests
+        if srv.delay:
+            time.sleep(srv.delay)
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if srv.fail_every and n % srv.fail_every == 0:
+            return self._send(503, {'error': 'unavailable'})
+        with srv.lock:
+            if srv.rotate_every and time.time() - srv.rotated_at >= srv.rotate_every:
+                srv.rotate()
+            body = srv.content.get(path.lstrip('/'))
+            modified = srv.rotated_at
+        if body is None:
+            return self._send(404, {'error': 'not found'})
+        data = json.dumps(body).encode('utf-8')
+        etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+        last_modified = formatdate(modified, usegmt=True)
+        inm = self.headers.get('If-None-Match')
+        if inm == etag or (inm is None and self.headers.get('If-Modified-Since') == last_modified):
+            with srv.lock:
+                srv.not_modified += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self._send(200, body, {'ETag': etag, 'Last-Modified': last_modified})
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, fmt, *args)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def rotate(self):
+        """Pick new weather and a new fact (changes both ETags)."""
+        self.content = {
+            'weather': {'temperature': self.rng.randint(-10, 35), 'condition': self.rng.choice(WEATHER_CONDITIONS)},
+            'fact': {'fact': self.rng.choice(BIRD_FACTS)},
+        }
+        # whole seconds, as Last-Modified can't carry more
+        self.rotated_at = float(int(time.time()))
+
+
+def make_server(host='127.0.0.1', port=0, delay=0.0, fail_every=0, seed=None, verbose=False,
+                rotate_every=0.0):
+    """Return the stub HTTP server (port 0 picks a free one)."""
+    server = StubServer((host, port), StubHandler)
+    server.delay = delay
+    server.fail_every = fail_every
+    server.rotate_every = rotate_every
+    server.rng = random.Random(seed)
+    server.verbose = verbose
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.not_modified = 0
+    server.rotate()
+    return server
+
+
+def start(**kwargs):
+    """Serve in a daemon thread; returns (server, base_url). Call server.shutdown()."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name='api-stub', daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f'http://{host}:{port}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds to wait before each response')
+    parser.add_argument('--fail-every', type=int, default=0, help='answer every Nth request with 503')
+    parser.add_argument('--rotate', type=float, default=0.0, help='change the content every N seconds')
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, args.delay, args.fail_every, verbose=True,
+                         rotate_every=args.rotate)
+    print(f'API stub on http://{args.host}:{server.server_address[1]} (/weather, /fact)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
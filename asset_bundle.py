@@ -0,0 +1,310 @@
+"""Single-file asset bundle.
+
+Packs the files under ``assets/`` into one binary file so the game opens
+(and the web build fetches) one file instead of dozens. Layout::
+
+    b'MNGB' | u16 version | u32 entry count
+    per entry: u16 name length | name (utf-8, posix path) | u64 offset | u64 length
+    file data, each entry aligned to 16 bytes
+
+On desktop the bundle is memory-mapped; in the browser it is read in one
+go. Either way `view(name)` returns a zero-copy memoryview slice that the
+loaders hand to pygame (``pygame.image.load`` via a file-like reader, or
+``mixer.Sound(buffer=...)`` for PCM WAV data).
+
+The game uses ``assets.bundle`` when it exists (override with
+MANGO_ASSET_BUNDLE, disable with MANGO_ASSET_BUNDLE=0); files not found
+in the bundle are still read from disk. On desktop a file edited after
+the bundle was built wins over its bundled copy, with a one-time warning
+to rebuild the bundle.
+
+``package_web.py --bundle`` builds it into the web output.
+
+Build it with::
+
+    python asset_bundle.py build [--root assets] [--out assets.bundle]
+    python asset_bundle.py list [assets.bundle]
+"""
+import io
+import os
+import sys
+import struct
+import argparse
+
+from mango_log import get_logger
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+MAGIC = b'MNGB'
+VERSION = 1
+ALIGN = 16
+DEFAULT_PATH = 'assets.bundle'
+
+_HEADER = struct.Struct('<4sHI')
+_NAME_LEN = struct.Struct('<H')
+_SPAN = struct.Struct('<QQ')
+
+
+class BundleError(Exception):
+    pass
+
+
+def normalize(name):
+    """Return the bundle key for a path: relative, posix separators."""
+    name = os.path.normpath(name).replace('\\', '/')
+    return name[2:] if name.startswith('./') else name
+
+
+def build(root='assets', out=DEFAULT_PATH, exclude_ext=('.tmp', '.md'), base='.'):
+    """Pack every file under base/root into out and return the entry count.
+
+    Entry names are relative to base (``assets/...``), which is the
+    directory the game runs from.
+    """
+    names = []
+    for dirpath, dirnames, filenames in os.walk(os.path.join(base, root)):
+        dirnames.sort()
+        for fn in sorted(filenames):
+            if fn.startswith('.') or fn.endswith(tuple(exclude_ext)):
+                continue
+            names.append(normalize(os.path.relpath(os.path.join(dirpath, fn), base)))
+    encoded = [n.encode('utf-8') for n in names]
+    index_size = _HEADER.size + sum(_NAME_LEN.size + len(e) + _SPAN.size for e in encoded)
+    offset = _align(index_size)
+    spans = []
+    for name in names:
+        length = os.path.getsize(os.path.join(base, name))
+        spans.append((offset, length))
+        offset = _align(offset + length)
+
+    tmp = out + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(names)))
+        for e, (off, length) in zip(encoded, spans):
+            f.write(_NAME_LEN.pack(len(e)))
+            f.write(e)
+            f.write(_SPAN.pack(off, length))
+        for name, (off, length) in zip(names, spans):
+            f.write(b'\0' * (off - f.tell()))
+            with open(os.path.join(base, name), 'rb') as src:
+                f.write(src.read())
+    os.replace(tmp, out)
+    return len(names)
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+class _Reader(io.RawIOBase):
+    """Seekable read-only file object over a memoryview (no up-front copy)."""
+
+    def __init__(self, view, name=''):
+        self._view = view
+        self._pos = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), len(self._view) - self._pos)
+        if n <= 0:
+            return 0
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, min(offset, len(self._view)))
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+class AssetBundle:
+    """Read-only view of a bundle file."""
+
+    def __init__(self, path=DEFAULT_PATH, use_mmap=None):
+        self.path = path
+        self._file = None
+        self._mmap = None
+        if use_mmap is None:
+            use_mmap = not IS_WASM
+        if use_mmap:
+            try:
+                import mmap
+                self._file = open(path, 'rb')
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._mmap
+            except Exception:
+                self._close_file()
+                data = None
+        else:
+            data = None
+        if data is None:
+            # web: one read of the whole bundle
+            with open(path, 'rb') as f:
+                data = f.read()
+        self._data = memoryview(data)
+        self.index = self._read_index()
+        # files on disk newer than this were edited after the build
+        self.mtime = os.path.getmtime(path)
+
+    def _read_index(self):
+        data = self._data
+        if len(data) < _HEADER.size:
+            raise BundleError(f'{self.path}: truncated header')
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise BundleError(f'{self.path}: not a v{VERSION} asset bundle')
+        index = {}
+        pos = _HEADER.size
+        for _ in range(count):
+            (n,) = _NAME_LEN.unpack_from(data, pos)
+            pos += _NAME_LEN.size
+            name = bytes(data[pos:pos + n]).decode('utf-8')
+            pos += n
+            off, length = _SPAN.unpack_from(data, pos)
+            pos += _SPAN.size
+            if off + length > len(data):
+                raise BundleError(f'{self.path}: entry {name} out of range')
+            index[name] = (off, length)
+        return index
+
+    def __contains__(self, name):
+        return normalize(name) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def names(self):
+        return sorted(self.index)
+
+    def view(self, name):
+        """Return a zero-copy memoryview of name's bytes (KeyError if absent)."""
+        off, length = self.index[normalize(name)]
+        return self._data[off:off + length]
+
+    def open(self, name):
+        """Return a seekable file object over name's bytes."""
+        return _Reader(self.view(name), normalize(name))
+
+    def _close_file(self):
+        try:
+            if self._file is not None:
+                self._file.close()
+        except Exception:
+            pass
+        self._file = None
+
+    def close(self):
+        try:
+            self._data.release()
+        except Exception:
+            pass
+        try:
+            if self._mmap is not None:
+                self._mmap.close()
+        except Exception:
+            pass
+        self._mmap = None
+        self._close_file()
+
+
+_bundle = None
+_bundle_checked = False
+_warned_stale = False
+
+
+def get_bundle():
+    """Return the game's AssetBundle, or None when no bundle is present."""
+    global _bundle, _bundle_checked
+    if not _bundle_checked:
+        _bundle_checked = True
+        path = os.environ.get('MANGO_ASSET_BUNDLE', DEFAULT_PATH)
+        if path and path != '0' and os.path.exists(path):
+            try:
+                _bundle = AssetBundle(path)
+            except Exception as e:
+                get_logger('assets').warning('ignoring bundle %s: %s', path, e)
+                _bundle = None
+    return _bundle
+
+
+def reset():
+    """Forget the opened bundle (tests, or after rebuilding it)."""
+    global _bundle, _bundle_checked, _warned_stale
+    if _bundle is not None:
+        _bundle.close()
+    _bundle = None
+    _bundle_checked = False
+    _warned_stale = False
+
+
+def bundle_for(path):
+    """Return the bundle to read path from, or None to read it from disk."""
+    global _warned_stale
+    bundle = get_bundle()
+    if bundle is None or path not in bundle:
+        return None
+    if IS_WASM:
+        return bundle
+    try:
+        edited = os.path.getmtime(path) > bundle.mtime
+    except OSError:
+        return bundle
+    if edited and not _warned_stale:
+        _warned_stale = True
+        get_logger('assets').warning('%s is older than %s; reading edited files from disk '
+                                     '(rebuild it with: python asset_bundle.py build)', bundle.path, path)
+    return None if edited else bundle
+
+
+def exists(path):
+    """True if path is in the bundle or on disk."""
+    if bundle_for(path) is not None:
+        return True
+    return os.path.exists(path)
+
+
+def open_asset(path):
+    """Return a readable binary file for path, from the bundle when possible."""
+    bundle = bundle_for(path)
+    if bundle is not None:
+        return bundle.open(path)
+    return open(path, 'rb')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or inspect the asset bundle.')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    b = sub.add_parser('build', help='pack a directory into a bundle')
+    b.add_argument('--root', default='assets')
+    b.add_argument('--out', default=DEFAULT_PATH)
+    ls = sub.add_parser('list', help='list bundle entries')
+    ls.add_argument('bundle', nargs='?', default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == 'build':
+        n = build(args.root, args.out)
+        print(f'wrote {args.out}: {n} files, {os.path.getsize(args.out)} bytes')
+    else:
+        bundle = AssetBundle(args.bundle)
+        for name in bundle.names():
+            off, length = bundle.index[name]
+            print(f'{length:10d}  {off:10d}  {name}')
+        bundle.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,150 +1,93 @@
-import os
 import sys
-import pygame
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except Exception:
-    Image = None
-    PIL_AVAILABLE = False
+
+from resources import get_resources
+from asset_bundle import exists as asset_exists
+from mango_log import get_logger
+
+log = get_logger('assets')
 
 # Detect WASM environment
 IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
 
+# Size every Mango mood sprite is processed to
+SPRITE_SIZE = (100, 100)
 
-def load_background_images(game):
-    """Load background images for hub and flappy into the provided game instance.
+HUB_BG_PATH = "assets/backgrounds/hub_bg.jpg"
+FLAPPY_BG_PATH = "assets/backgrounds/flappy_bg.jpg"
+FLYING2_PATH = "assets/sprites/mango_flying2.png"
+TREE_PATH = "assets/sprites/tree.png"
 
-    This mirrors the original behavior but lives in a small helper module to
-    keep project.py focused on game flow.
-    """
-    game.hub_background = None
-    game.flappy_background = None
+SPRITE_FILES = {
+    'idle': 'mango_idle.png',
+    'happy': 'mango_happy.png',
+    'sad': 'mango_sad.png',
+    'tired': 'mango_tired.png',
+    'dirty': 'mango_dirty.png',
+    'flying': 'mango_flying.png',
+}
 
-    try:
-        # Try to load hub background
-        hub_bg_path = "assets/backgrounds/hub_bg.jpg"
-        if os.path.exists(hub_bg_path):
-            game.hub_background = pygame.image.load(hub_bg_path)
-            w, h = game.screen.get_size()
-            game.hub_background = pygame.transform.scale(game.hub_background, (w, h))
-    except Exception:
-        game.hub_background = None
 
+def _load_background(game, path):
     try:
-        # Try to load flappy background
-        flappy_bg_path = "assets/backgrounds/flappy_bg.jpg"
-        if os.path.exists(flappy_bg_path):
-            game.flappy_background = pygame.image.load(flappy_bg_path)
-            w, h = game.screen.get_size()
-            game.flappy_background = pygame.transform.scale(game.flappy_background, (w, h))
+        w, h = game.screen.get_size()
+        return get_resources(game).scaled(path, (w, h), 'scale', owner='game', alpha=False)
     except Exception:
-        game.flappy_background = None
+        return None
 
 
-def load_mango_sprites(game):
-    """Load Mango sprite images into the game instance.
+def load_hub_background(game):
+    game.hub_background = _load_background(game, HUB_BG_PATH)
 
-    This is a near-copy of the original helper but adjusted to reference the
-    passed-in `game` object. It leaves the same fallbacks and printing so the
-    runtime behavior is unchanged.
+
+def load_flappy_background(game):
+    game.flappy_background = _load_background(game, FLAPPY_BG_PATH)
+
+
+def load_background_images(game):
+    """Load background images for hub and flappy into the provided game instance.
+
+    Backgrounds are scaled to the screen size through the shared
+    ResourceManager so other modules asking for the same size reuse them.
     """
-    game.mango_sprites = {}
+    load_hub_background(game)
+    load_flappy_background(game)
 
-    sprite_files = {
-        'idle': 'mango_idle.png',
-        'happy': 'mango_happy.png',
-        'sad': 'mango_sad.png',
-        'tired': 'mango_tired.png',
-        'dirty': 'mango_dirty.png',
-        'flying': 'mango_flying.png',
-    }
-
-    def load_and_prepare(path, size=(100, 100)):
-        # In WASM, avoid PIL Image.LANCZOS and pygame.transform.smoothscale - use simpler methods
-        if IS_WASM:
-            # WASM: use simple pygame loading with basic scale
-            try:
-                print(f'[WASM] Loading sprite with simple scale: {path}')
-                s = pygame.image.load(path).convert_alpha()
-                # Use basic scale instead of smoothscale
-                return pygame.transform.scale(s, size)
-            except Exception as e:
-                print(f'[WASM] Failed to load sprite {path}: {e}')
-                return None
-        
-        # Desktop: Prefer PIL if available for better resizing/alpha handling
-        if PIL_AVAILABLE and Image is not None:
-            try:
-                img = Image.open(path).convert('RGBA')
-
-                # Trim fully-transparent borders if present
-                bbox = img.split()[-1].getbbox()
-                if bbox:
-                    img = img.crop(bbox)
-
-                # Resize preserving aspect into a square canvas
-                # Use LANCZOS (high quality) on desktop
-                img.thumbnail(size, Image.LANCZOS)
-                canvas = Image.new('RGBA', size, (0, 0, 0, 0))
-                x = (size[0] - img.width) // 2
-                y = (size[1] - img.height) // 2
-                canvas.paste(img, (x, y), img)
-
-                # Boost alpha if the sprite is accidentally faint
-                try:
-                    alpha = canvas.split()[-1]
-                    avg = sum(alpha.getdata()) / (size[0] * size[1])
-                    if avg < 60:
-                        def boost(a):
-                            return min(255, int(a * 1.6))
-                        alpha = alpha.point(boost)
-                        canvas.putalpha(alpha)
-                except Exception:
-                    pass
-
-                data = canvas.tobytes()
-                surf = pygame.image.fromstring(data, size, 'RGBA')
-                return surf.convert_alpha()
-            except Exception:
-                # Fall through to pygame loader
-                pass
-
-        # PIL not available or failed; use pygame loader with smoothscale
-        try:
-            s = pygame.image.load(path).convert_alpha()
-            return pygame.transform.smoothscale(s, size)
-        except Exception:
-            return None
-
-    for mood, filename in sprite_files.items():
-        try:
-            sprite_path = f"assets/sprites/{filename}"
-            if os.path.exists(sprite_path):
-                game.mango_sprites[mood] = load_and_prepare(sprite_path, (100, 100))
-                print(f"Loaded sprite: {filename}")
-            else:
-                game.mango_sprites[mood] = None
-                print(f"Sprite not found: {filename}")
-        except Exception as e:
+
+def load_mango_sprite(game, mood, filename=None):
+    """Load one Mango mood sprite into game.mango_sprites."""
+    if not hasattr(game, 'mango_sprites') or game.mango_sprites is None:
+        game.mango_sprites = {}
+    filename = filename or SPRITE_FILES.get(mood)
+    try:
+        sprite_path = f"assets/sprites/{filename}"
+        if asset_exists(sprite_path):
+            game.mango_sprites[mood] = get_resources(game).sprite(sprite_path, SPRITE_SIZE, owner='game')
+            log.debug('loaded sprite %s', filename)
+        else:
             game.mango_sprites[mood] = None
-            print(f"Error loading sprite {filename}: {e}")
+            log.warning('sprite not found: %s', filename)
+    except Exception as e:
+        game.mango_sprites[mood] = None
+        log.error('could not load sprite %s: %s', filename, e)
+
+
+def load_flappy_sprites(game):
+    """Load the Flappy-only alternate flying frame and the tree texture."""
+    if not hasattr(game, 'mango_sprites') or game.mango_sprites is None:
+        game.mango_sprites = {}
+    res = get_resources(game)
 
     # Process alternate flying sprite specially for flappy game
-    flying2_path = "assets/sprites/mango_flying2.png"
     try:
-        if os.path.exists(flying2_path):
-            s2 = load_and_prepare(flying2_path, (100, 100))
-            if s2:
-                game.mango_sprites['flying2'] = s2
-                print("Loaded sprite: mango_flying2.png (processed)")
-            else:
-                game.mango_sprites['flying2'] = game.mango_sprites.get('flying')
+        s2 = res.sprite(FLYING2_PATH, SPRITE_SIZE, owner='game') if asset_exists(FLYING2_PATH) else None
+        if s2:
+            game.mango_sprites['flying2'] = s2
+            log.debug('loaded sprite %s', FLYING2_PATH)
         else:
             game.mango_sprites['flying2'] = game.mango_sprites.get('flying')
     except Exception as e:
         game.mango_sprites['flying2'] = game.mango_sprites.get('flying')
-        print(f"Error loading flying2 sprite: {e}")
+        log.error('could not load %s: %s', FLYING2_PATH, e)
 
     # Ensure keys exist even if None
     if 'flying' not in game.mango_sprites:
@@ -154,14 +97,49 @@ def load_mango_sprites(game):
 
     # Load tree texture for flappy obstacles if available
     game.tree_texture = None
-    tree_path = "assets/sprites/tree.png"
     try:
-        if os.path.exists(tree_path):
+        if asset_exists(TREE_PATH):
             try:
-                img = pygame.image.load(tree_path).convert_alpha()
-                game.tree_texture = img
-                print("Loaded tree texture for obstacles: tree.png")
+                game.tree_texture = res.image(TREE_PATH, owner='game')
+                if game.tree_texture is not None:
+                    log.debug('loaded tree texture %s', TREE_PATH)
             except Exception as e:
-                print(f"Error loading tree texture: {e}")
+                log.error('could not load %s: %s', TREE_PATH, e)
     except Exception:
         pass
+
+
+def load_mango_sprites(game):
+    """Load Mango sprite images into the game instance.
+
+    Processed sprites are cached in the game's ResourceManager, so calling
+    this again (e.g. after a display mode change) does not re-run the PIL
+    trimming and resampling.
+    """
+    game.mango_sprites = {}
+    for mood, filename in SPRITE_FILES.items():
+        load_mango_sprite(game, mood, filename)
+    load_flappy_sprites(game)
+
+
+def startup_tasks(game):
+    """Return (name, fn, required) asset tasks for the startup preloader.
+
+    Names are 'group:item' so startup timings can total each group.
+    Required tasks are what the hub draws on its first frame; one task per
+    file keeps cooperative chunks short under pygbag. The Flappy-only
+    assets are nice-to-have: they load after the hub is shown, or on
+    demand when Flappy starts first.
+    """
+    if not hasattr(game, 'mango_sprites') or game.mango_sprites is None:
+        game.mango_sprites = {}
+    game.hub_background = getattr(game, 'hub_background', None)
+    game.flappy_background = getattr(game, 'flappy_background', None)
+    game.tree_texture = getattr(game, 'tree_texture', None)
+
+    tasks = [('backgrounds:hub', lambda: load_hub_background(game), True)]
+    for mood, filename in SPRITE_FILES.items():
+        tasks.append((f'sprites:{mood}', lambda m=mood, f=filename: load_mango_sprite(game, m, f), True))
+    tasks.append(('backgrounds:flappy', lambda: load_flappy_background(game), False))
+    tasks.append(('sprites:flappy', lambda: load_flappy_sprites(game), False))
+    return tasks
@@ -1,26 +1,296 @@
 """AudioManager: compact, reliable, and tested-friendly.
 
 This module offers a single AudioManager class with a small, stable API
-used by project.py. It uses pygame when available and creates small
-placeholder WAV files when real assets are missing so the game can run
-in CI or on development machines without shipping audio assets.
+used by project.py. It uses pygame when available and synthesizes small
+placeholder sounds in memory (see synth.py) when real assets are missing
+so the game can run in CI or on development machines without shipping
+audio assets.
 """
 
 import os
-import math
+import sys
 import time
+import heapq
+import random
+from collections import deque, OrderedDict
 try:
     import wave
 except Exception:
     # wave may not be available in some WASM/python builds; guard usage below
     wave = None
-import struct
 
 try:
     import pygame
 except Exception:
     pygame = None
 
+import synth
+import audio_log
+import audio_latency
+import music_stream
+import asset_bundle
+from resources import get_resources, load_sound
+
+# Synthesized stand-ins for missing assets: key -> (waveform, ms, volume, params)
+PLACEHOLDERS = {
+    'flap': ('tone', 220, 0.9, {'freq': 1200}),
+    'thump': ('thump', 260, 0.9, {}),
+    'chirp': ('chirp', 180, 0.8, {'f0': 1800, 'f1': 3200}),
+}
+MUSIC_PLACEHOLDER = ('tone', 2000, 0.6, {'freq': 400})
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+# Per-sound (priority, max simultaneous voices). Higher priority sounds may
+# steal voices from lower ones; a sound never steals from a higher priority.
+SFX_VOICES = {
+    'thump': (3, 2),
+    'medicine': (3, 1),
+    'button': (2, 2),
+    'flap': (2, 3),
+    'chirp': (1, 3),
+}
+DEFAULT_VOICE = (1, 4)
+PRIORITY_LEVELS = 4
+
+# Per-sound rate limits: (cooldown s, coalesce window s, volume variation).
+# Requests inside the coalesce window merge into the sound already playing
+# (nudging its volume up); later requests inside the cooldown are dropped.
+SFX_LIMITS = {
+    'chirp': (0.15, 0.10, 0.2),
+    'flap': (0.04, 0.0, 0.0),
+    'thump': (0.08, 0.0, 0.0),
+    'button': (0.06, 0.0, 0.0),
+    'medicine': (0.25, 0.0, 0.0),
+}
+# Most SFX started in one frame; the rest are dropped
+SFX_FRAME_BUDGET = 4
+# Relative channel volume boost per request merged into a playing sound
+COALESCE_BOOST = 0.1
+
+PLAY, COALESCED, DROPPED = 'play', 'coalesced', 'dropped'
+
+
+class SfxLimiter:
+    """Cooldowns, burst coalescing and a per-frame budget for SFX requests.
+
+    admit(key) decides what happens to a request and returns (decision,
+    volume factor); played() records the channel a sound started on so
+    later merged requests can raise its volume. end_frame() resets the
+    frame budget and is called once per frame by the scene manager.
+    """
+
+    def __init__(self, limits=SFX_LIMITS, frame_budget=SFX_FRAME_BUDGET, clock=time.monotonic):
+        self.limits = limits
+        self.frame_budget = frame_budget
+        self.clock = clock
+        self._frame_plays = 0
+        # key -> [start time, channel, channel volume]
+        self._last = {}
+        self.counts = {}
+
+    def _count(self, key, what):
+        c = self.counts.setdefault(key, {PLAY: 0, COALESCED: 0, DROPPED: 0})
+        c[what] += 1
+
+    def admit(self, key):
+        now = self.clock()
+        cooldown, window, vary = self.limits.get(key, (0.0, 0.0, 0.0))
+        last = self._last.get(key)
+        if last is not None:
+            age = now - last[0]
+            if age < window:
+                self._count(key, COALESCED)
+                self._boost(last)
+                return COALESCED, None
+            if age < cooldown:
+                self._count(key, DROPPED)
+                return DROPPED, None
+        if self._frame_plays >= self.frame_budget:
+            self._count(key, DROPPED)
+            return DROPPED, None
+        self._frame_plays += 1
+        self._count(key, PLAY)
+        volume = 1.0 - random.random() * vary if vary else 1.0
+        self._last[key] = [now, None, volume]
+        return PLAY, volume
+
+    def played(self, key, channel, volume):
+        last = self._last.get(key)
+        if last is not None:
+            last[1], last[2] = channel, volume
+
+    def _boost(self, last):
+        ch = last[1]
+        if ch is None:
+            return
+        last[2] = min(1.0, last[2] * (1.0 + COALESCE_BOOST))
+        try:
+            ch.set_volume(last[2])
+        except Exception:
+            pass
+
+    def end_frame(self):
+        self._frame_plays = 0
+
+    def stats(self):
+        """Return totals and per-key counts of played, coalesced and dropped requests."""
+        totals = {PLAY: 0, COALESCED: 0, DROPPED: 0}
+        for c in self.counts.values():
+            for k in totals:
+                totals[k] += c[k]
+        totals['by_key'] = {k: dict(v) for k, v in self.counts.items()}
+        return totals
+
+
+class VoiceAllocator:
+    """Hand out SFX channels by priority without scanning the mixer.
+
+    The channel map is fixed when the allocator is built: every mixer
+    channel except the reserved music channel is a voice. The allocator
+    tracks when each voice will finish (from the Sound's length), so it
+    never polls get_busy(). Allocation order:
+
+    1. a sound already at its polyphony limit retriggers its own oldest voice;
+    2. otherwise a free (or finished) voice is used;
+    3. otherwise the oldest voice of the lowest busy priority is stolen,
+       provided that priority is not above the new sound's; if it is,
+       the new sound is dropped and None is returned.
+
+    Each step is a deque/OrderedDict operation or a walk over the fixed
+    PRIORITY_LEVELS; finished voices are reclaimed from a small heap.
+    """
+
+    def __init__(self, channels, clock=time.monotonic):
+        self.channels = list(channels)
+        self.clock = clock
+        n = len(self.channels)
+        self._key = [None] * n
+        self._prio = [0] * n
+        self._gen = [0] * n
+        self._free = deque(range(n))
+        self._by_key = {}
+        self._by_prio = [OrderedDict() for _ in range(PRIORITY_LEVELS)]
+        self._ends = []
+        self.stolen = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_mixer(cls, reserved=()):
+        n = pygame.mixer.get_num_channels()
+        return cls([pygame.mixer.Channel(i) for i in range(n) if i not in reserved])
+
+    def __len__(self):
+        return len(self.channels)
+
+    def _release(self, vid):
+        key = self._key[vid]
+        if key is None:
+            return
+        owned = self._by_key.get(key)
+        if owned is not None:
+            owned.pop(vid, None)
+        self._by_prio[self._prio[vid]].pop(vid, None)
+        self._key[vid] = None
+        self._gen[vid] += 1
+
+    def _reap(self, now):
+        ends = self._ends
+        while ends and ends[0][0] <= now:
+            _end, gen, vid = heapq.heappop(ends)
+            if gen == self._gen[vid]:
+                self._release(vid)
+                self._free.append(vid)
+
+    def allocate(self, key, sound=None, maxtime=None):
+        """Return a Channel for key, or None when the sound should be dropped."""
+        if not self.channels:
+            return None
+        priority, max_voices = SFX_VOICES.get(key, DEFAULT_VOICE)
+        now = self.clock()
+        self._reap(now)
+
+        owned = self._by_key.setdefault(key, OrderedDict())
+        if len(owned) >= max_voices:
+            vid = next(iter(owned))
+            self._release(vid)
+        elif self._free:
+            vid = self._free.popleft()
+        else:
+            vid = None
+            for level in range(PRIORITY_LEVELS):
+                if level > priority:
+                    break
+                if self._by_prio[level]:
+                    vid = next(iter(self._by_prio[level]))
+                    break
+            if vid is None:
+                self.dropped += 1
+                return None
+            self._release(vid)
+            self.stolen += 1
+
+        length = 0.0
+        try:
+            length = float(sound.get_length()) if sound is not None else 0.0
+        except Exception:
+            pass
+        if maxtime is not None:
+            length = min(length, maxtime / 1000.0)
+        self._key[vid] = key
+        self._prio[vid] = priority
+        owned[vid] = True
+        self._by_prio[priority][vid] = True
+        heapq.heappush(self._ends, (now + length, self._gen[vid], vid))
+        return self.channels[vid]
+
+    def stats(self):
+        busy = sum(1 for k in self._key if k is not None)
+        return {'voices': len(self.channels), 'busy': busy, 'stolen': self.stolen, 'dropped': self.dropped}
+
+
+class SoundRegistry:
+    """Decode each sound file once and share the Sound objects.
+
+    Entries live in the game's ResourceManager (see resources.py) under
+    kind 'sound' or 'music', so a Sound loaded here is the same object a
+    mini-game gets from `res.sound(path)` and shows up in the memory report.
+    Sound effects are small and kept for the whole session; music buffers
+    (the WASM fallback decodes a whole track) are owned by 'music' and
+    should be freed with unload() when the track changes.
+    """
+
+    def __init__(self, resources=None, loader=load_sound):
+        self.resources = resources if resources is not None else get_resources()
+        self.loader = loader
+
+    def get(self, path, owner='audio', kind='sound'):
+        """Return the decoded Sound for path (None if it is missing or fails)."""
+        if not path or not pygame:
+            return None
+        return self.resources.sound(path, owner=owner, kind=kind, loader=self.loader)
+
+    def music(self, path):
+        """Return the whole track decoded as a Sound, accounted as music."""
+        return self.get(path, owner='music', kind='music')
+
+    def loaded(self, path, kind='sound'):
+        return (asset_bundle.normalize(path), None, kind) in self.resources
+
+    def release(self, path, kind='music'):
+        """Keep path's buffer cached but let the LRU budget evict it."""
+        owner = 'music' if kind == 'music' else 'audio'
+        self.resources.release(owner, (asset_bundle.normalize(path), None, kind))
+
+    def unload(self, path, kind='music'):
+        """Free the decoded buffer for path. Returns the bytes released."""
+        return self.resources.discard((asset_bundle.normalize(path), None, kind))
+
+    def memory(self):
+        """Return {kind: {'count', 'bytes'}} for decoded sounds and music."""
+        by_kind = self.resources.memory_report(top=0)['by_kind']
+        return {k: dict(by_kind.get(k, {'count': 0, 'bytes': 0})) for k in ('sound', 'music')}
+
 
 class AudioManager:
     """Compact audio manager.
@@ -32,6 +302,10 @@ class AudioManager:
     - stop_music()
     - play_sfx(key, maxtime=None)
     - play_debug_tone(freq, duration_ms, volume)
+    - unload_music(key=None)
+    - memory_report()
+    - end_frame(), sfx_stats()
+    - handle_event(event) -> bool (music end events)
     - start_watchdog(key='forest', interval=1.0)
     - stop_watchdog()
     - watchdog_tick()
@@ -45,6 +319,18 @@ class AudioManager:
         self.owner = owner
         self.sounds = {}
         self._music_files = {}
+        # buffered diagnostics; see audio_log.py for levels and the file sink
+        self.log = audio_log.get_log()
+        # decoded Sounds shared with the rest of the game (see SoundRegistry)
+        self.registry = SoundRegistry(get_resources(owner))
+        # path of the track currently held as a decoded Sound (WASM fallback)
+        self._music_sound_path = None
+        # chunked music player used in the browser (see music_stream.py)
+        self._stream = None
+        # pygame event type posted when music ends (see handle_event);
+        # while armed the polling watchdog is skipped
+        self._end_event = None
+        self._events_armed = False
 
         # watchdog state
         self._watchdog_enabled = False
@@ -65,6 +351,13 @@ class AudioManager:
         # Reserve a dedicated channel index for fallback music so SFX don't steal it
         # Pick a high channel index to avoid collisions with tests/examples
         self._reserved_music_channel_index = 15
+        # cooldowns / coalescing / per-frame budget for play_sfx
+        self.limiter = SfxLimiter()
+        # SFX voices (see VoiceAllocator); built once the mixer is up
+        self.voices = None
+        self._voices_for = None
+        # input -> audible timing when MANGO_AUDIO_LATENCY=1 (see audio_latency.py)
+        self.latency = audio_latency.from_env()
         # Do not initialize the mixer at import time; use ensure_audio to init on first user gesture
         self._mixer_initialized = False
 
@@ -79,34 +372,12 @@ class AudioManager:
             return True
         if not pygame:
             return False
-        
-        # Detect WASM environment
-        try:
-            import sys
-            is_wasm = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
-        except Exception:
-            is_wasm = False
-            
+
         try:
-            # In WASM, use minimal mixer initialization
-            if is_wasm:
-                try:
-                    # Use simpler parameters for WASM
-                    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=1024)
-                except Exception:
-                    try:
-                        pygame.mixer.init()
-                    except Exception:
-                        return False
-            else:
-                # Desktop: use high-quality parameters
-                try:
-                    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-                except Exception:
-                    try:
-                        pygame.mixer.init()
-                    except Exception:
-                        return False
+            # buffer size / rate come from the mixer preset (MANGO_MIXER_PRESET);
+            # the browser defaults to the lighter 'web' preset
+            if not audio_latency.init_mixer():
+                return False
             try:
                 pygame.mixer.set_num_channels(16)  # Reduce channels for WASM
             except Exception:
@@ -127,42 +398,23 @@ class AudioManager:
         # Prefer to skip placeholder file generation in that case to avoid
         # raising ModuleNotFoundError during import. On desktop, the original
         # behavior is preserved.
-        if wave is None:
-            return False
-        try:
-            framerate = 44100
-            amplitude = int(32767 * max(0.0, min(1.0, volume)))
-            nframes = int(framerate * duration_ms / 1000)
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with wave.open(path, 'w') as wf:
-                wf.setnchannels(2)
-                wf.setsampwidth(2)
-                wf.setframerate(framerate)
-                for i in range(nframes):
-                    t = i / framerate
-                    val = int(amplitude * math.sin(2 * math.pi * freq * t))
-                    wf.writeframes(struct.pack('<hh', val, val))
-            return True
-        except Exception:
-            return False
+        #
+        # The game itself no longer needs these files (placeholders and debug
+        # tones are synthesized in memory, see synth.py); they remain for
+        # tools that want a WAV on disk.
+        return self._write_wav(path, 'tone', duration_ms, volume, freq=freq)
 
     def write_thump(self, path, duration_ms=220, volume=0.9):
+        return self._write_wav(path, 'thump', duration_ms, volume)
+
+    def _write_wav(self, path, kind, duration_ms, volume, **params):
         if wave is None:
             return False
         try:
-            framerate = 44100
-            amplitude = int(32767 * max(0.0, min(1.0, volume)))
-            nframes = int(framerate * duration_ms / 1000)
             os.makedirs(os.path.dirname(path), exist_ok=True)
-            with wave.open(path, 'w') as wf:
-                wf.setnchannels(2)
-                wf.setsampwidth(2)
-                wf.setframerate(framerate)
-                for i in range(nframes):
-                    t = i / framerate
-                    env = (1.0 - (i / float(nframes)))
-                    val = int(amplitude * env * math.sin(2 * math.pi * 120 * t))
-                    wf.writeframes(struct.pack('<hh', val, val))
+            data = synth.wav_bytes(kind, duration_ms, volume, **params)
+            with open(path, 'wb') as f:
+                f.write(data)
             return True
         except Exception:
             return False
@@ -173,14 +425,9 @@ class AudioManager:
             return False
         try:
             if not pygame.mixer.get_init():
-                # prefer explicit params but fall back to defaults if they fail
-                try:
-                    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-                except Exception:
-                    try:
-                        pygame.mixer.init()
-                    except Exception:
-                        return False
+                # preset params, falling back to SDL defaults if they fail
+                if not audio_latency.init_mixer():
+                    return False
             try:
                 pygame.mixer.set_num_channels(32)
             except Exception:
@@ -189,42 +436,40 @@ class AudioManager:
         except Exception:
             return False
 
+    def _gain(self, bus):
+        """Effective gain for 'music' or 'sfx' from the owner's mixer buses."""
+        buses = getattr(self.owner, 'buses', None)
+        if buses is not None:
+            return buses.gain(bus)
+        try:
+            return getattr(self.owner, f'{bus}_volume') * self.owner.master_volume
+        except Exception:
+            return 1.0
+
     def apply_volume_settings(self):
         if not pygame:
             return
-        
-        # Detect WASM environment
-        try:
-            import sys
-            is_wasm = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
-        except Exception:
-            is_wasm = False
-            
+
         try:
             if pygame.mixer.get_init():
                 try:
                     # In WASM, avoid pygame.mixer.music (causes crashes)
                     # Only handle music if not in WASM and using music mode
-                    if not is_wasm and getattr(self.owner, '_music_mode', None) == 'music':
+                    if not IS_WASM and getattr(self.owner, '_music_mode', None) == 'music':
                         try:
-                            pygame.mixer.music.set_volume(self.owner.music_volume * self.owner.master_volume)
+                            pygame.mixer.music.set_volume(self._gain('music'))
                         except Exception:
                             pass
                 except Exception:
                     pass
-            for s in list(self.sounds.keys()):
-                try:
-                    if self.sounds.get(s):
-                        self.sounds[s].set_volume(self.owner.sfx_volume * self.owner.master_volume)
-                except Exception:
-                    pass
+            # SFX gain is applied per voice when a sound starts (play_sfx)
             # If music was started as a Sound on a channel, update that channel's volume
             try:
-                if getattr(self.owner, '_music_mode', None) == 'sound':
+                if getattr(self.owner, '_music_mode', None) in ('sound', 'stream'):
                     ch = getattr(self.owner, '_music_channel', None)
                     if ch:
                         try:
-                            ch.set_volume(self.owner.music_volume * self.owner.master_volume)
+                            ch.set_volume(self._gain('music'))
                         except Exception:
                             pass
             except Exception:
@@ -235,30 +480,14 @@ class AudioManager:
     # --- loading and placeholders ----------------------------------------------
     def load_sounds(self):
         base = os.path.join('assets', 'sounds')
-        os.makedirs(base, exist_ok=True)
         # Prefer OGG files in web builds (pygbag) for browser-friendly playback.
         def pick_ext(name):
             ogg = os.path.join(base, f"{name}.ogg")
             wav = os.path.join(base, f"{name}.wav")
-            if os.path.exists(ogg):
+            if asset_bundle.exists(ogg):
                 return ogg
             return wav
 
-        flap = pick_ext('flap')
-        thump = pick_ext('thump')
-
-        # create placeholders if missing (safe for CI)
-        if not os.path.exists(flap):
-            try:
-                self.write_short_tone(flap, freq=1200, duration_ms=220, volume=0.9)
-            except Exception:
-                pass
-        if not os.path.exists(thump):
-            try:
-                self.write_thump(thump, duration_ms=260, volume=0.9)
-            except Exception:
-                pass
-
         # Known SFX mapping used by project.py
         # SFX map: prefer .ogg when available; pick_ext will select available file
         sfx_map = {
@@ -272,28 +501,21 @@ class AudioManager:
         if pygame and pygame.mixer.get_init():
             try:
                 for key, fname in sfx_map.items():
-                    p = os.path.join(base, fname)
-                    if os.path.exists(p):
-                        try:
-                            self.sounds[key] = pygame.mixer.Sound(p)
-                        except Exception:
-                            # keep going if a particular SFX fails to load
-                            pass
+                    # decoded once; load_sounds runs again after the mixer
+                    # comes up on the first click and then only hits the cache
+                    snd = self.registry.get(os.path.join(base, fname))
+                    if snd is None and key in PLACEHOLDERS:
+                        # missing asset (CI, dev checkout): synthesize in memory
+                        kind, duration_ms, volume, params = PLACEHOLDERS[key]
+                        snd = synth.sound(kind, duration_ms, volume, resources=self.registry.resources, **params)
+                    if snd is not None:
+                        self.sounds[key] = snd
             except Exception:
                 pass
 
-        # Debug: log which SFX keys were loaded (for diagnostics)
-        try:
-            loaded = sorted([k for k, v in self.sounds.items() if not k.startswith('_') and v])
-            msg = f"[audio] load_sounds: loaded keys={loaded}"
-            print(msg)
-            try:
-                with open('audio_debug.log', 'a') as _lf:
-                    _lf.write(msg + '\n')
-            except Exception:
-                pass
-        except Exception:
-            pass
+        if self.log.enabled_for(audio_log.INFO):
+            loaded = sorted(k for k, v in self.sounds.items() if not k.startswith('_') and v)
+            self.log.info('load_sounds: loaded keys=%s', loaded)
 
         # Music: prefer OGG for web builds
         self._music_files = {
@@ -301,14 +523,6 @@ class AudioManager:
             'home': pick_ext('home')
         }
 
-        for k, p in self._music_files.items():
-            if not os.path.exists(p):
-                try:
-                    # longer placeholder for music
-                    self.write_short_tone(p, freq=400, duration_ms=2000, volume=0.6)
-                except Exception:
-                    pass
-
         try:
             setattr(self.owner, 'sounds', self.sounds)
             setattr(self.owner, '_music_files', self._music_files)
@@ -321,58 +535,29 @@ class AudioManager:
             pass
 
     # --- channel helpers ----------------------------------------------------
-    def _get_sfx_channel(self):
-        """Return a free channel for SFX that avoids the reserved music channel.
+    def _voices(self):
+        """Return the VoiceAllocator, rebuilt when the mixer's channel count changes."""
+        try:
+            n = pygame.mixer.get_num_channels()
+        except Exception:
+            return None
+        v = self.voices
+        if v is None or self._voices_for != n:
+            v = self.voices = VoiceAllocator.from_mixer(reserved=(self._reserved_music_channel_index,))
+            self._voices_for = n
+        return v
+
+    def _get_sfx_channel(self, key=None, sound=None, maxtime=None):
+        """Return a channel for an SFX from the voice allocator (never the music channel).
 
-        This helper will try to find a free channel, and if the found channel
-        matches the reserved music channel index it will try to find another
-        free channel or pick a safe fallback.
+        Returns None when every voice is busy with equal or higher priority
+        sounds; the caller should then skip the sound.
         """
         if not pygame:
             return None
         try:
-            ch = pygame.mixer.find_channel()
-            if ch:
-                # Avoid using the reserved music channel
-                if getattr(ch, 'get_id', None):
-                    cid = ch.get_id()
-                else:
-                    # Some pygame versions don't expose get_id on Channel
-                    cid = None
-                if cid == self._reserved_music_channel_index:
-                    # try to get another channel explicitly
-                    for i in range(pygame.mixer.get_num_channels()):
-                        if i == self._reserved_music_channel_index:
-                            continue
-                        try:
-                            c2 = pygame.mixer.Channel(i)
-                            if not c2.get_busy():
-                                return c2
-                        except Exception:
-                            continue
-                    # last resort: return the found channel anyway
-                    return ch
-                return ch
-            # If find_channel returned None, try to allocate a non-reserved channel
-            try:
-                # try a few indices avoiding the reserved one
-                total = pygame.mixer.get_num_channels()
-                for i in range(total):
-                    if i == self._reserved_music_channel_index:
-                        continue
-                    try:
-                        c = pygame.mixer.Channel(i)
-                        if not c.get_busy():
-                            return c
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-            # fallback to channel 0 if everything else fails
-            try:
-                return pygame.mixer.Channel(0)
-            except Exception:
-                return None
+            voices = self._voices()
+            return voices.allocate(key, sound, maxtime) if voices is not None else None
         except Exception:
             return None
 
@@ -382,30 +567,23 @@ class AudioManager:
             if key not in self._music_files:
                 return
             path = self._music_files.get(key)
-            if not os.path.exists(path):
-                return
             if not pygame:
                 return
-                
-            # Detect WASM environment
-            try:
-                import sys
-                is_wasm = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
-            except Exception:
-                is_wasm = False
-                
+            # no track on disk or in the bundle: loop a synthesized placeholder
+            placeholder = not asset_bundle.exists(path)
+
             # If already playing this key and the backend reports busy, do nothing
             try:
                 cur = getattr(self.owner, '_music_playing', None)
                 mode = getattr(self.owner, '_music_mode', None)
                 if cur == key:
-                    if mode == 'music' and not is_wasm:
+                    if mode == 'music' and not IS_WASM:
                         try:
                             if pygame.mixer.music.get_busy():
                                 return
                         except Exception:
                             return
-                    if mode == 'sound':
+                    if mode in ('sound', 'stream'):
                         try:
                             ch = getattr(self.owner, '_music_channel', None)
                             if ch and ch.get_busy():
@@ -415,33 +593,46 @@ class AudioManager:
             except Exception:
                 pass
                 
-            # In WASM, skip pygame.mixer.music (causes crashes) and use Sound fallback
-            if not is_wasm:
+            # In WASM, skip pygame.mixer.music (causes crashes) and stream
+            # the track in chunks instead (MANGO_MUSIC_STREAM=1 tries it on desktop)
+            use_stream = IS_WASM or os.environ.get('MANGO_MUSIC_STREAM') == '1'
+            if use_stream and not placeholder and music_stream.streamable(path):
+                if self._start_stream(key, path):
+                    return
+            if not IS_WASM and not placeholder:
                 # Try streaming playback (preferred on desktop)
                 try:
                     pygame.mixer.music.load(path)
-                    pygame.mixer.music.set_volume(self.owner.music_volume * self.owner.master_volume)
+                    pygame.mixer.music.set_volume(self._gain('music'))
                     pygame.mixer.music.play(-1)
                     try:
                         setattr(self.owner, '_music_playing', key)
                         setattr(self.owner, '_music_mode', 'music')
                     except Exception:
                         pass
-                    # debug log
-                    try:
-                        msg = f"[audio] music.play() started for {key} -> {path} (vol={self.owner.music_volume * self.owner.master_volume:.3f})"
-                        print(msg)
-                        with open('audio_debug.log', 'a') as _lf:
-                            _lf.write(msg + '\n')
-                    except Exception:
-                        pass
+                    self._arm_end_event('music')
+                    self.log.info('music.play() started for %s -> %s', key, path)
                     return
                 except Exception:
                     pass  # Fall through to Sound fallback
                     
             # WASM or streaming failed: fallback to Sound playback on a reserved channel
             try:
-                snd = pygame.mixer.Sound(path)
+                # the previous track stays cached but becomes evictable;
+                # switching back is a cache hit unless memory ran short
+                prev = self._music_sound_path
+                if prev and prev != path:
+                    self.registry.release(prev)
+                if placeholder:
+                    kind, duration_ms, volume, params = MUSIC_PLACEHOLDER
+                    snd = synth.sound(kind, duration_ms, volume, resources=self.registry.resources, **params)
+                    path = None
+                else:
+                    snd = self.registry.music(path)
+                if snd is None:
+                    raise RuntimeError(f'could not decode {key}')
+                self._music_sound_path = path
+                self._stop_stream()
                 # find a dedicated channel (prefer the reserved music channel)
                 try:
                     ch = pygame.mixer.Channel(self._reserved_music_channel_index)
@@ -458,12 +649,7 @@ class AudioManager:
                 # set volumes
                 try:
                     if ch:
-                        ch.set_volume(self.owner.music_volume * self.owner.master_volume)
-                except Exception:
-                    pass
-                # keep a reference so the Sound isn't GC'd and mirror state onto owner
-                try:
-                    self.sounds[f'_music_{key}'] = snd
+                        ch.set_volume(self._gain('music'))
                 except Exception:
                     pass
                 # mirror state onto owner
@@ -473,46 +659,107 @@ class AudioManager:
                     setattr(self.owner, '_music_mode', 'sound')
                 except Exception:
                     pass
-                # debug log
-                try:
-                    msg = f"[audio] fallback Sound.play() started for {key} -> {path} (vol={self.owner.music_volume * self.owner.master_volume:.3f})"
-                    print(msg)
-                    with open('audio_debug.log', 'a') as _lf:
-                        _lf.write(msg + '\n')
-                except Exception:
-                    pass
+                self._arm_end_event('sound', ch)
+                self.log.info('fallback Sound.play() started for %s -> %s', key, path or 'placeholder')
                 return
+            except Exception as e:
+                self.log.error('could not play music %s: %s', key, e)
+                return
+        except Exception as e:
+            self.log.error('could not play music %s (outer): %s', key, e)
+
+    # --- end events -------------------------------------------------------------
+    def _end_event_type(self):
+        if self._end_event is None:
+            try:
+                self._end_event = pygame.event.custom_type()
             except Exception:
-                # final failure
                 try:
-                    msg = f"[audio] could not play music {key}"
-                    print(msg)
-                    with open('audio_debug.log', 'a') as _lf:
-                        _lf.write(msg + '\n')
+                    self._end_event = pygame.USEREVENT + 1
                 except Exception:
-                    pass
-                return
-        except Exception:
+                    self._end_event = False
+        return self._end_event
+
+    def _arm_end_event(self, mode, ch=None):
+        """Have the mixer post an end event for the music; False if unsupported.
+
+        When this fails (no set_endevent in this pygame build, or no event
+        type to spare) watchdog_tick keeps polling instead.
+        """
+        ok = False
+        ev = self._end_event_type()
+        if ev:
             try:
-                msg = f"[audio] could not play music {key} (outer)"
-                print(msg)
-                with open('audio_debug.log', 'a') as _lf:
-                    _lf.write(msg + '\n')
+                if mode == 'music':
+                    pygame.mixer.music.set_endevent(ev)
+                else:
+                    ch.set_endevent(ev)
+                ok = True
+            except Exception:
+                ok = False
+        self._events_armed = ok
+        return ok
+
+    def handle_event(self, event):
+        """Restart or refill music when the mixer reports it ended.
+
+        Returns True when the event was the music end event. Intentional
+        stops and track switches also post it; play_music ignores a request
+        for the track that is already playing, so those are harmless.
+        """
+        ev = self._end_event
+        if not ev or getattr(event, 'type', None) != ev:
+            return False
+        stream = self._stream
+        if stream is not None:
+            # a chunk finished: queue the next one right away
+            try:
+                if stream.pump():
+                    return True
             except Exception:
                 pass
+        key = self._watchdog_key if self._watchdog_enabled else None
+        if key and getattr(self.owner, '_music_playing', None) == key:
+            self.log.info('music ended; restarting %s', key)
+            self.play_music(key)
+        return True
+
+    def _start_stream(self, key, path):
+        """Play path as a chunked MusicStream on the reserved music channel."""
+        try:
+            self._stop_stream()
+            prev = self._music_sound_path
+            if prev:
+                # a whole-track buffer from an earlier fallback is no longer needed
+                self.registry.release(prev)
+                self._music_sound_path = None
+            ch = pygame.mixer.Channel(self._reserved_music_channel_index)
+            stream = music_stream.MusicStream(path, ch)
+            if not stream.start(self._gain('music')):
+                stream.stop()
+                return False
+            self._stream = stream
+            setattr(self.owner, '_music_channel', ch)
+            setattr(self.owner, '_music_playing', key)
+            setattr(self.owner, '_music_mode', 'stream')
+            self._arm_end_event('stream', ch)
+            self.log.info('streaming %s -> %s in %d ms chunks', key, path, music_stream.CHUNK_MS)
+            return True
+        except Exception as e:
+            self.log.warning('could not stream %s: %s', key, e)
+            self._stop_stream()
+            return False
+
+    def _stop_stream(self):
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop()
 
     def stop_music(self):
         try:
-            # Detect WASM environment
-            try:
-                import sys
-                is_wasm = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
-            except Exception:
-                is_wasm = False
-                
             # stop streaming music if used (skip in WASM)
             try:
-                if not is_wasm and getattr(self.owner, '_music_mode', None) == 'music':
+                if not IS_WASM and getattr(self.owner, '_music_mode', None) == 'music':
                     if pygame:
                         try:
                             pygame.mixer.music.stop()
@@ -520,6 +767,7 @@ class AudioManager:
                             pass
             except Exception:
                 pass
+            self._stop_stream()
             # stop fallback sound-based music
             try:
                 if getattr(self.owner, '_music_mode', None) == 'sound':
@@ -529,13 +777,6 @@ class AudioManager:
                             ch.stop()
                         except Exception:
                             pass
-                    # also remove stored sound object
-                    try:
-                        key = getattr(self.owner, '_music_playing', None)
-                        if key:
-                            self.sounds.pop(f'_music_{key}', None)
-                    except Exception:
-                        pass
             except Exception:
                 pass
         except Exception:
@@ -551,109 +792,130 @@ class AudioManager:
             pass
 
     def play_sfx(self, key, maxtime=None):
+        log = self.log
         try:
-            # Diagnostic log - announce attempt
-            try:
-                msg = f"[audio] _play_sfx: attempt to play key='{key}'"
-                print(msg)
-                try:
-                    with open('audio_debug.log', 'a') as _lf:
-                        _lf.write(msg + '\n')
-                except Exception:
-                    pass
-            except Exception:
-                pass
-
+            log.debug('play_sfx: attempt to play key=%r', key)
             if not pygame:
                 return
             snd = self.sounds.get(key)
             if not snd:
-                try:
-                    msg = f"[audio] _play_sfx: missing sound for key='{key}'"
-                    print(msg)
-                    with open('audio_debug.log', 'a') as _lf:
-                        _lf.write(msg + '\n')
-                except Exception:
-                    pass
+                log.warning('play_sfx: missing sound for key=%r', key)
+                return
+            decision, ch_volume = self.limiter.admit(key)
+            if decision != PLAY:
+                log.debug('play_sfx: %s %r', decision, key)
+                return
+            voices = self._voices()
+            ch = voices.allocate(key, snd, maxtime) if voices is not None else None
+            if ch is None and voices is not None:
+                log.debug('play_sfx: dropped %r (no voice at its priority)', key)
                 return
             try:
-                snd.set_volume(max(0.0, min(1.0, self.owner.sfx_volume * self.owner.master_volume)))
-            except Exception:
-                pass
-            try:
-                ch = self._get_sfx_channel() or (pygame.mixer.Channel(0) if pygame else None)
-                played = False
+                # channels keep their volume between plays; set it every time
+                ch_volume = max(0.0, min(1.0, ch_volume * self._gain('sfx')))
+                ch.set_volume(ch_volume)
                 if maxtime is not None:
                     try:
                         ch.play(snd, maxtime=maxtime)
-                        played = True
                     except TypeError:
                         ch.play(snd)
-                        played = True
                 else:
                     ch.play(snd)
-                    played = True
-                # log success
-                try:
-                    vol = None
-                    try:
-                        vol = ch.get_volume()
-                    except Exception:
-                        vol = None
-                    msg = f"[audio] _play_sfx: played '{key}' on channel {ch} (set_vol={self.owner.sfx_volume * self.owner.master_volume:.3f} read_vol={vol})"
-                    print(msg)
-                    try:
-                        with open('audio_debug.log', 'a') as _lf:
-                            _lf.write(msg + '\n')
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
+                self.limiter.played(key, ch, ch_volume)
+                if self.latency is not None:
+                    self.latency.played(key, ch, snd)
+                log.debug('play_sfx: played %r on channel %s', key, ch)
             except Exception:
                 try:
                     snd.play()
-                    try:
-                        msg = f"[audio] _play_sfx: fallback played '{key}' via Sound.play()"
-                        print(msg)
-                        with open('audio_debug.log', 'a') as _lf:
-                            _lf.write(msg + '\n')
-                    except Exception:
-                        pass
-                except Exception:
-                    try:
-                        msg = f"[audio] _play_sfx: failed to play '{key}'"
-                        print(msg)
-                        with open('audio_debug.log', 'a') as _lf:
-                            _lf.write(msg + '\n')
-                    except Exception:
-                        pass
+                    log.debug('play_sfx: fallback played %r via Sound.play()', key)
+                except Exception as e:
+                    log.error('play_sfx: failed to play %r: %s', key, e)
         except Exception:
             pass
 
     def play_debug_tone(self, freq=800, duration_ms=300, volume=1.0):
         try:
-            debug_path = os.path.join('assets', 'sounds', '_debug_tone.wav')
-            if not os.path.exists(os.path.dirname(debug_path)):
-                os.makedirs(os.path.dirname(debug_path), exist_ok=True)
-            if not os.path.exists(debug_path):
+            if not pygame:
+                return
+            # synthesized in memory and memoized by its parameters
+            snd = synth.sound('tone', duration_ms, volume, resources=self.registry.resources, freq=freq)
+            if snd is None:
+                return
+            try:
+                ch = self._get_sfx_channel('debug', snd) or pygame.mixer.Channel(0)
+                ch.set_volume(1.0)
+                ch.play(snd)
+            except Exception:
                 try:
-                    self.write_short_tone(debug_path, freq=freq, duration_ms=duration_ms, volume=volume)
+                    snd.play()
                 except Exception:
                     pass
-            if pygame and os.path.exists(debug_path):
-                try:
-                    snd = pygame.mixer.Sound(debug_path)
-                    ch = pygame.mixer.find_channel() or pygame.mixer.Channel(0)
-                    ch.set_volume(1.0)
-                    ch.play(snd)
-                except Exception:
-                    try:
-                        snd.play()
-                    except Exception:
-                        pass
         except Exception:
             pass
 
+    # --- memory -------------------------------------------------------------
+    def unload_music(self, key=None):
+        """Free decoded music buffers: one track by key, or all of them.
+
+        Only the WASM Sound fallback holds a whole track in memory; streamed
+        desktop music is unaffected. A track that is playing is stopped first.
+        Returns the number of bytes released.
+        """
+        freed = 0
+        try:
+            paths = [self._music_files.get(key)] if key else list(self._music_files.values())
+            playing = getattr(self.owner, '_music_playing', None)
+            if getattr(self.owner, '_music_mode', None) == 'sound' and (key is None or playing == key):
+                self.stop_music()
+            for path in paths:
+                if path:
+                    freed += self.registry.unload(path)
+                    if path == self._music_sound_path:
+                        self._music_sound_path = None
+        except Exception:
+            pass
+        return freed
+
+    def memory_report(self):
+        """Return decoded audio memory: {'sound'|'music': {'count', 'bytes'}, 'total': bytes}."""
+        try:
+            report = self.registry.memory()
+        except Exception:
+            report = {'sound': {'count': 0, 'bytes': 0}, 'music': {'count': 0, 'bytes': 0}}
+        stream = self._stream
+        report['stream'] = stream.memory_bytes() if stream is not None else 0
+        report['total'] = report['sound']['bytes'] + report['music']['bytes'] + report['stream']
+        return report
+
+    # --- per-frame -------------------------------------------------------------
+    def end_frame(self):
+        """Per-frame housekeeping: reset the SFX budget, apply changed bus
+        volumes, save settings once they settle and feed the music stream."""
+        self.limiter.end_frame()
+        if self.latency is not None:
+            self.latency.poll()
+        buses = getattr(self.owner, 'buses', None)
+        if buses is not None and buses.consume():
+            self.apply_volume_settings()
+        settings = getattr(self.owner, 'settings', None)
+        if settings is not None:
+            settings.tick()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.pump()
+            except Exception as e:
+                self.log.warning('music stream failed: %s', e)
+                self._stop_stream()
+
+    def sfx_stats(self):
+        """Return played/coalesced/dropped SFX counts plus voice allocator stats."""
+        stats = self.limiter.stats()
+        if self.voices is not None:
+            stats['voices'] = self.voices.stats()
+        return stats
+
     # --- watchdog -------------------------------------------------------------
     def start_watchdog(self, key='forest', interval=1.0):
         try:
@@ -683,8 +945,9 @@ class AudioManager:
             pass
 
     def watchdog_tick(self):
+        """Polling fallback for when the mixer can't post end events."""
         try:
-            if not self._watchdog_enabled:
+            if not self._watchdog_enabled or self._events_armed:
                 return
             now = time.time()
             if now - self._watchdog_last < self._watchdog_interval:
@@ -702,6 +965,8 @@ class AudioManager:
             try:
                 if getattr(self.owner, '_music_mode', None) == 'music':
                     busy = bool(pygame.mixer.music.get_busy()) if pygame else False
+                elif getattr(self.owner, '_music_mode', None) == 'stream':
+                    busy = self._stream is not None and self._stream.active
                 elif getattr(self.owner, '_music_mode', None) == 'sound':
                     ch = getattr(self.owner, '_music_channel', None)
                     if ch:
@@ -0,0 +1,292 @@
+"""Mixer presets and an input-to-audible latency probe.
+
+Presets bundle the ``pygame.mixer.init`` parameters. The buffer size sets
+how much audio SDL mixes ahead, and so how long a newly started sound
+waits before it can be heard. Pick one with MANGO_MIXER_PRESET; the
+default keeps the old behaviour ('balanced' on desktop, 'web' in the
+browser).
+
+Setting MANGO_AUDIO_LATENCY=1 attaches a `LatencyProbe` to the game's
+AudioManager. The probe timestamps three things:
+
+- input events (KEYDOWN / MOUSEBUTTONDOWN, from SceneManager);
+- ``play_sfx`` calls;
+- channel busy transitions (polled once per frame by AudioManager.end_frame).
+
+It then keeps histograms of:
+
+- input -> play_sfx;
+- play_sfx -> channel busy;
+- end lag: how long after its nominal length a sound's channel goes idle.
+  Mixing happens in whole buffers, so this grows with the buffer size.
+
+The report is printed at exit. Run this module to measure every preset
+under SDL's dummy audio driver (no sound card needed):
+
+    python audio_latency.py --trials 40
+    python audio_latency.py --presets low,balanced --json latency.json
+"""
+import os
+import sys
+import time
+import bisect
+import argparse
+from collections import deque
+
+from mango_log import get_logger
+
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+PRESETS = {
+    'low': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 256},
+    'balanced': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 512},
+    'safe': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 1024},
+    'web': {'frequency': 22050, 'size': -16, 'channels': 2, 'buffer': 1024},
+}
+DEFAULT_PRESET = 'web' if IS_WASM else 'balanced'
+
+# Histogram bucket upper edges in milliseconds (the last bucket is open)
+BUCKETS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+# An input only counts towards a play_sfx that follows within this window
+INPUT_WINDOW_S = 0.2
+# Give up on a channel that never goes busy / idle after this long
+POLL_TIMEOUT_S = 2.0
+
+
+def preset_name(name=None):
+    """Resolve a preset name: explicit, then MANGO_MIXER_PRESET, then the default."""
+    name = (name or os.environ.get('MANGO_MIXER_PRESET') or DEFAULT_PRESET).strip().lower()
+    if name not in PRESETS:
+        get_logger('audio').warning('unknown mixer preset %r, using %r', name, DEFAULT_PRESET)
+        name = DEFAULT_PRESET
+    return name
+
+
+def get_preset(name=None):
+    return dict(PRESETS[preset_name(name)])
+
+
+def buffer_ms(preset):
+    """Time one mixer buffer covers, the floor on output latency."""
+    return 1000.0 * preset['buffer'] / preset['frequency']
+
+
+def pre_init(name=None):
+    """pygame.mixer.pre_init with a preset (desktop startup)."""
+    p = get_preset(name)
+    pygame.mixer.pre_init(p['frequency'], p['size'], p['channels'], p['buffer'])
+
+
+def init_mixer(name=None):
+    """Initialize the mixer with a preset, falling back to SDL defaults.
+
+    Returns True once the mixer is running.
+    """
+    if pygame is None:
+        return False
+    try:
+        pygame.mixer.init(**get_preset(name))
+    except Exception:
+        try:
+            pygame.mixer.init()
+        except Exception:
+            return False
+    return bool(pygame.mixer.get_init())
+
+
+class Histogram:
+    """Latency samples in milliseconds with fixed log-spaced buckets."""
+
+    def __init__(self, edges=BUCKETS_MS, keep=2000):
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.samples = deque(maxlen=keep)
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(self.edges, ms)] += 1
+        self.samples.append(ms)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def percentile(self, p):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+    def summary(self):
+        out = {'count': len(self)}
+        if self.samples:
+            out.update(p50=self.percentile(50), p95=self.percentile(95), max=max(self.samples))
+        labels = [f'<={e}' for e in self.edges] + [f'>{self.edges[-1]}']
+        out['buckets'] = dict(zip(labels, self.counts))
+        return out
+
+    def format(self, width=30):
+        labels = [f'<={e}ms' for e in self.edges] + [f'>{self.edges[-1]}ms']
+        peak = max(self.counts) or 1
+        return [f'  {lbl:>8} {n:5d} ' + '#' * (n * width // peak)
+                for lbl, n in zip(labels, self.counts) if n]
+
+
+class LatencyProbe:
+    """Timestamp input, play_sfx and channel busy/idle transitions."""
+
+    METRICS = ('input_to_play', 'play_to_busy', 'end_lag')
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.hist = {m: Histogram() for m in self.METRICS}
+        self._input_at = None
+        # channel -> [key, played_at, expected length (s), seen busy]
+        self._watch = {}
+        self.timeouts = 0
+
+    def input(self):
+        self._input_at = self.clock()
+
+    def played(self, key, channel, sound=None):
+        now = self.clock()
+        if self._input_at is not None and now - self._input_at <= INPUT_WINDOW_S:
+            self.hist['input_to_play'].add((now - self._input_at) * 1000.0)
+        self._input_at = None
+        try:
+            length = sound.get_length() if sound is not None else None
+        except Exception:
+            length = None
+        # a retriggered channel starts a new measurement
+        self._watch[channel] = [key, now, length, False]
+
+    def poll(self):
+        """Check watched channels; call often (every frame in game)."""
+        if not self._watch:
+            return
+        now = self.clock()
+        for channel, entry in list(self._watch.items()):
+            key, started, length, seen = entry
+            try:
+                busy = channel.get_busy()
+            except Exception:
+                busy = False
+            if busy and not seen:
+                entry[3] = True
+                self.hist['play_to_busy'].add((now - started) * 1000.0)
+            elif not busy and seen:
+                del self._watch[channel]
+                if length is not None:
+                    self.hist['end_lag'].add(max(0.0, now - started - length) * 1000.0)
+            elif now - started > POLL_TIMEOUT_S + (length or 0.0):
+                del self._watch[channel]
+                self.timeouts += 1
+
+    @property
+    def watching(self):
+        return bool(self._watch)
+
+    def report(self):
+        out = {m: h.summary() for m, h in self.hist.items()}
+        out['timeouts'] = self.timeouts
+        return out
+
+    def format_report(self, title='audio latency'):
+        lines = [f'[audio_latency] {title}']
+        for m, h in self.hist.items():
+            s = h.summary()
+            if not s['count']:
+                lines.append(f'  {m}: no samples')
+                continue
+            lines.append(f"  {m}: n={s['count']} p50={s['p50']:.1f}ms p95={s['p95']:.1f}ms max={s['max']:.1f}ms")
+            lines.extend(h.format())
+        if self.timeouts:
+            lines.append(f'  timeouts: {self.timeouts}')
+        return lines
+
+
+def from_env():
+    """Return a LatencyProbe when MANGO_AUDIO_LATENCY=1, else None."""
+    if os.environ.get('MANGO_AUDIO_LATENCY') != '1':
+        return None
+    import atexit
+    probe = LatencyProbe()
+    atexit.register(lambda: print('\n'.join(probe.format_report(f'preset {preset_name()}'))))
+    return probe
+
+
+# --- offline measurement -----------------------------------------------------
+def measure_preset(name, trials=20, sound_ms=60, driver='dummy', gap_s=0.02):
+    """Play a short synth tone `trials` times under `driver` and time it.
+
+    Each trial stamps an input, calls Channel.play and spins on get_busy()
+    until the sound has started and finished. Returns the probe report plus
+    the preset and its buffer duration.
+    """
+    import synth
+    if driver:
+        os.environ['SDL_AUDIODRIVER'] = driver
+    try:
+        pygame.mixer.quit()
+    except Exception:
+        pass
+    preset = get_preset(name)
+    if not init_mixer(name):
+        return {'preset': name, 'error': 'mixer init failed'}
+    try:
+        rate, size, channels = synth.mixer_format()
+        snd = pygame.mixer.Sound(buffer=synth.pcm('tone', sound_ms, 0.2, rate, channels, freq=880.0))
+        ch = pygame.mixer.Channel(0)
+        probe = LatencyProbe()
+        for _ in range(trials):
+            probe.input()
+            ch.play(snd)
+            probe.played('tone', ch, snd)
+            while probe.watching:
+                probe.poll()
+                time.sleep(0.0005)
+            time.sleep(gap_s)
+        out = probe.report()
+        out['preset'] = name
+        out['actual'] = pygame.mixer.get_init()
+        out['settings'] = preset
+        out['buffer_ms'] = buffer_ms(preset)
+        out['lines'] = probe.format_report(f"preset {name} ({preset['buffer']} frames @ {preset['frequency']} Hz, {buffer_ms(preset):.1f} ms buffer)")
+        return out
+    finally:
+        try:
+            pygame.mixer.quit()
+        except Exception:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--presets', default=','.join(PRESETS), help='comma-separated preset names')
+    parser.add_argument('--trials', type=int, default=20)
+    parser.add_argument('--driver', default='dummy', help="SDL_AUDIODRIVER to use ('' keeps the default)")
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+    if pygame is None or not hasattr(pygame, 'mixer'):
+        print('[audio_latency] pygame.mixer is not available')
+        return 1
+    results = []
+    for name in [n.strip() for n in args.presets.split(',') if n.strip()]:
+        if name not in PRESETS:
+            print(f'[audio_latency] skipping unknown preset {name!r}')
+            continue
+        res = measure_preset(name, args.trials, driver=args.driver)
+        results.append(res)
+        print('\n'.join(res.pop('lines', [f"[audio_latency] preset {name}: {res.get('error')}"])))
+    if args.json:
+        import json
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""The 'audio' category of mango_log, with a file sink.
+
+Messages below the current level cost an empty call (see mango_log), so
+a disabled ``log.debug('played %s', key)`` on every flap is cheap.
+Enabled messages go into the ring buffer read by the F3 dev overlay.
+
+Off by default in web and frozen (release) builds; a source checkout keeps
+warnings and errors in the ring buffer. Set MANGO_AUDIO_LOG to
+off/error/warning/info/debug to choose the level, or name audio in
+MANGO_DEBUG. Either one also echoes to stdout and, on desktop, appends to
+``audio_debug.log`` in batches, rotating the file when it grows past
+MAX_BYTES. MANGO_AUDIO_LOG_FILE moves the file (0 disables it); setting
+it alone turns the file on at the default level.
+"""
+import os
+
+import mango_log
+from mango_log import (  # noqa: F401  (re-exported for existing callers)
+    IS_WASM, IS_RELEASE, DEBUG, INFO, WARNING, ERROR, OFF, LEVELS,
+    RING_SIZE, FLUSH_INTERVAL, MAX_BYTES, BACKUPS, parse_level, format_record,
+)
+
+DEFAULT_FILE = 'audio_debug.log'
+
+
+class AudioLog(mango_log.Logger):
+    """Ring buffer plus batched rotating-file sink for the audio category."""
+
+    def __init__(self, level=WARNING, path=None, echo=False, **kwargs):
+        mango_log.Logger.__init__(self, 'audio', level, path, echo, **kwargs)
+        self.default_level = OFF if IS_RELEASE else WARNING
+
+
+_log = None
+
+
+def get_log():
+    """Return the process-wide audio log, configured from the environment."""
+    global _log
+    if _log is None:
+        env = os.environ.get('MANGO_AUDIO_LOG')
+        if env:
+            level = parse_level(env)
+        else:
+            level = mango_log.level_for('audio', OFF if IS_RELEASE else WARNING)
+        echo = bool(env) or mango_log.configured('audio')
+        # the file is only written when asked for, so plain runs leave no log behind
+        path = os.environ.get('MANGO_AUDIO_LOG_FILE', DEFAULT_FILE if echo else None)
+        if IS_WASM or path == '0':
+            path = None
+        _log = mango_log.register(AudioLog(level, path, echo=echo))
+    return _log
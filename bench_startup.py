@@ -0,0 +1,140 @@
+"""Import-time startup benchmark based on ``python -X importtime``.
+
+Runs each target import in a fresh interpreter several times and reports
+the best cumulative import time of the target plus the slowest modules it
+pulled in. Use --save to write a JSON baseline and --compare to diff a
+later run against it:
+
+    python bench_startup.py --save bench_baseline.json
+    python bench_startup.py --compare bench_baseline.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+
+# Modules whose cold import cost we track
+DEFAULT_TARGETS = ['project', 'flappy', 'feed_minigame', 'tickle_minigame', 'hub_ui', 'constants']
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into a list of (module, depth, self_us, cum_us).
+
+    Lines look like ``import time:       123 |        456 |   package.mod``;
+    nested imports are indented by two spaces per level in the last column
+    and are printed before the module that imported them.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cum_us = int(parts[1].strip())
+        except ValueError:
+            # header line: "self [us] | cumulative | imported package"
+            continue
+        col = parts[2].rstrip()
+        name = col.lstrip()
+        depth = (len(col) - len(name) - 1) // 2
+        rows.append((name, depth, self_us, cum_us))
+    return rows
+
+
+def subtree(rows, target):
+    """Return (target row, rows imported while importing target)."""
+    for i, row in enumerate(rows):
+        if row[0] == target:
+            children = []
+            j = i - 1
+            while j >= 0 and rows[j][1] > row[1]:
+                children.append(rows[j])
+                j -= 1
+            return row, children
+    return None, []
+
+
+def measure(target, python=sys.executable):
+    """Import target in a fresh interpreter and return the parsed timings."""
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    env.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    proc = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def bench(targets, repeat=5, top=8):
+    """Return {target: {'cumulative_ms', 'modules', 'top': [(module, cumulative_ms)]}}."""
+    results = {}
+    for target in targets:
+        best = None
+        for _ in range(repeat):
+            row, children = subtree(measure(target), target)
+            if row is None:
+                continue
+            if best is None or row[3] < best[0][3]:
+                best = (row, children)
+        if best is None:
+            results[target] = {'cumulative_ms': None, 'modules': 0, 'top': []}
+            continue
+        row, children = best
+        heavy = sorted(children, key=lambda r: r[3], reverse=True)[:top]
+        results[target] = {
+            'cumulative_ms': round(row[3] / 1000.0, 2),
+            'modules': len(children) + 1,
+            'top': [(name, round(cum / 1000.0, 2)) for name, _d, _s, cum in heavy],
+        }
+    return results
+
+
+def format_results(results, baseline=None):
+    lines = []
+    for target, info in results.items():
+        ms = info['cumulative_ms']
+        if ms is None:
+            lines.append(f'{target:>16}: import failed')
+            continue
+        line = f'{target:>16}: {ms:8.2f} ms, {info["modules"]} modules'
+        old = (baseline or {}).get(target, {}).get('cumulative_ms')
+        if old:
+            line += f'  (baseline {old:.2f} ms, {ms - old:+.2f} ms)'
+        lines.append(line)
+        for name, cum in info['top']:
+            lines.append(f'{"":>18}{cum:8.2f} ms  {name}')
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('targets', nargs='*', default=DEFAULT_TARGETS)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per target; best is kept')
+    parser.add_argument('--top', type=int, default=8, help='slowest sub-imports to list')
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--compare', help='JSON file from an earlier --save run')
+    args = parser.parse_args(argv)
+
+    results = bench(args.targets, repeat=args.repeat, top=args.top)
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    for line in format_results(results, baseline):
+        print(line)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Screen size, colours and game states shared by every module.
+
+Kept free of heavy imports (no pygame, PIL or sqlite3) so mini-games and UI
+helpers can use the constants without importing project.py.
+
+SCREEN_WIDTH/SCREEN_HEIGHT are updated at runtime by MangoTamagotchi when
+the browser canvas has a different size, so read them as
+``constants.SCREEN_WIDTH`` rather than copying them at import time.
+"""
+
+# Game version, shown in the window caption and recorded with startup timings
+VERSION = "2.0"
+
+# Constants
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 700
+FPS = 60
+
+# Modern Color Palette
+WHITE = (255, 255, 255)
+BLACK = (20, 20, 20)
+DARK_GRAY = (40, 40, 40)
+LIGHT_GRAY = (220, 220, 220)
+GREEN = (76, 175, 80)
+RED = (244, 67, 54)
+BLUE = (33, 150, 243)
+YELLOW = (255, 193, 7)
+ORANGE = (255, 152, 0)
+PINK = (233, 30, 99)
+PURPLE = (156, 39, 176)
+TEAL = (0, 150, 136)
+LIGHT_BLUE = (173, 216, 230)
+DARK_BLUE = (25, 25, 112)
+GOLD = (255, 215, 0)
+SILVER = (192, 192, 192)
+BRONZE = (205, 127, 50)
+LIGHT_ORANGE = (255, 223, 190)
+
+# Gradient Colors
+GRADIENT_START = (135, 206, 235)  # Sky blue
+GRADIENT_END = (70, 130, 180)     # Steel blue
+NIGHT_START = (25, 25, 112)       # Midnight blue
+NIGHT_END = (72, 61, 139)         # Dark slate blue
+
+
+# Game states
+# Each state corresponds to a Scene on the scene stack (see scenes.py); the
+# active scene mirrors its state onto MangoTamagotchi.state.
+class GameState:
+    MAIN_MENU = "main_menu"
+    TAMAGOTCHI_HUB = "tamagotchi_hub"
+    FLAPPY_MANGO = "flappy_mango"
+    FEED_MINIGAME = "feed_minigame"
+    TICKLE_MINIGAME = "tickle_minigame"
+    GAME_OVER = "game_over"
@@ -2,11 +2,15 @@ import os
 import json
 from datetime import datetime
 
+from mango_log import get_logger
+
 try:
     import sqlite3
 except Exception:
     sqlite3 = None
 
+log = get_logger('db')
+
 
 def init_database(db_path, schema_path='schema.sql'):
     """Initialize the SQLite database with schema at db_path."""
@@ -37,8 +41,9 @@ def init_database(db_path, schema_path='schema.sql'):
                     cursor.executescript(schema)
             else:
                 raise FileNotFoundError(f"schema not found: {schema_path}")
-        except Exception:
+        except Exception as e:
             # If schema not found, create minimal tables
+            log.info('using minimal tables: %s', e)
             try:
                 cursor.execute('CREATE TABLE IF NOT EXISTS mango_state (id INTEGER PRIMARY KEY AUTOINCREMENT, hunger INTEGER, happiness INTEGER, cleanliness INTEGER, energy INTEGER, health INTEGER, age INTEGER, last_updated TEXT)')
                 cursor.execute('CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY AUTOINCREMENT, score INTEGER)')
@@ -81,8 +86,8 @@ def save_state(db_path, mango_state):
                 ),
             )
             conn.commit()
-        except Exception:
-            pass
+        except Exception as e:
+            log.warning('could not save state: %s', e)
         finally:
             try:
                 conn.close()
@@ -105,8 +110,8 @@ def save_state(db_path, mango_state):
             data['mango_state'].append(entry)
             with open(json_path, 'w') as jf:
                 json.dump(data, jf)
-        except Exception:
-            pass
+        except Exception as e:
+            log.warning('could not save state to %s: %s', json_path, e)
 
 
 def load_state(db_path):
@@ -157,8 +162,8 @@ def save_score(db_path, score):
             cursor.execute("INSERT INTO scores (score) VALUES (?)", (score,))
             conn.commit()
             conn.close()
-        except Exception:
-            pass
+        except Exception as e:
+            log.warning('could not save score: %s', e)
     else:
         json_path = db_path + '.json'
         try:
@@ -169,8 +174,8 @@ def save_score(db_path, score):
             data.setdefault('scores', []).append({'score': int(score), 'ts': datetime.now().isoformat()})
             with open(json_path, 'w') as jf:
                 json.dump(data, jf)
-        except Exception:
-            pass
+        except Exception as e:
+            log.warning('could not save score to %s: %s', json_path, e)
 
 def get_high_score(db_path):
     """Return the highest score from sqlite or JSON fallback."""
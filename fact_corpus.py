@@ -0,0 +1,348 @@
+"""Bird-fact corpus with an offset index and no-repeat sampling.
+
+The corpus is a UTF-8 text file, one fact per line:
+
+    behavior,species<TAB>Fischer's lovebirds carry nesting material in their beaks!
+
+There is one file per language: ``assets/data/facts.<lang>.tsv``.
+MANGO_LANG picks the language, and English is the fallback. Next to each
+corpus sits a binary index (``.idx``). It records where each fact's text
+starts and how long it is, plus one sorted list of fact numbers per tag.
+The corpus therefore never has to be parsed at startup:
+
+    b'MFCX' | u16 version | u16 tag count | u32 fact count | u32 corpus length | u32 corpus crc32
+    fact count x (u32 text offset, u32 text length)
+    per tag: u16 name length | name (utf-8, padded to 4) | u32 n | n x u32 fact number
+
+Nothing is opened until the first sample. Both files are then
+memory-mapped on desktop, or taken from the asset bundle. Only the
+facts actually drawn are decoded.
+
+Sampling is a shuffle bag, so no fact repeats until every fact (for the
+chosen tags) has been shown. The bag is an affine permutation
+``(a*i + b) mod n`` with a coprime to n, which is why it takes constant
+memory however big the corpus is. Memory stays flat with corpus size.
+
+If the index is missing or out of date it is rebuilt in memory, which
+costs about 8 bytes per fact. Ship the index instead:
+
+    python fact_corpus.py build assets/data/facts.en.tsv
+    python fact_corpus.py sample assets/data/facts.en.tsv --tag behavior -n 5
+"""
+import os
+import sys
+import math
+import zlib
+import random
+import struct
+import bisect
+import argparse
+from array import array
+
+import asset_bundle
+from mango_log import get_logger
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+MAGIC = b'MFCX'
+VERSION = 1
+CORPUS_DIR = 'assets/data'
+DEFAULT_LANG = 'en'
+
+_HEADER = struct.Struct('<4sHHIII')
+_NAME_LEN = struct.Struct('<H')
+_COUNT = struct.Struct('<I')
+
+
+class CorpusError(Exception):
+    pass
+
+
+def corpus_path(lang=None):
+    """Path of the corpus for lang (MANGO_LANG, then English), or None."""
+    lang = (lang or os.environ.get('MANGO_LANG') or DEFAULT_LANG).split('_')[0].lower()
+    for code in dict.fromkeys((lang, DEFAULT_LANG)):
+        path = f'{CORPUS_DIR}/facts.{code}.tsv'
+        if asset_bundle.exists(path):
+            return path
+    return None
+
+
+def _pad4(n):
+    return (4 - n % 4) % 4
+
+
+def _crc(data):
+    # one pass over the (mapped) corpus on open; catches edits that keep the length
+    return zlib.crc32(data) & 0xffffffff
+
+
+def _u32(view):
+    """uint32 sequence over little-endian bytes, without copying where possible."""
+    if sys.byteorder == 'little' and array('I').itemsize == 4:
+        return view.cast('I')
+    a = array('I')
+    if a.itemsize != 4:
+        a = array('L')
+    a.frombytes(bytes(view))
+    if sys.byteorder != 'little':
+        a.byteswap()
+    return a
+
+
+def scan(data):
+    """Parse corpus bytes into (spans array, {tag: array of fact numbers})."""
+    spans = array('I')
+    tags = {}
+    pos, end, n = 0, len(data), 0
+    while pos < end:
+        nl = data.find(b'\n', pos)
+        if nl < 0:
+            nl = end
+        line_end = nl - 1 if nl > pos and data[nl - 1:nl] == b'\r' else nl
+        tab = data.find(b'\t', pos, line_end)
+        if line_end > pos and data[pos:pos + 1] != b'#' and tab >= 0 and line_end > tab + 1:
+            spans.append(tab + 1)
+            spans.append(line_end - tab - 1)
+            for tag in bytes(data[pos:tab]).decode('utf-8').split(','):
+                tag = tag.strip().lower()
+                if tag:
+                    tags.setdefault(tag, array('I')).append(n)
+            n += 1
+        pos = nl + 1
+    return spans, tags
+
+
+def index_bytes(data):
+    """Return the .idx file contents for corpus bytes."""
+    spans, tags = scan(data)
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(tags), len(spans) // 2, len(data), _crc(data)))
+    if sys.byteorder != 'little':
+        spans.byteswap()
+    out += spans.tobytes()
+    for name in sorted(tags):
+        raw = name.encode('utf-8')
+        nums = tags[name]
+        if sys.byteorder != 'little':
+            nums.byteswap()
+        out += _NAME_LEN.pack(len(raw)) + raw + b'\0' * _pad4(_NAME_LEN.size + len(raw))
+        out += _COUNT.pack(len(tags[name])) + nums.tobytes()
+    return bytes(out)
+
+
+def build_index(path, out=None):
+    """Write the index for the corpus at path (default path + '.idx')."""
+    out = out or path + '.idx'
+    with open(path, 'rb') as f:
+        data = f.read()
+    blob = index_bytes(data)
+    tmp = out + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp, out)
+    return _HEADER.unpack_from(blob, 0)[3]
+
+
+def _map(path):
+    """Return (memoryview, closer) over a file: bundle view, mmap or one read."""
+    bundle = asset_bundle.bundle_for(path)
+    if bundle is not None:
+        return bundle.view(path), None
+    if not IS_WASM:
+        try:
+            import mmap
+            f = open(path, 'rb')
+            try:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            finally:
+                f.close()
+            return memoryview(m), m
+        except (OSError, ValueError):
+            # empty files can't be mapped
+            pass
+    with open(path, 'rb') as f:
+        return memoryview(f.read()), None
+
+
+class ShuffleBag:
+    """Visit 0..n-1 in a random order, then reshuffle; O(1) memory."""
+
+    def __init__(self, n, rng=random):
+        self.n = n
+        self.rng = rng
+        self._last = None
+        self._reshuffle()
+
+    def _reshuffle(self):
+        n = self.n
+        self._i = 0
+        self._a = 1
+        if n > 2:
+            while True:
+                a = self.rng.randrange(1, n)
+                if math.gcd(a, n) == 1:
+                    self._a = a
+                    break
+        self._b = self.rng.randrange(n) if n else 0
+        if n > 1 and self._b == self._last:
+            # don't show the previous cycle's last item twice in a row
+            self._b = (self._b + 1) % n
+
+    def __len__(self):
+        return self.n
+
+    def next(self):
+        if self.n == 0:
+            return None
+        if self._i >= self.n:
+            self._reshuffle()
+        item = (self._a * self._i + self._b) % self.n
+        self._i += 1
+        self._last = item
+        return item
+
+
+class FactCorpus:
+    """Lazily opened, indexed fact file; see the module docstring."""
+
+    def __init__(self, path, index_path=None, rng=None):
+        self.path = path
+        self.index_path = index_path or path + '.idx'
+        self.rng = rng or random.Random()
+        self._data = None
+        self._closers = []
+        self._bags = {}
+
+    # --- opening -------------------------------------------------------------
+    def _open(self):
+        if self._data is not None:
+            return
+        data, closer = _map(self.path)
+        self._closers.append(closer)
+        try:
+            self._load_index(data)
+        except (OSError, CorpusError) as e:
+            get_logger('assets').warning('rebuilding index for %s in memory (%s)', self.path, e)
+            self._load_index_from(memoryview(index_bytes(bytes(data))), data)
+        self._data = data
+
+    def _load_index(self, data):
+        if not asset_bundle.exists(self.index_path):
+            raise CorpusError('no index')
+        idx, closer = _map(self.index_path)
+        self._closers.append(closer)
+        self._load_index_from(idx, data)
+
+    def _load_index_from(self, idx, data):
+        if len(idx) < _HEADER.size:
+            raise CorpusError('truncated index')
+        magic, version, ntags, count, length, crc = _HEADER.unpack_from(idx, 0)
+        if magic != MAGIC or version != VERSION:
+            raise CorpusError('not a fact index')
+        if length != len(data) or crc != _crc(data):
+            raise CorpusError('index is out of date')
+        pos = _HEADER.size
+        self._spans = _u32(idx[pos:pos + 8 * count])
+        pos += 8 * count
+        self._tags = {}
+        for _ in range(ntags):
+            (n,) = _NAME_LEN.unpack_from(idx, pos)
+            name = bytes(idx[pos + 2:pos + 2 + n]).decode('utf-8')
+            pos += _NAME_LEN.size + n + _pad4(_NAME_LEN.size + n)
+            (k,) = _COUNT.unpack_from(idx, pos)
+            pos += _COUNT.size
+            self._tags[name] = _u32(idx[pos:pos + 4 * k])
+            pos += 4 * k
+        self.count = count
+
+    def close(self):
+        self._data = None
+        self._spans = None
+        self._tags = {}
+        for closer in self._closers:
+            try:
+                if closer is not None:
+                    closer.close()
+            except Exception:
+                pass
+        self._closers = []
+
+    # --- access --------------------------------------------------------------
+    def __len__(self):
+        self._open()
+        return self.count
+
+    def tags(self):
+        self._open()
+        return {name: len(nums) for name, nums in self._tags.items()}
+
+    def fact(self, n):
+        """Text of fact number n."""
+        self._open()
+        off, length = self._spans[2 * n], self._spans[2 * n + 1]
+        return bytes(self._data[off:off + length]).decode('utf-8')
+
+    def _pool(self, tags):
+        """Fact numbers for the tags: (list of per-tag sequences) or None for all."""
+        if not tags:
+            return None
+        return [self._tags.get(t.lower(), ()) for t in tags]
+
+    def sample(self, tags=None):
+        """Return a fact not shown since the bag was last emptied, or None.
+
+        tags restricts the draw to facts carrying any of them.
+        """
+        self._open()
+        if isinstance(tags, str):
+            tags = (tags,)
+        key = tuple(sorted(t.lower() for t in tags)) if tags else ()
+        pool = self._pool(key)
+        size = self.count if pool is None else sum(len(p) for p in pool)
+        bag = self._bags.get(key)
+        if bag is None or len(bag) != size:
+            bag = self._bags[key] = ShuffleBag(size, self.rng)
+        for _ in range(size):
+            i = bag.next()
+            if pool is None:
+                return self.fact(i)
+            # walk the concatenated tag lists; a fact with several of the
+            # tags only counts under the first one so it isn't drawn twice
+            for t, nums in enumerate(pool):
+                if i < len(nums):
+                    n = nums[i]
+                    if not any(_contains(prev, n) for prev in pool[:t]):
+                        return self.fact(n)
+                    break
+                i -= len(nums)
+        return None
+
+
+def _contains(sorted_nums, n):
+    j = bisect.bisect_left(sorted_nums, n)
+    return j < len(sorted_nums) and sorted_nums[j] == n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    b = sub.add_parser('build', help='write the .idx next to a corpus')
+    b.add_argument('corpus')
+    s = sub.add_parser('sample', help='print facts drawn from a corpus')
+    s.add_argument('corpus')
+    s.add_argument('--tag', action='append')
+    s.add_argument('-n', type=int, default=5)
+    args = parser.parse_args(argv)
+    if args.cmd == 'build':
+        count = build_index(args.corpus)
+        print(f'{args.corpus}.idx: {count} facts')
+    else:
+        corpus = FactCorpus(args.corpus)
+        print(f'{len(corpus)} facts, tags: {corpus.tags()}')
+        for _ in range(args.n):
+            print('-', corpus.sample(args.tag))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""On-disk cache of provider HTTP responses.
+
+Each response body is stored as one small JSON file named by a hash of
+its URL, together with the time it was fetched and the server's ETag /
+Last-Modified validators. This lets the game do two things:
+
+- start with the last weather and bird fact straight away, instead of
+  hitting the backend on every launch;
+- revalidate with If-None-Match / If-Modified-Since, so an unchanged
+  response costs a 304 with no body.
+
+Limits:
+
+- bodies larger than max_bytes are not stored;
+- entries older than max_age are dropped when read;
+- prune() keeps at most max_entries files and max_bytes in total,
+  removing the least recently fetched first.
+
+How fresh an entry must be to skip a request is up to the caller
+(APIHandler uses its update intervals).
+"""
+import os
+import json
+import time
+import hashlib
+
+from mango_log import get_logger
+
+MAX_BYTES = 256 * 1024
+MAX_ENTRIES = 64
+# Entries older than this are useless even as a stale placeholder
+MAX_AGE = 7 * 24 * 3600
+
+
+class ResponseCache:
+    """URL -> {body, fetched_at, etag, last_modified} stored under directory."""
+
+    def __init__(self, directory, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES,
+                 max_age=MAX_AGE, clock=time.time):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.clock = clock
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest()[:20] + '.json')
+
+    def get(self, url):
+        """Return the stored entry for url, or None if missing, expired or unreadable."""
+        path = self._path(url)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('url') != url or not isinstance(entry.get('body'), str):
+                return None
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remove(path)
+            return None
+        if self.clock() - entry.get('fetched_at', 0) > self.max_age:
+            self._remove(path)
+            return None
+        return entry
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Store a response body (str). Returns the entry, or None if not stored."""
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+        if len(body.encode('utf-8')) > self.max_bytes:
+            return None
+        entry = {'url': url, 'fetched_at': self.clock(), 'etag': etag,
+                 'last_modified': last_modified, 'body': body}
+        if not self._write(url, entry):
+            return None
+        self.prune()
+        return entry
+
+    def touch(self, url):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        entry = self.get(url)
+        if entry is not None:
+            entry['fetched_at'] = self.clock()
+            self._write(url, entry)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Validators to send with a revalidation request."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _write(self, url, entry):
+        path = self._path(url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+            return True
+        except Exception as e:
+            get_logger('api').warning('could not write %s: %s', path, e)
+            return False
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _files(self):
+        """[(fetched_at, size, path)] for every stored entry."""
+        out = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return out
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                size = os.path.getsize(path)
+                with open(path, encoding='utf-8') as f:
+                    fetched = float(json.load(f).get('fetched_at', 0))
+            except Exception:
+                fetched, size = 0.0, 0
+            out.append((fetched, size, path))
+        return out
+
+    def prune(self):
+        """Drop the least recently fetched entries beyond the count/size limits."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        while files and (len(files) > self.max_entries or total > self.max_bytes):
+            _, size, path = files.pop(0)
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        files = self._files()
+        return {'entries': len(files), 'bytes': sum(size for _, size, _ in files)}
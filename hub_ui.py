@@ -3,6 +3,7 @@
 This module exposes three functions that operate on a MangoTamagotchi
 instance: draw_home_screen(game), handle_click(game, pos), draw_game_over_screen(game).
 They mirror the behavior previously defined as methods on MangoTamagotchi.
+`HubScene` and `GameOverScene` wrap them for the scene stack in scenes.py.
 """
 import time
 import os
@@ -11,12 +12,9 @@ import pygame
 import math
 from datetime import datetime
 
+import constants as _constants
+
 def draw_home_screen(game):
-    # Import project module for constants (done at runtime to avoid cycles)
-    try:
-        import project as _project
-    except Exception:
-        _project = None
 
     # Draw background (image or gradient). Do NOT autoplay music here;
     # browsers will block autoplay. Music should start after a user
@@ -29,8 +27,8 @@ def draw_home_screen(game):
 
     # Title
     try:
-        title_text = game.title_font.render("Mango: The Virtual Lovebird", True, _project.WHITE if _project else (255,255,255))
-        title_rect = title_text.get_rect(center=(getattr(_project, 'SCREEN_WIDTH', game.screen.get_width()) // 2, 40))
+        title_text = game.title_font.render("Mango: The Virtual Lovebird", True, _constants.WHITE)
+        title_rect = title_text.get_rect(center=(getattr(_constants, 'SCREEN_WIDTH', game.screen.get_width()) // 2, 40))
         game.screen.blit(title_text, title_rect)
     except Exception:
         pass
@@ -58,10 +56,10 @@ def draw_home_screen(game):
     # draw only the outline for the frame so the interior overlay remains dark
     try:
         # make the gold frame thicker for emphasis
-        pygame.draw.rect(game.screen, _project.GOLD if _project else (255,215,0), frame_rect, 6, border_radius=20)
+        pygame.draw.rect(game.screen, _constants.GOLD, frame_rect, 6, border_radius=20)
     except Exception:
         # fallback: draw a slightly thicker rectangle border
-        pygame.draw.rect(game.screen, _project.GOLD if _project else (255,215,0), frame_rect, 4)
+        pygame.draw.rect(game.screen, _constants.GOLD, frame_rect, 4)
     cage_rect = pygame.Rect(cage_x, cage_y, cage_width, cage_height)
     # Draw a semi-transparent black interior for the cage (transparent background)
     try:
@@ -147,7 +145,7 @@ def draw_home_screen(game):
     if not drawn:
         # fallback: draw consistent ellipse sized to HUB_SPRITE_SIZE
         try:
-            mango_color = _project.ORANGE if _project else (255,152,0)
+            mango_color = _constants.ORANGE
             w, h = HUB_SPRITE_SIZE
             pygame.draw.ellipse(game.screen, mango_color, (mango_x - w//2, mango_y - h//2, w, h))
         except Exception:
@@ -273,7 +271,8 @@ def draw_home_screen(game):
                     idx = int(game.animation_time * 6.0) % len(frames)
                     bf = frames[idx]
                     try:
-                        bs = pygame.transform.smoothscale(bf, (48, 48))
+                        from resources import get_resources
+                        bs = get_resources(game).scaled(bf, (48, 48))
                         cx, cy = flappy_rect.center
                         game.screen.blit(bs, bs.get_rect(center=(cx, cy - 10)))
                     except Exception:
@@ -506,17 +505,8 @@ def handle_click(game, pos):
                     if callable(action):
                         # If action is a mini-game launcher (convention: name starts with 'play_'),
                         # perform a fade_out from the hub before entering so the transition is smooth.
-                        try:
-                            aname = getattr(action, '__name__', '')
-                            # Only trigger a pre-launch fade when the player clicked the
-                            # Feed button (so the hub fades to black before entering Feed).
-                            if aname == 'play_feed_minigame' and hasattr(game, 'fade_out'):
-                                try:
-                                    game.fade_out()
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
+                        # Mini-game launchers push a scene; the scene manager
+                        # performs the fade transition itself.
                         # Trigger particle effects and temporary sprite animation for feedback
                         try:
                             if hasattr(game, 'particle_system') and game.particle_system:
@@ -575,16 +565,7 @@ def handle_click(game, pos):
         flappy_rect = getattr(game, '_flappy_button_rect', None)
         if flappy_rect and flappy_rect.collidepoint(pos):
             try:
-                # Fade out from hub then start flappy mini-game for a smooth transition
-                try:
-                    if hasattr(game, 'fade_out'):
-                        try:
-                            game.fade_out()
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                # Start flappy mini-game
+                # Start flappy mini-game (the scene manager fades the hub out)
                 try:
                     game._flappy_click_at = time.time()
                 except Exception:
@@ -673,3 +654,149 @@ def draw_game_over_screen(game):
         game.screen.blit(game_over_text, go_rect)
     except Exception:
         pass
+
+
+def drag_audio_slider(game, pos):
+    """Update whichever audio slider is being dragged from a logical mouse pos."""
+    mx, _my = pos
+    for key, meta in getattr(game, '_audio_sliders', {}).items():
+        if meta.get('dragging') and meta.get('rect'):
+            r = meta['rect']
+            rel = (mx - r.x) / float(r.w)
+            val = max(0.0, min(1.0, rel))
+            # only updates the bus; the mixer picks it up at the end of the
+            # frame and the settings file is written once dragging stops
+            if key == 'master':
+                game.master_volume = val
+            elif key == 'music':
+                game.music_volume = val
+            elif key == 'sfx':
+                game.sfx_volume = val
+            game.save_settings_later()
+
+
+def release_audio_sliders(game):
+    """Stop any slider drag (saving is debounced by save_settings_later)."""
+    for key, meta in getattr(game, '_audio_sliders', {}).items():
+        if meta.get('dragging'):
+            meta['dragging'] = False
+
+
+def audio_self_test(game):
+    """Developer audio self-test: play all SFX, then briefly each music track."""
+    try:
+        print("Audio self-test: playing flap, button, medicine, chirp, starting/stopping music...")
+        for key, pause_ms in (('flap', 300), ('button', 300), ('medicine', 400), ('chirp', 300)):
+            if key in game.sounds:
+                game._play_sfx(key)
+                pygame.time.delay(pause_ms)
+        # Play home music briefly then switch to forest
+        game._play_music('home')
+        pygame.time.delay(800)
+        game._play_music('forest')
+        pygame.time.delay(800)
+        game._stop_music()
+        print("Audio self-test complete.")
+    except Exception as e:
+        print(f"Audio self-test failed: {e}")
+
+
+try:
+    from scenes import Scene as _Scene
+except Exception:
+    _Scene = object
+
+
+class HubScene(_Scene):
+    """The Tamagotchi hub: stats decay, buttons and the audio dropdown."""
+
+    name = 'hub'
+    music = 'home'
+
+    def __init__(self, game, state=None):
+        super().__init__(game)
+        self.state = state
+
+    def handle_event(self, event):
+        game = self.game
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left click
+                handle_click(game, event.pos)
+        elif event.type == pygame.MOUSEMOTION:
+            try:
+                drag_audio_slider(game, event.pos)
+            except Exception:
+                pass
+        elif event.type == pygame.MOUSEBUTTONUP:
+            try:
+                if event.button == 1:
+                    release_audio_sliders(game)
+            except Exception:
+                pass
+        elif event.type == pygame.KEYDOWN:
+            # Developer audio self-test: press T in the hub to play all SFX/music
+            if event.key == pygame.K_t:
+                audio_self_test(game)
+            elif event.key == pygame.K_ESCAPE:
+                if self.manager is not None:
+                    self.manager.quit()
+
+    def update(self, dt):
+        game = self.game
+        # Update game state
+        game.update_stats()
+        game.age_mango()
+
+        # Force sickness if health is low (real-time check)
+        if game.mango_state['health'] <= 30 and not game.is_sick:
+            game.is_sick = True
+
+        # Update day/night cycle
+        current_hour = datetime.now().hour
+        if current_hour != game.current_hour:
+            game.current_hour = current_hour
+            game.is_night = current_hour < 6 or current_hour > 18
+
+        # Update particle system
+        try:
+            if getattr(game, 'particle_system', None):
+                game.particle_system.update(dt)
+        except Exception:
+            pass
+
+        # Advance a simple animation timer used by UI modules
+        try:
+            game.animation_time += dt
+        except Exception:
+            pass
+
+        # Check game over
+        if game.is_game_over() and self.manager is not None:
+            state = _constants.GameState.GAME_OVER
+            self.manager.replace(self.manager.get('game_over', lambda: GameOverScene(game, state)))
+
+    def draw(self, surface):
+        draw_home_screen(self.game)
+        # Draw particle overlays on top of hub UI
+        try:
+            if getattr(self.game, 'particle_system', None):
+                self.game.particle_system.draw(surface)
+        except Exception:
+            pass
+
+
+class GameOverScene(_Scene):
+    """Shown once Mango's health reaches zero; ESC quits."""
+
+    name = 'game_over'
+
+    def __init__(self, game, state=None):
+        super().__init__(game)
+        self.state = state
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE and self.manager is not None:
+            self.manager.quit()
+
+    def draw(self, surface):
+        draw_game_over_screen(self.game)
@@ -23,31 +23,31 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 
-# Simple console logger (works in browser and desktop)
-def log(msg: str):
-    sys.stdout.write(msg + "\n")
-    sys.stdout.flush()
+# Diagnostics go through mango_log: quiet in the browser unless
+# MANGO_DEBUG (or #debug in the page URL) asks for more
+from mango_log import get_logger
+
+log = get_logger('game')
 
 
 # Try importing the main game module
 try:
     import project  # your main game logic lives in project.py
 except Exception as e:
-    sys.stderr.write(f"[pygbag launcher] Failed to import project: {e}\n")
+    log.error('failed to import project: %s', e)
     traceback.print_exc()
     raise
 
 
 # Entrypoint for both local Python and pygbag builds
 if __name__ == "__main__":
-    log("[pygbag launcher] Starting Mango: The Virtual Lovebird...")
+    log.info("starting Mango: The Virtual Lovebird")
     # In pygbag, the asyncio loop is already running.
     # The adjusted `project.main()` handles both web and desktop correctly.
-    debug = os.environ.get('MANGO_DEBUG', '1') == '1'
     try:
         project.main()
     except Exception as e:
-        sys.stderr.write(f"[pygbag launcher] Game exited with error: {e}\n")
-        if debug:
+        log.error('game exited with error: %s', e)
+        if os.environ.get('MANGO_DEBUG', '1') != '0':
             traceback.print_exc()
         raise
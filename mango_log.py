@@ -0,0 +1,272 @@
+"""Levelled, categorised diagnostics for the whole game.
+
+    from mango_log import get_logger
+    log = get_logger('assets')
+    log.debug('loaded sprite %s', filename)
+
+Each category (audio, assets, db, wasm, game, api, ...) has its own level.
+Methods for disabled levels are swapped for a no-op on the instance, so
+a disabled ``log.debug(...)`` costs one empty call and the message is
+never formatted. Hot paths that build arguments can guard with
+``log.enabled_for(DEBUG)``. Enabled messages go into a bounded ring
+buffer (read by the F3 dev overlay) and are echoed to stdout as
+``[category] message``. A logger given a path also appends them to that
+file in batches, from a daemon thread about once a second, rotating it
+past MAX_BYTES (audio_log uses this).
+
+Defaults are quiet: web and frozen builds only show errors, because
+under pygbag stdout is the slow browser terminal. A source checkout
+also shows warnings. MANGO_DEBUG (or ``#debug`` in the page URL) turns
+more on. It is a comma-separated list of items:
+
+    MANGO_DEBUG=1                  debug for every category
+    MANGO_DEBUG=info               that level for every category
+    MANGO_DEBUG=assets,wasm        debug for those categories
+    MANGO_DEBUG=audio=info,db=off  per-category levels
+"""
+import os
+import sys
+import time
+import atexit
+import threading
+from collections import deque
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+IS_RELEASE = IS_WASM or bool(getattr(sys, 'frozen', False))
+
+DEBUG, INFO, WARNING, ERROR, OFF = 10, 20, 30, 40, 100
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+_NAMES = {v: k.upper() for k, v in LEVELS.items()}
+_METHODS = (('debug', DEBUG), ('info', INFO), ('warning', WARNING), ('error', ERROR))
+
+DEFAULT_LEVEL = ERROR if IS_RELEASE else WARNING
+RING_SIZE = 200
+FLUSH_INTERVAL = 1.0
+MAX_BYTES = 256 * 1024
+BACKUPS = 2
+
+
+def parse_level(value, default=OFF):
+    if isinstance(value, int):
+        return value
+    value = str(value or '').strip().lower()
+    if value in ('1', 'true', 'yes', 'on', 'all'):
+        return DEBUG
+    return LEVELS.get(value, default)
+
+
+def parse_config(value):
+    """MANGO_DEBUG -> (level for every category or None, {category: level})."""
+    everything, per_category = None, {}
+    for item in str(value or '').split(','):
+        item = item.strip().lower()
+        if not item or item in ('0', 'false', 'no'):
+            continue
+        if '=' in item:
+            name, _, level = item.partition('=')
+            per_category[name.strip()] = parse_level(level, DEBUG)
+        elif parse_level(item, None) is not None:
+            everything = parse_level(item)
+        else:
+            per_category[item] = DEBUG
+    return everything, per_category
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+class Logger:
+    """One category: level, ring buffer, stdout echo and optional file sink."""
+
+    def __init__(self, category, level=DEFAULT_LEVEL, path=None, echo=True, ring_size=RING_SIZE,
+                 flush_interval=FLUSH_INTERVAL, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.category = category
+        self._saved_level = None
+        self.path = path
+        self.echo = echo
+        self.ring = deque(maxlen=ring_size)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+        # what reset() falls back to when MANGO_DEBUG says nothing
+        self.default_level = None
+        self.level = level
+
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, value):
+        self._level = parse_level(value)
+        # disabled levels become a no-op on the instance; enabled ones
+        # fall back to the class method
+        for name, level in _METHODS:
+            if level < self._level:
+                setattr(self, name, _noop)
+            else:
+                self.__dict__.pop(name, None)
+
+    # --- logging -------------------------------------------------------------
+    def enabled_for(self, level):
+        return level >= self._level
+
+    def log(self, level, msg, *args):
+        if level < self._level:
+            return
+        if args:
+            try:
+                msg = msg % args
+            except Exception:
+                msg = f'{msg} {args}'
+        record = (time.time(), level, msg)
+        self.ring.append(record)
+        if self.echo:
+            print(f'[{self.category}] {msg}')
+        if self.path:
+            with self._lock:
+                self._pending.append(record)
+            self._ensure_thread()
+
+    def debug(self, msg, *args):
+        self.log(DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        self.log(INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        self.log(WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        self.log(ERROR, msg, *args)
+
+    def set_level(self, level):
+        self.level = level
+
+    def set_verbose(self, on):
+        """Log everything while the dev overlay is open, then restore the level."""
+        if on and self._saved_level is None:
+            self._saved_level, self.level = self.level, DEBUG
+        elif not on and self._saved_level is not None:
+            self.level, self._saved_level = self._saved_level, None
+
+    def tail(self, n=4):
+        """Return the last n messages as formatted lines (for the dev overlay)."""
+        return [format_record(r) for r in list(self.ring)[-n:]]
+
+    # --- file sink -----------------------------------------------------------
+    def _ensure_thread(self):
+        if self._thread is not None or IS_WASM:
+            return
+        self._thread = threading.Thread(target=self._flush_loop, name=f'mango-log-{self.category}', daemon=True)
+        self._thread.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Append pending records to the file now."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch or not self.path:
+            return 0
+        try:
+            self._rotate()
+            with open(self.path, 'a') as f:
+                f.write(''.join(format_record(r) + '\n' for r in batch))
+        except Exception:
+            return 0
+        return len(batch)
+
+    def _rotate(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+        except OSError:
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f'{self.path}.{i}'
+            if os.path.exists(src):
+                os.replace(src, f'{self.path}.{i + 1}')
+        if self.backups > 0:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+
+
+def format_record(record):
+    ts, level, msg = record
+    return f"{time.strftime('%H:%M:%S', time.localtime(ts))} {_NAMES.get(level, level)} {msg}"
+
+
+# --- configuration -----------------------------------------------------------
+_loggers = {}
+_config = None
+
+
+def _page_wants_debug():
+    """True when the web page URL carries #debug (pygbag's debug flag)."""
+    if not IS_WASM:
+        return False
+    try:
+        import platform
+        return 'debug' in str(platform.window.location.hash)
+    except Exception:
+        return False
+
+
+def config():
+    """The parsed MANGO_DEBUG setting (read once)."""
+    global _config
+    if _config is None:
+        value = os.environ.get('MANGO_DEBUG')
+        if value is None and _page_wants_debug():
+            value = '1'
+        _config = parse_config(value)
+    return _config
+
+
+def level_for(category, default=None):
+    """Configured level for category: MANGO_DEBUG, then default, then DEFAULT_LEVEL."""
+    everything, per_category = config()
+    if category in per_category:
+        return per_category[category]
+    if everything is not None:
+        return everything
+    return DEFAULT_LEVEL if default is None else default
+
+
+def configured(category):
+    """True if MANGO_DEBUG names category or sets a level for everything."""
+    everything, per_category = config()
+    return everything is not None or category in per_category
+
+
+def get_logger(category):
+    """Return the process-wide logger for category."""
+    log = _loggers.get(category)
+    if log is None:
+        log = _loggers[category] = Logger(category, level_for(category))
+    return log
+
+
+def register(log):
+    """Make log the process-wide logger for its category (used by audio_log)."""
+    _loggers[log.category] = log
+    if log.path:
+        atexit.register(log.flush)
+    return log
+
+
+def reset(value=None):
+    """Re-read the configuration from value (or MANGO_DEBUG) and re-level every logger."""
+    global _config
+    _config = parse_config(value) if value is not None else None
+    for category, log in _loggers.items():
+        log.level = level_for(category, log.default_level)
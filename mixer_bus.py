@@ -0,0 +1,150 @@
+"""Master/music/SFX gain buses and debounced settings persistence.
+
+`MixerBuses` holds the three slider values and the effective gains derived
+from them (music = master * music, sfx = master * sfx). Changing a value
+only marks the buses dirty; AudioManager applies the music gain once per
+frame (see AudioManager.end_frame) and applies the SFX gain to each voice's
+channel when it starts playing, so dragging a slider no longer touches
+every loaded Sound on every mouse-motion event.
+
+MangoTamagotchi exposes the values as ``master_volume``, ``music_volume``
+and ``sfx_volume`` through `bus_property`, so existing code keeps reading
+and assigning them as plain attributes.
+
+`SettingsStore` writes the settings JSON at most once per DEBOUNCE_S after
+the last change instead of on every slider release.
+"""
+import os
+import json
+import time
+
+from mango_log import get_logger
+
+BUSES = ('master', 'music', 'sfx')
+DEFAULTS = {'master': 0.9, 'music': 0.6, 'sfx': 0.9}
+
+# Quiet time after the last change before settings are written
+DEBOUNCE_S = 0.75
+
+
+def _clamp(value):
+    try:
+        return max(0.0, min(1.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+class MixerBuses:
+    """Slider values per bus plus a dirty flag for lazy application."""
+
+    def __init__(self, **values):
+        self._values = dict(DEFAULTS)
+        self.dirty = True
+        self.update(values)
+
+    def get(self, bus):
+        return self._values[bus]
+
+    def set(self, bus, value):
+        value = _clamp(value)
+        if value is None or bus not in self._values:
+            return False
+        if value != self._values[bus]:
+            self._values[bus] = value
+            self.dirty = True
+        return True
+
+    def update(self, values):
+        for bus, value in (values or {}).items():
+            self.set(bus, value)
+
+    def gain(self, bus):
+        """Effective gain for a bus (master already multiplied in)."""
+        if bus == 'master':
+            return self._values['master']
+        return self._values['master'] * self._values[bus]
+
+    @property
+    def music_gain(self):
+        return self.gain('music')
+
+    @property
+    def sfx_gain(self):
+        return self.gain('sfx')
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def consume(self):
+        """Return True (once) if anything changed since the last call."""
+        dirty, self.dirty = self.dirty, False
+        return dirty
+
+    def as_settings(self):
+        return {f'{bus}_volume': self._values[bus] for bus in BUSES}
+
+    def load_settings(self, data):
+        self.update({bus: data.get(f'{bus}_volume') for bus in BUSES if f'{bus}_volume' in data})
+
+
+def bus_property(bus):
+    """Attribute on the game object that reads/writes self.buses."""
+    def fget(self):
+        return self.buses.get(bus)
+
+    def fset(self, value):
+        self.buses.set(bus, value)
+    return property(fget, fset, doc=f'{bus} bus volume (0..1)')
+
+
+class SettingsStore:
+    """JSON settings file written with a debounce."""
+
+    def __init__(self, path, debounce=DEBOUNCE_S, clock=time.monotonic):
+        self.path = path
+        self.debounce = debounce
+        self.clock = clock
+        self._pending = None
+        self._due = 0.0
+        self.writes = 0
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def schedule(self, data):
+        """Remember data and push the write back by the debounce interval."""
+        self._pending = dict(data)
+        self._due = self.clock() + self.debounce
+
+    @property
+    def pending(self):
+        return self._pending is not None
+
+    def tick(self):
+        """Write the pending settings if the debounce interval has passed."""
+        if self._pending is not None and self.clock() >= self._due:
+            return self.flush()
+        return False
+
+    def flush(self):
+        data, self._pending = self._pending, None
+        if data is None:
+            return False
+        try:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+            self.writes += 1
+            return True
+        except Exception as e:
+            get_logger('db').warning('could not save %s: %s', self.path, e)
+            return False
@@ -0,0 +1,219 @@
+"""Chunked music playback for the browser.
+
+pygbag builds can't use ``pygame.mixer.music``, and decoding a whole track
+into one ``Sound`` costs the full decode time up front and the whole
+track's PCM in memory. `MusicStream` instead reads a PCM WAV in fixed-size
+chunks (CHUNK_MS each), converts them to the mixer's format and feeds them
+to one channel with ``Channel.queue``. `pump()` runs once per frame: it
+queues the prefetched chunk when the channel's queue slot frees up and
+then decodes the following one, so at most three chunks (playing, queued,
+prefetched) are alive whatever the track length.
+
+Only 16-bit PCM WAV is streamed; `streamable()` says whether a file
+qualifies and callers fall back to a whole-track Sound otherwise.
+"""
+import sys
+import struct
+from array import array
+
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+import asset_bundle
+
+# Length of one queued chunk
+CHUNK_MS = 500
+
+
+def _read_header(f):
+    """Return (rate, sample width, channels, data offset, data length) or None."""
+    head = f.read(12)
+    if len(head) < 12 or head[0:4] != b'RIFF' or head[8:12] != b'WAVE':
+        return None
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        cid, size = chunk[0:4], struct.unpack('<I', chunk[4:8])[0]
+        if cid == b'fmt ':
+            body = f.read(size)
+            tag, channels, rate = struct.unpack_from('<HHI', body, 0)
+            bits = struct.unpack_from('<H', body, 14)[0]
+            if tag != 1:
+                return None
+            fmt = (rate, bits // 8, channels)
+            if size & 1:
+                f.seek(1, 1)
+        elif cid == b'data' and fmt is not None:
+            return fmt + (f.tell(), size)
+        else:
+            f.seek(size + (size & 1), 1)
+
+
+def streamable(path):
+    """True if path is a 16-bit PCM WAV that MusicStream can play."""
+    if not path or not path.lower().endswith('.wav') or not asset_bundle.exists(path):
+        return False
+    try:
+        f = asset_bundle.open_asset(path)
+        try:
+            info = _read_header(f)
+        finally:
+            f.close()
+    except Exception:
+        return False
+    return info is not None and info[1] == 2 and info[2] in (1, 2)
+
+
+def convert(data, src_rate, src_channels, dst_rate, dst_channels):
+    """Convert 16-bit little-endian PCM between rates and mono/stereo.
+
+    Resampling is nearest-sample (integer ratios, the usual 44.1k -> 22.05k
+    case, are plain slices), which is fine for background music.
+    """
+    a = array('h')
+    a.frombytes(bytes(data[:len(data) - len(data) % (2 * src_channels)]))
+    if sys.byteorder == 'big':
+        a.byteswap()
+    if src_rate == dst_rate and src_channels == dst_channels:
+        return a.tobytes()
+    chans = [a[c::src_channels] for c in range(src_channels)]
+    if dst_channels != src_channels:
+        # mono -> stereo duplicates; stereo -> mono keeps the left channel
+        chans = [chans[min(c, src_channels - 1)] for c in range(dst_channels)]
+    if src_rate != dst_rate:
+        if src_rate % dst_rate == 0:
+            step = src_rate // dst_rate
+            chans = [c[::step] for c in chans]
+        else:
+            n = len(chans[0]) * dst_rate // src_rate
+            idx = [i * src_rate // dst_rate for i in range(n)]
+            chans = [array('h', [c[j] for j in idx]) for c in chans]
+    if dst_channels == 1:
+        out = chans[0]
+    else:
+        out = array('h', bytes(2 * len(chans[0]) * dst_channels))
+        for c, samples in enumerate(chans):
+            out[c::dst_channels] = samples
+    if sys.byteorder == 'big':
+        out.byteswap()
+    return out.tobytes()
+
+
+def _mixer_sound(pcm):
+    return pygame.mixer.Sound(buffer=pcm)
+
+
+class MusicStream:
+    """Play a WAV on one channel in queued chunks, looping by default."""
+
+    def __init__(self, path, channel, loops=-1, chunk_ms=CHUNK_MS, mixer_format=None,
+                 make_sound=_mixer_sound):
+        self.path = path
+        self.channel = channel
+        self.loops = loops
+        self.make_sound = make_sound
+        self._file = asset_bundle.open_asset(path)
+        info = _read_header(self._file)
+        if info is None or info[1] != 2:
+            self._file.close()
+            raise ValueError(f'{path}: not a 16-bit PCM WAV')
+        self.rate, _width, self.channels, self._data_start, self._data_len = info
+        if mixer_format is None:
+            mixer_format = pygame.mixer.get_init()
+        self.out_rate, _size, self.out_channels = mixer_format
+        frames = int(self.rate * chunk_ms / 1000)
+        if self.rate > self.out_rate and self.rate % self.out_rate == 0:
+            # keep every chunk on the decimation grid
+            step = self.rate // self.out_rate
+            frames -= frames % step
+        self._chunk_bytes = max(1, frames) * 2 * self.channels
+        self._pos = 0
+        self._current = None
+        self._queued = None
+        self._next = None
+        self.active = False
+        self.chunks_decoded = 0
+
+    def _decode_next(self):
+        """Read and convert the next chunk; None at the end of a non-looping track."""
+        if self._pos >= self._data_len:
+            if self.loops == 0:
+                return None
+            if self.loops > 0:
+                self.loops -= 1
+            self._pos = 0
+        self._file.seek(self._data_start + self._pos)
+        raw = self._file.read(min(self._chunk_bytes, self._data_len - self._pos))
+        if not raw:
+            return None
+        self._pos += len(raw)
+        self.chunks_decoded += 1
+        pcm = convert(raw, self.rate, self.channels, self.out_rate, self.out_channels)
+        return self.make_sound(pcm)
+
+    def start(self, volume=None):
+        first = self._decode_next()
+        if first is None:
+            return False
+        if volume is not None:
+            try:
+                self.channel.set_volume(volume)
+            except Exception:
+                pass
+        self.channel.play(first)
+        self._current = first
+        self.active = True
+        # get the following chunk queued straight away so there is no gap
+        self._next = self._decode_next()
+        self.pump()
+        return True
+
+    def pump(self):
+        """Queue the prefetched chunk when the channel has room, then prefetch.
+
+        Decodes at most one chunk per call. Returns False once the track has
+        ended (non-looping) or the stream was stopped.
+        """
+        if not self.active:
+            return False
+        try:
+            queued = self.channel.get_queue()
+        except Exception:
+            queued = None
+        if queued is None:
+            if self._next is None:
+                try:
+                    busy = self.channel.get_busy()
+                except Exception:
+                    busy = False
+                if not busy:
+                    self.active = False
+                return self.active
+            self.channel.queue(self._next)
+            self._current, self._queued = self._queued or self._current, self._next
+            self._next = None
+        if self._next is None:
+            self._next = self._decode_next()
+        return True
+
+    def memory_bytes(self):
+        """PCM bytes held by the stream (at most three chunks)."""
+        held = [s for s in (self._current, self._queued, self._next) if s is not None]
+        out_chunk = self._chunk_bytes * self.out_rate // self.rate * self.out_channels // self.channels
+        return len(held) * out_chunk
+
+    def stop(self):
+        self.active = False
+        try:
+            self.channel.stop()
+        except Exception:
+            pass
+        self._current = self._queued = self._next = None
+        try:
+            self._file.close()
+        except Exception:
+            pass
@@ -4,15 +4,153 @@ This module exposes a simple `build()` function that will attempt to
 invoke pygbag when available, and also supports a `simulate` mode
 which creates a minimal static package under `dist/pygbag` for CI
 and local smoke tests (so tests don't require the heavier wasm build).
+
+With ``incremental=True`` (``--incremental``) the output directory is
+kept and a manifest (``.build-manifest.json``) records:
+
+- the content hash of every source file copied into the output;
+- every generated file;
+- the hash of pygbag's inputs.
+
+Each rebuild then does the following:
+
+- copies only the sources whose hash changed;
+- rewrites generated files only when their text changed;
+- deletes outputs whose source is gone;
+- skips pygbag entirely when none of its inputs changed.
+
+Source hashes are reused while a file's size and mtime are unchanged,
+so a no-op rebuild only stats the tree.
+
+With ``optimize=True`` (``--optimize``) assets are shrunk on the way
+through (see web_optimize.py) and a bytes-saved report is printed. The
+manifest maps each source to the outputs it produced, so a transcoded
+``x.wav`` -> ``x.ogg`` is still only redone when ``x.wav`` changes.
+
+Every build also writes ``asset-manifest.json`` (served file -> content
+hash) and a service worker, ``sw.js``, which index.html registers. The
+worker precaches those files under ``path?v=<hash>`` keys, so a repeat
+visit loads unchanged files without touching the network, and a new
+build only downloads what changed. serve_with_headers.py checks those
+keys against asset-manifest.json and serves them as immutable.
+
+With ``bundle=True`` (``--bundle``) a static build that serves the
+assets as loose files (``--simulate``) also packs them into
+``assets.bundle`` (see asset_bundle.py). The game then reads the bundle,
+and the worker precaches it instead of each asset. A pygbag build needs
+no bundle: pygbag already packs the assets into its ``.apk``, which the
+page downloads in one request and mounts in memory.
 """
 from __future__ import annotations
 
 import os
+import json
+import time
 import shutil
+import hashlib
 import subprocess
 import sys
 import textwrap
 
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 2
+# Files copied next to index.html, relative to the project root
+PACKAGED_FILES = ("main.py",)
+PACKAGED_DIRS = ("assets",)
+# What pygbag packs into the app: Python sources, its config and the assets
+PYGBAG_CONFIG = ("pyproject.toml",)
+SKIP_DIRS = {"__pycache__", ".git", ".pytest_cache", "build", "dist", "tests", ".venv"}
+SKIP_SUFFIXES = (".pyc", ".tmp")
+# Optimized copy of the project that pygbag packs when building with optimize
+STAGE_DIR = os.path.join("build", "web-stage")
+
+SIMULATED_INDEX = textwrap.dedent("""
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset="utf-8" />
+        <title>Mango Web Build (simulated)</title>
+      </head>
+      <body>
+        <h1>Mango Web Build (simulated)</h1>
+        <p>This is a simulated package produced for tests.</p>
+      </body>
+    </html>
+""")
+PYTHONRC_PLACEHOLDER = '# pythonrc placeholder created by package_web\n'
+
+# Offline cache: every served file with its content hash, and the worker
+# that precaches them (see _write_offline_cache)
+ASSET_MANIFEST = "asset-manifest.json"
+SERVICE_WORKER = "sw.js"
+CACHE_PREFIX = "mango-"
+# Not precached: build bookkeeping, the worker itself, precompressed siblings
+BUNDLE = "assets.bundle"
+OFFLINE_SKIP = (MANIFEST_NAME, ASSET_MANIFEST, SERVICE_WORKER)
+OFFLINE_SKIP_SUFFIXES = (".gz", ".br", ".tmp")
+SW_MARKER = "<!-- mango-sw -->"
+SW_REGISTER = SW_MARKER + """
+<script>
+if ('serviceWorker' in navigator && location.protocol !== 'file:') {
+    navigator.serviceWorker.register('%s').catch(function (e) { console.log('[sw] not registered', e); });
+}
+</script>
+""" % SERVICE_WORKER
+
+# Assets are cached under "<url>?v=<hash>", so a changed file gets a new
+# key while unchanged ones are reused from the previous version's cache.
+# The page itself is network-first so a new build (and a new worker) is
+# picked up; everything else is answered from the cache.
+SERVICE_WORKER_JS = textwrap.dedent("""
+    // generated by package_web; do not edit
+    const VERSION = "__VERSION__";
+    const CACHE = "__PREFIX__" + VERSION;
+    const FILES = __FILES__;
+    // packed into assets.bundle, so not precached one by one
+    const BUNDLED = new Set(__BUNDLED__);
+    const PAGES = new Set(["", "index.html"]);
+
+    const scope = new URL(self.registration.scope);
+    const keyFor = (path) => new URL(path + "?v=" + FILES[path], scope).href;
+
+    self.addEventListener("install", (event) => {
+        event.waitUntil((async () => {
+            const cache = await caches.open(CACHE);
+            for (const path of Object.keys(FILES)) {
+                if (BUNDLED.has(path)) continue;
+                const key = keyFor(path);
+                let hit = await caches.match(key);
+                if (!hit) {
+                    hit = await fetch(key, {cache: "no-cache"});
+                    if (!hit.ok) throw new Error("precache failed: " + path);
+                }
+                await cache.put(key, hit);
+            }
+            await self.skipWaiting();
+        })());
+    });
+
+    self.addEventListener("activate", (event) => {
+        event.waitUntil((async () => {
+            for (const name of await caches.keys()) {
+                if (name.startsWith("__PREFIX__") && name !== CACHE) await caches.delete(name);
+            }
+            await self.clients.claim();
+        })());
+    });
+
+    self.addEventListener("fetch", (event) => {
+        const url = new URL(event.request.url);
+        if (event.request.method !== "GET" || url.origin !== scope.origin) return;
+        const path = decodeURIComponent(url.pathname.slice(scope.pathname.length));
+        if (PAGES.has(path) || event.request.mode === "navigate") {
+            event.respondWith(fetch(event.request).catch(() => caches.match(keyFor("index.html"))));
+        } else if (path in FILES) {
+            event.respondWith(caches.match(keyFor(path)).then((hit) => hit || fetch(event.request)));
+        }
+    });
+""").lstrip()
+
 
 def _ensure_pythonrc_in(output: str) -> None:
     """Ensure a pythonrc.py exists in the output directory.
@@ -27,48 +165,431 @@ def _ensure_pythonrc_in(output: str) -> None:
             shutil.copy2(src, dst)
         else:
             with open(dst, "w", encoding="utf-8") as fh:
-                fh.write('# pythonrc placeholder created by package_web\n')
+                fh.write(PYTHONRC_PLACEHOLDER)
     except Exception:
         # non-fatal
         pass
 
 
 def _postprocess_index_html(output: str, enable_ci_ume: bool = False) -> None:
-    """Apply safe runtime defaults to the built index.html.
-
-    - Make canvas background opaque (avoid transparent/black canvas).
-    - Remove CI/debug autorun/UME toggles unless enable_ci_ume is True.
-    - Normalize any stray '#<!--' markers in the site script to avoid syntax flags.
-    """
+    """Apply safe runtime defaults to the built index.html (see _postprocess_text)."""
     try:
         idx = os.path.join(output, 'index.html')
         if not os.path.exists(idx):
             return
         with open(idx, 'r', encoding='utf-8') as fh:
             txt = fh.read()
+        # Write back only if content changed (keeps incremental rebuilds no-op)
+        _write_if_changed(idx, _postprocess_text(txt, enable_ci_ume))
+    except Exception:
+        pass
+
+
+def _postprocess_text(txt: str, enable_ci_ume: bool = False) -> str:
+    """Return index.html text with safe runtime defaults applied.
+
+    - Make canvas background opaque (avoid transparent/black canvas).
+    - Remove CI/debug autorun/UME toggles unless enable_ci_ume is True.
+    - Normalize any stray '#<!--' markers in the site script to avoid syntax flags.
+    - Register the service worker that keeps the build cached offline.
+    """
+    # Ensure canvas CSS background is opaque
+    txt = txt.replace('background-color: transparent;', 'background-color: rgb(135,206,235);')
+
+    # Remove any explicit autorun/ume toggles inserted for debugging unless requested
+    if not enable_ci_ume:
+        txt = txt.replace("platform.window.MM.UME = True", "")
+        txt = txt.replace("PyConfig.config['autorun'] = 1", "")
+        txt = txt.replace('autorun : 1,', 'autorun : 0,')
+        txt = txt.replace("ume_block : 0,", "ume_block : 1,")
+
+    # Normalize stray '#<!--' -> '<!--' inside the site script to avoid stray '#' characters
+    txt = txt.replace('#<!--', '<!--')
+
+    # Register the offline cache worker (written by _write_offline_cache)
+    if SW_MARKER not in txt:
+        if '</body>' in txt:
+            txt = txt.replace('</body>', SW_REGISTER + '</body>', 1)
+        else:
+            txt += SW_REGISTER
+    return txt
+
 
-        # Ensure canvas CSS background is opaque
-        txt = txt.replace('background-color: transparent;', 'background-color: rgb(135,206,235);')
+def _write_if_changed(path: str, text: str) -> bool:
+    """Write text to path unless it already holds exactly that; True if written."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            if fh.read() == text:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    return True
+
+
+# --- offline cache -----------------------------------------------------------
+def _write_offline_cache(output: str, previous: dict | None = None, bundled=()) -> dict:
+    """Write asset-manifest.json and the service worker that precaches it.
+
+    The manifest maps every served file (posix path relative to output)
+    to a short content hash; the version is a hash over all of them, so
+    it only changes when some file does. Files listed in bundled are
+    inside assets.bundle and are not precached on their own. previous
+    is the stat cache returned last time (hashes are reused while
+    size/mtime match); returns the new one.
+    """
+    hasher = _Hasher(previous or {})
+    files = {}
+    for dirpath, dirnames, names in os.walk(output):
+        dirnames.sort()
+        for name in sorted(names):
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, output).replace(os.sep, "/")
+            if rel in OFFLINE_SKIP or name.endswith(OFFLINE_SKIP_SUFFIXES):
+                continue
+            files[rel] = hasher(path)[:12]
+    version = hashlib.sha256(json.dumps(files, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    bundled = sorted(bundled)
+    manifest = json.dumps({"version": version, "files": files, "bundled": bundled},
+                          indent=1, sort_keys=True) + "\n"
+    _write_if_changed(os.path.join(output, ASSET_MANIFEST), manifest)
+    worker = (SERVICE_WORKER_JS.replace("__VERSION__", version)
+              .replace("__PREFIX__", CACHE_PREFIX)
+              .replace("__FILES__", json.dumps(files, indent=1, sort_keys=True))
+              .replace("__BUNDLED__", json.dumps(bundled)))
+    _write_if_changed(os.path.join(output, SERVICE_WORKER), worker)
+    return hasher.current
+
+
+# --- incremental builds ------------------------------------------------------
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
 
-        # Remove any explicit autorun/ume toggles inserted for debugging unless requested
-        if not enable_ci_ume:
-            txt = txt.replace("platform.window.MM.UME = True", "")
-            txt = txt.replace("PyConfig.config['autorun'] = 1", "")
-            txt = txt.replace('autorun : 1,', 'autorun : 0,')
-            txt = txt.replace("ume_block : 0,", "ume_block : 1,")
 
-        # Normalize stray '#<!--' -> '<!--' inside the site script to avoid stray '#' characters
-        txt = txt.replace('#<!--', '<!--')
+def _walk(root: str):
+    """Yield files under root (relative posix paths), skipping build junk."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if not name.endswith(SKIP_SUFFIXES):
+                yield os.path.relpath(os.path.join(dirpath, name), ".").replace(os.sep, "/")
+
+
+def _packaged_sources() -> list:
+    """Project files copied verbatim into the output (same relative path)."""
+    out = [f for f in PACKAGED_FILES if os.path.isfile(f)]
+    for d in PACKAGED_DIRS:
+        if os.path.isdir(d):
+            out.extend(_walk(d))
+    return out
+
+
+def _pygbag_sources() -> list:
+    out = sorted(f for f in os.listdir(".") if f.endswith(".py") and os.path.isfile(f))
+    out.extend(f for f in PYGBAG_CONFIG if os.path.isfile(f))
+    for d in PACKAGED_DIRS:
+        if os.path.isdir(d):
+            out.extend(_walk(d))
+    return out
+
+
+class _Hasher:
+    """Content hashes keyed by path, reusing the last build's while size/mtime match."""
+
+    def __init__(self, previous: dict):
+        self.previous = previous
+        self.current = {}
+        self.hashed = 0
+
+    def __call__(self, path: str) -> str:
+        if path in self.current:
+            return self.current[path]["hash"]
+        st = os.stat(path)
+        prev = self.previous.get(path)
+        if prev and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns:
+            digest = prev["hash"]
+        else:
+            digest = _sha256(path)
+            self.hashed += 1
+        self.current[path] = {"hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        return digest
 
-        # If index contains a script tag with id=site and starts with '<!--', that's OK.
-        # Write back only if content changed
-        with open(idx, 'w', encoding='utf-8') as fh:
-            fh.write(txt)
+
+def _load_manifest(output: str) -> dict:
+    try:
+        with open(os.path.join(output, MANIFEST_NAME), "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") == MANIFEST_VERSION:
+            return data
     except Exception:
         pass
+    return {}
+
+
+def _save_manifest(output: str, manifest: dict) -> None:
+    manifest["version"] = MANIFEST_VERSION
+    path = os.path.join(output, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _remove_stale(output: str, stale, stats: dict) -> None:
+    """Delete outputs that are no longer produced, and any directories left empty."""
+    dirs = set()
+    for rel in stale:
+        path = os.path.join(output, rel)
+        try:
+            os.remove(path)
+            stats["removed"] += 1
+        except OSError:
+            pass
+        dirs.add(os.path.dirname(path))
+    for d in sorted(dirs, key=len, reverse=True):
+        while d and os.path.abspath(d) != os.path.abspath(output):
+            try:
+                os.rmdir(d)
+            except OSError:
+                break
+            d = os.path.dirname(d)
+
+
+def _pygbag_inputs_hash(hasher: _Hasher) -> str:
+    h = hashlib.sha256()
+    for rel in _pygbag_sources():
+        h.update(rel.encode("utf-8") + b"\0" + hasher(rel).encode("ascii") + b"\n")
+    return h.hexdigest()
+
+
+def _outputs_intact(output: str, files: dict) -> bool:
+    for rel, size in files.items():
+        try:
+            if os.path.getsize(os.path.join(output, rel)) != size:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _run_pygbag(output: str, cwd: str | None = None) -> None:
+    """Run pygbag via the module CLI, trying modern and legacy invocations.
+
+    cwd is the directory pygbag packs (the project root by default).
+    """
+    try:
+        import pygbag  # type: ignore  # noqa: F401
+    except Exception:
+        raise RuntimeError("pygbag not installed in the environment")
+
+    if cwd is not None:
+        output = os.path.abspath(output)
+    # Try modern and legacy invocations for wider compatibility
+    cmds = [
+        [sys.executable, "-m", "pygbag", "--build", "--package", output, "main.py"],
+        [sys.executable, "-m", "pygbag", "--output", output, "main.py"],
+    ]
+
+    last_err = None
+    for cmd in cmds:
+        try:
+            subprocess.run(cmd, check=True, cwd=cwd)
+            return
+        except subprocess.CalledProcessError as e:
+            last_err = e
+            continue
+    raise RuntimeError(f"pygbag build failed; last_err={last_err}")
+
+
+def _copy(rel: str, dest: str) -> list:
+    dst = os.path.join(dest, rel)
+    os.makedirs(os.path.dirname(dst) or dest, exist_ok=True)
+    shutil.copy2(rel, dst)
+    return [rel]
+
+
+def _sync(dest: str, sources, old: dict, hasher: _Hasher, stats: dict, transform=None) -> dict:
+    """Bring dest up to date with sources; returns {source: {"hash", "outputs"}}.
+
+    transform(rel, dest) writes the output(s) for one source and returns
+    their paths relative to dest (default: a verbatim copy). A source is
+    redone only when its hash changed or one of its outputs is missing.
+    """
+    done = {}
+    for rel in sources:
+        digest = hasher(rel)
+        prev = old.get(rel) or {}
+        outs = prev.get("outputs", [])
+        if prev.get("hash") == digest and all(os.path.exists(os.path.join(dest, o)) for o in outs):
+            stats["unchanged"] += 1
+        else:
+            outs = (transform or _copy)(rel, dest)
+            stats["copied"] += 1
+        done[rel] = {"hash": digest, "outputs": outs}
+    return done
+
+
+def _output_set(entries: dict) -> set:
+    return {o for entry in entries.values() for o in entry.get("outputs", [])}
+
+
+def _optimizer():
+    """transform() for _sync that shrinks assets (see web_optimize.py)."""
+    import web_optimize
+    encoder = web_optimize.find_encoder()
+    if encoder is None:
+        print("[web_optimize] no ffmpeg/oggenc on PATH; WAVs are resampled, not transcoded")
+
+    def transform(rel, dest):
+        if not rel.startswith("assets/"):
+            return _copy(rel, dest)
+        return web_optimize.optimize_file(rel, dest, rel, encoder=encoder)
+    return transform
+
+
+def _write_bundle(output: str, entries: dict, previous: dict) -> tuple:
+    """Pack output/assets into output/assets.bundle unless no asset changed.
+
+    Returns ({"key", "names"} for the manifest, True if it was rebuilt).
+    """
+    import asset_bundle
+    assets = {rel: entry for rel, entry in entries.items() if rel.startswith("assets/")}
+    key = hashlib.sha256(json.dumps(assets, sort_keys=True).encode("utf-8")).hexdigest()
+    path = os.path.join(output, BUNDLE)
+    if previous.get("key") == key and os.path.exists(path):
+        return previous, False
+    asset_bundle.build("assets", path, base=output)
+    bundle = asset_bundle.AssetBundle(path)
+    names = bundle.names()
+    bundle.close()
+    return {"key": key, "names": names}, True
 
 
-def build(output: str = "dist/pygbag", simulate: bool = False, clean: bool = True, ci_ume: bool = False) -> bool:
+def _size_report(dest: str, entries: dict, hasher: _Hasher):
+    """web_optimize.Report of source vs output bytes for the assets in entries."""
+    import web_optimize
+    report = web_optimize.Report()
+    for rel, entry in sorted(entries.items()):
+        if not rel.startswith("assets/"):
+            continue
+        after = 0
+        for o in entry["outputs"]:
+            try:
+                after += os.path.getsize(os.path.join(dest, o))
+            except OSError:
+                pass
+        outs = entry["outputs"]
+        action = "dropped" if not outs else ("optimized" if outs == [rel] else "-> " + ", ".join(outs))
+        report.add(rel, hasher.current[rel]["size"], after, action)
+    return report
+
+
+def build_incremental(output: str = "dist/pygbag", simulate: bool = False, ci_ume: bool = False,
+                      optimize: bool = False, bundle: bool = False) -> dict:
+    """Bring output up to date, doing only the work whose inputs changed.
+
+    With optimize, assets go through web_optimize. A simulated build
+    optimizes the copies in output. A pygbag build stages the project
+    in build/web-stage, optimizes it there and runs pygbag on the stage.
+    With bundle, a simulated build also packs its assets into
+    assets.bundle (rebuilt only when an asset changed).
+
+    Returns counters: copied, unchanged, generated, removed, hashed,
+    pygbag ('skipped', 'ran' or 'simulated') and seconds, plus the
+    web_optimize report when optimizing.
+    """
+    t0 = time.perf_counter()
+    if bundle and not simulate:
+        print("[package_web] pygbag already packs the assets into one .apk; not building assets.bundle")
+        bundle = False
+    os.makedirs(output, exist_ok=True)
+    old = _load_manifest(output)
+    if bool(old.get("optimize")) != optimize:
+        # every output changes form; start from scratch (stale files are removed below)
+        old = {"generated": sorted(_output_set(old.get("outputs", {}))) + old.get("generated", []),
+               "sources": old.get("sources", {})}
+    hasher = _Hasher(old.get("sources", {}))
+    stats = {"copied": 0, "unchanged": 0, "generated": 0, "removed": 0}
+    transform = _optimizer() if optimize else None
+    manifest = {"optimize": optimize}
+    generated = []
+
+    if simulate:
+        stats["pygbag"] = "simulated"
+        index = _postprocess_text(SIMULATED_INDEX, ci_ume)
+        if _write_if_changed(os.path.join(output, "index.html"), index):
+            stats["generated"] += 1
+        generated.append("index.html")
+        # verbatim copies, plus pythonrc (or its placeholder)
+        sources = _packaged_sources()
+        if os.path.isfile("pythonrc.py"):
+            sources.append("pythonrc.py")
+        else:
+            if _write_if_changed(os.path.join(output, "pythonrc.py"), PYTHONRC_PLACEHOLDER):
+                stats["generated"] += 1
+            generated.append("pythonrc.py")
+        entries = _sync(output, sources, old.get("outputs", {}), hasher, stats, transform)
+        manifest["outputs"] = entries
+        _postprocess_index_html(output, enable_ci_ume=ci_ume)
+        if optimize:
+            stats["report"] = _size_report(output, entries, hasher)
+        if bundle:
+            manifest["bundle"], rebuilt = _write_bundle(output, entries, old.get("bundle") or {})
+            if rebuilt:
+                stats["generated"] += 1
+            generated.append(BUNDLE)
+    else:
+        key = _pygbag_inputs_hash(hasher) + (":ci_ume" if ci_ume else "") + (":optimize" if optimize else "")
+        prev = old.get("pygbag") or {}
+        if prev.get("inputs") == key and _outputs_intact(output, prev.get("outputs", {})):
+            stats["pygbag"] = "skipped"
+            pygbag_outputs = prev["outputs"]
+        else:
+            cwd = None
+            if optimize:
+                cwd = STAGE_DIR
+                stage = _sync(cwd, _pygbag_sources(), old.get("stage", {}), hasher, stats, transform)
+                _remove_stale(cwd, _output_set(old.get("stage", {})) - _output_set(stage), stats)
+                manifest["stage"] = stage
+                stats["report"] = _size_report(cwd, stage, hasher)
+            _run_pygbag(output, cwd=cwd)
+            stats["pygbag"] = "ran"
+            _ensure_pythonrc_in(output)
+            _postprocess_index_html(output, enable_ci_ume=ci_ume)
+            # recorded after post-processing so the sizes match next time
+            pygbag_outputs = {}
+            for dirpath, _dirs, names in os.walk(output):
+                for name in names:
+                    path = os.path.join(dirpath, name)
+                    rel = os.path.relpath(path, output).replace(os.sep, "/")
+                    if rel not in OFFLINE_SKIP:
+                        pygbag_outputs[rel] = os.path.getsize(path)
+        if "stage" not in manifest and "stage" in old:
+            manifest["stage"] = old["stage"]
+        manifest["pygbag"] = {"inputs": key, "outputs": pygbag_outputs}
+        generated.extend(pygbag_outputs)
+
+    bundled = manifest.get("bundle", {}).get("names", ())
+    manifest["offline"] = _write_offline_cache(output, old.get("offline"), bundled)
+    generated.extend((ASSET_MANIFEST, SERVICE_WORKER))
+    produced = _output_set(manifest.get("outputs", {})) | set(generated)
+    previous = _output_set(old.get("outputs", {})) | set(old.get("generated", []))
+    _remove_stale(output, sorted(previous - produced), stats)
+    stats["hashed"] = hasher.hashed
+    manifest["generated"] = generated
+    manifest["sources"] = hasher.current
+    _save_manifest(output, manifest)
+    stats["seconds"] = round(time.perf_counter() - t0, 4)
+    return stats
+
+
+def build(output: str = "dist/pygbag", simulate: bool = False, clean: bool = True, ci_ume: bool = False,
+          incremental: bool = False, optimize: bool = False, bundle: bool = False) -> bool:
     """Build a web package for the game.
 
     - If simulate is True, create a minimal static package suitable for
@@ -76,32 +597,35 @@ def build(output: str = "dist/pygbag", simulate: bool = False, clean: bool = Tru
     - If simulate is False, try to use pygbag (via `python -m pygbag`) to
       produce a real web build. Returns True on success, False or raises
       on unexpected failures.
+    - If incremental is True, keep the output and only redo changed work
+      (see build_incremental); clean is ignored.
+    - If optimize is True, shrink the assets (see web_optimize.py) and
+      print the bytes saved.
+    - If bundle is True, pack a simulated build's assets into
+      assets.bundle (see build_incremental).
     """
-    if clean and os.path.exists(output):
+    if clean and not incremental and os.path.exists(output):
         try:
             shutil.rmtree(output)
         except Exception:
             pass
 
+    if incremental or optimize or bundle:
+        # a clean optimized build is an incremental build into an empty output
+        stats = build_incremental(output, simulate=simulate, ci_ume=ci_ume, optimize=optimize, bundle=bundle)
+        print(f"[package_web] {stats['copied']} copied, {stats['unchanged']} unchanged, "
+              f"{stats['removed']} removed, pygbag {stats['pygbag']} ({stats['seconds']:.2f}s)")
+        if stats.get("report") is not None:
+            print("\n".join(stats["report"].format()))
+        return True
+
     os.makedirs(output, exist_ok=True)
 
     if simulate:
         index_path = os.path.join(output, "index.html")
         try:
             with open(index_path, "w", encoding="utf-8") as fh:
-                fh.write(textwrap.dedent("""
-                    <!doctype html>
-                    <html>
-                      <head>
-                        <meta charset="utf-8" />
-                        <title>Mango Web Build (simulated)</title>
-                      </head>
-                      <body>
-                        <h1>Mango Web Build (simulated)</h1>
-                        <p>This is a simulated package produced for tests.</p>
-                      </body>
-                    </html>
-                """))
+                fh.write(SIMULATED_INDEX)
         except Exception:
             return False
 
@@ -122,38 +646,17 @@ def build(output: str = "dist/pygbag", simulate: bool = False, clean: bool = Tru
         _ensure_pythonrc_in(output)
         # Postprocess simulated index.html to apply safe defaults
         _postprocess_index_html(output, enable_ci_ume=ci_ume)
+        _write_offline_cache(output)
         return True
 
     # Non-simulated: attempt to run pygbag via the module CLI
-    try:
-        import pygbag  # type: ignore
-    except Exception:
-        raise RuntimeError("pygbag not installed in the environment")
-
-    # Try modern and legacy invocations for wider compatibility
-    cmds = [
-        [sys.executable, "-m", "pygbag", "--build", "--package", output, "main.py"],
-        [sys.executable, "-m", "pygbag", "--output", output, "main.py"],
-    ]
-
-    last_err = None
-    ok = False
-    for cmd in cmds:
-        try:
-            subprocess.run(cmd, check=True)
-            ok = True
-            break
-        except subprocess.CalledProcessError as e:
-            last_err = e
-            continue
-
-    if not ok:
-        raise RuntimeError(f"pygbag build failed; last_err={last_err}")
+    _run_pygbag(output)
 
     # Guarantee pythonrc is present in the real output
     _ensure_pythonrc_in(output)
     # Postprocess index.html to apply safe defaults
     _postprocess_index_html(output, enable_ci_ume=ci_ume)
+    _write_offline_cache(output)
     return True
 
 
@@ -164,9 +667,13 @@ if __name__ == "__main__":
     parser.add_argument("--output", "-o", default="dist/pygbag")
     parser.add_argument("--simulate", action="store_true", help="Create a simulated static package for tests")
     parser.add_argument("--no-clean", dest="clean", action="store_false", help="Don't remove existing output")
+    parser.add_argument("--incremental", action="store_true", help="Only rebuild what changed since the last build")
+    parser.add_argument("--optimize", action="store_true", help="Transcode/resample sounds and shrink images")
+    parser.add_argument("--bundle", action="store_true", help="Pack a --simulate build's assets into assets.bundle")
     parser.add_argument("--ci-ume", dest="ci_ume", action="store_true", help="Enable UME/autorun toggles for CI builds only")
     args = parser.parse_args()
-    ok = build(output=args.output, simulate=args.simulate, clean=args.clean, ci_ume=args.ci_ume)
+    ok = build(output=args.output, simulate=args.simulate, clean=args.clean, ci_ume=args.ci_ume,
+               incremental=args.incremental, optimize=args.optimize, bundle=args.bundle)
     if not ok:
         print("Build failed")
         sys.exit(2)
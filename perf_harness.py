@@ -0,0 +1,360 @@
+"""Browser performance harness for the web build (Playwright + Chromium).
+
+Loads the build once per scene and measures, on the page's clock:
+
+- ttff_ms: time to first frame, i.e. the first non-blank canvas;
+- tti_ms: time to interactive, i.e. the game's ``mango:ready`` mark
+  (startup_timing publishes its marks as User Timing marks);
+- enter_ms: time from the click on the hub button to the scene's
+  ``mango:scene:<name>`` mark;
+- fps: sustained frame rate over --seconds, counted as canvas changes
+  seen from requestAnimationFrame, with raf_fps, frame-time percentiles
+  and long frames next to it;
+- memory: JS heap (Chromium's performance.memory) and WASM heap size.
+
+Results are written as JSON. --compare prints the change against an
+earlier run:
+
+    python package_web.py --output build/web --simulate   # or a real pygbag build
+    python perf_harness.py --serve build/web --out perf_baseline.json
+    python perf_harness.py --url http://127.0.0.1:8000/ --compare perf_baseline.json
+    python perf_harness.py --serve build/web --scenes hub,flappy --artifacts build/perf
+
+--artifacts saves a screenshot and the console log per scene. Needs
+``pip install playwright && python -m playwright install chromium``.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+SCENES = ('hub', 'flappy', 'feed', 'tickle')
+# Key tapped while sampling so the scene keeps playing instead of ending
+SCENE_KEYS = {'flappy': 'Space'}
+KEY_INTERVAL = 0.4
+LONG_FRAME_MS = 50.0
+VIEWPORT = {'width': 1280, 'height': 720}
+
+# Installed before any page script runs. Every animation frame it shrinks
+# the game canvas to 16x12 pixels and compares the result with the last
+# frame, so the game's own frame rate can be told apart from the
+# browser's. WebGL canvases are created with preserveDrawingBuffer so
+# they can still be read after the game's frame.
+INIT_JS = r"""
+(() => {
+    const perf = window.__mangoPerf = {raf: [], changes: [], firstFrame: null, sampling: false, errors: []};
+    const getContext = HTMLCanvasElement.prototype.getContext;
+    HTMLCanvasElement.prototype.getContext = function (type, attrs) {
+        if (/webgl/.test(type)) attrs = Object.assign({}, attrs, {preserveDrawingBuffer: true});
+        return getContext.call(this, type, attrs);
+    };
+    const probe = document.createElement('canvas');
+    probe.width = 16;
+    probe.height = 12;
+    let probeCtx = null, last = null;
+    perf.canvas = () => document.getElementById('canvas') || document.querySelector('canvas');
+    function signature(canvas) {
+        probeCtx = probeCtx || probe.getContext('2d', {willReadFrequently: true});
+        probeCtx.clearRect(0, 0, 16, 12);
+        probeCtx.drawImage(canvas, 0, 0, 16, 12);
+        const data = probeCtx.getImageData(0, 0, 16, 12).data;
+        let hash = 0, uniform = true;
+        for (let i = 0; i < data.length; i++) {
+            hash = (hash * 31 + data[i]) | 0;
+            if (uniform && data[i] !== data[i & 3]) uniform = false;
+        }
+        return {hash, uniform};
+    }
+    function tick(t) {
+        const canvas = perf.canvas();
+        if (canvas && canvas.width > 0 && (perf.sampling || perf.firstFrame === null)) {
+            try {
+                const sig = signature(canvas);
+                if (perf.firstFrame === null && !sig.uniform) perf.firstFrame = t;
+                if (perf.sampling) {
+                    perf.raf.push(t);
+                    if (last !== null && sig.hash !== last) perf.changes.push(t);
+                }
+                last = sig.hash;
+            } catch (e) {
+                if (perf.errors.length < 5) perf.errors.push(String(e));
+            }
+        }
+        requestAnimationFrame(tick);
+    }
+    requestAnimationFrame(tick);
+    perf.start = () => { perf.raf = []; perf.changes = []; last = null; perf.sampling = true; };
+    perf.stop = () => { perf.sampling = false; return {raf: perf.raf, changes: perf.changes}; };
+    perf.marks = () => Object.fromEntries(performance.getEntriesByType('mark')
+        .filter((m) => m.name.startsWith('mango:')).map((m) => [m.name.slice(6), m.startTime]));
+    perf.memory = () => ({
+        js_heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+        wasm_heap: (window.Module && window.Module.HEAP8) ? window.Module.HEAP8.length : null,
+    });
+})();
+"""
+
+
+# --- numbers -----------------------------------------------------------------
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list (None if empty)."""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def _rate(stamps):
+    if len(stamps) < 2 or stamps[-1] <= stamps[0]:
+        return 0.0
+    return round((len(stamps) - 1) * 1000.0 / (stamps[-1] - stamps[0]), 1)
+
+
+def frame_stats(raf, changes):
+    """Summarise rAF and canvas-change timestamps (ms) from one sampling window."""
+    intervals = sorted(b - a for a, b in zip(changes, changes[1:]))
+    p50, p95 = percentile(intervals, 50), percentile(intervals, 95)
+    return {
+        'fps': _rate(changes),
+        'raf_fps': _rate(raf),
+        'frames': len(changes),
+        'frame_ms_p50': None if p50 is None else round(p50, 1),
+        'frame_ms_p95': None if p95 is None else round(p95, 1),
+        'long_frames': sum(1 for i in intervals if i > LONG_FRAME_MS),
+    }
+
+
+def hub_target(scene, width):
+    """Centre of the hub button that opens scene, in canvas pixels (None for the hub).
+
+    Mirrors the layout in hub_ui.draw_home_screen: a 280 px cage centred
+    120 px down, 140x48 buttons stacked beside it, Flappy top right.
+    """
+    cage_x = max(20, (width - 280) // 2)
+    if scene == 'flappy':
+        return width - 200 + 75, 20 + 30
+    if scene == 'feed':
+        return max(8, cage_x - 20 - 140 - 10) + 70, 170 + 24
+    if scene == 'tickle':
+        return min(width - 140 - 8, cage_x + 280 + 20 + 10) + 70, 170 + 2 * 66 + 24
+    return None
+
+
+def _mb(n):
+    return None if n is None else round(n / 1e6, 1)
+
+
+# --- browser -----------------------------------------------------------------
+def _click_canvas(page, x=None, y=None):
+    """Click canvas pixel (x, y), or the canvas centre."""
+    box = page.evaluate("""() => {
+        const c = window.__mangoPerf.canvas();
+        const r = c.getBoundingClientRect();
+        return [r.x, r.y, r.width, r.height, c.width, c.height];
+    }""")
+    left, top, css_w, css_h, width, height = box
+    if not width or not height:
+        return
+    if x is None:
+        x, y = width / 2, height / 2
+    page.mouse.click(left + x * css_w / width, top + y * css_h / height)
+
+
+def _wait_for_mark(page, name, timeout, poke=None):
+    """Return the mark's time once it exists, calling poke() every second meanwhile."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        marks = page.evaluate('() => window.__mangoPerf.marks()')
+        if name in marks:
+            return marks[name]
+        if poke is not None:
+            try:
+                poke()
+            except Exception:
+                pass
+        page.wait_for_timeout(1000)
+    return None
+
+
+def measure_scene(context, url, scene, seconds=10.0, timeout=90.0, artifacts=None):
+    """Load url in a new page, open scene from the hub and sample it."""
+    page = context.new_page()
+    console = []
+    page.on('console', lambda msg: console.append({'type': msg.type, 'text': msg.text}))
+    page.on('pageerror', lambda err: console.append({'type': 'pageerror', 'text': str(err)}))
+    result = {'scene': scene}
+    try:
+        page.goto(url, wait_until='load', timeout=timeout * 1000)
+        page.wait_for_selector('canvas', timeout=timeout * 1000)
+        # the browser's start gesture (pygbag's overlay, then the game's
+        # click-to-start splash); clicking the cage centre is harmless
+        tti = _wait_for_mark(page, 'ready', timeout, poke=lambda: _click_canvas(page))
+        result['ttff_ms'] = page.evaluate('() => window.__mangoPerf.firstFrame')
+        result['tti_ms'] = tti
+        marks = page.evaluate('() => window.__mangoPerf.marks()')
+        result['first_frame_mark_ms'] = marks.get('first_frame')
+
+        width = page.evaluate('() => window.__mangoPerf.canvas().width')
+        target = hub_target(scene, width)
+        if target is not None:
+            clicked = page.evaluate('() => performance.now()')
+            _click_canvas(page, *target)
+            entered = _wait_for_mark(page, 'scene:' + scene, 10.0)
+            result['enter_ms'] = None if entered is None else round(entered - clicked, 1)
+        page.wait_for_timeout(1000)
+
+        page.evaluate('() => window.__mangoPerf.start()')
+        key = SCENE_KEYS.get(scene)
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            if key:
+                page.keyboard.press(key)
+            page.wait_for_timeout(KEY_INTERVAL * 1000 if key else 250)
+        samples = page.evaluate('() => window.__mangoPerf.stop()')
+        result.update(frame_stats(samples['raf'], samples['changes']))
+
+        memory = page.evaluate('() => window.__mangoPerf.memory()')
+        result['js_heap_mb'] = _mb(memory.get('js_heap'))
+        result['wasm_heap_mb'] = _mb(memory.get('wasm_heap'))
+        errors = page.evaluate('() => window.__mangoPerf.errors')
+        if errors:
+            result['probe_errors'] = errors
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        result['console_errors'] = sum(1 for c in console if c['type'] in ('error', 'pageerror'))
+        if artifacts:
+            os.makedirs(artifacts, exist_ok=True)
+            try:
+                page.screenshot(path=os.path.join(artifacts, f'{scene}.png'))
+            except Exception:
+                pass
+            with open(os.path.join(artifacts, f'{scene}_console.json'), 'w', encoding='utf-8') as f:
+                json.dump(console, f, indent=2)
+        page.close()
+    for key in ('ttff_ms', 'tti_ms', 'first_frame_mark_ms'):
+        if result.get(key) is not None:
+            result[key] = round(result[key], 1)
+    return result
+
+
+def run(url, scenes=SCENES, seconds=10.0, timeout=90.0, headed=False, warm=False, artifacts=None):
+    """Measure each scene; returns the JSON-ready report.
+
+    Every scene gets a fresh browser context (cold caches) unless warm is
+    set, in which case one context is shared and only the first load is cold.
+    """
+    from playwright.sync_api import sync_playwright
+
+    report = {
+        'url': url,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': {'seconds': seconds, 'warm': warm, 'viewport': VIEWPORT},
+        'scenes': {},
+    }
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not headed)
+        report['browser'] = f'chromium {browser.version}'
+        shared = None
+        try:
+            for scene in scenes:
+                context = shared
+                if context is None:
+                    context = browser.new_context(viewport=VIEWPORT)
+                    context.add_init_script(INIT_JS)
+                    if warm:
+                        shared = context
+                print(f'[perf] {scene} ...')
+                report['scenes'][scene] = measure_scene(context, url, scene, seconds, timeout, artifacts)
+                if not warm:
+                    context.close()
+        finally:
+            browser.close()
+    return report
+
+
+# --- reporting ---------------------------------------------------------------
+# (metric, unit, higher is better)
+METRICS = (
+    ('ttff_ms', 'ms', False),
+    ('tti_ms', 'ms', False),
+    ('enter_ms', 'ms', False),
+    ('fps', 'fps', True),
+    ('frame_ms_p95', 'ms', False),
+    ('long_frames', '', False),
+    ('js_heap_mb', 'MB', False),
+    ('wasm_heap_mb', 'MB', False),
+)
+
+
+def format_report(report, baseline=None):
+    lines = []
+    base = (baseline or {}).get('scenes', {})
+    for scene, result in report['scenes'].items():
+        if 'error' in result:
+            lines.append(f'{scene:>8}: failed: {result["error"]}')
+        parts = []
+        for name, unit, higher_better in METRICS:
+            value = result.get(name)
+            if value is None:
+                continue
+            text = f'{name} {value}{unit}'
+            old = base.get(scene, {}).get(name)
+            if old is not None and old != value:
+                better = (value > old) == higher_better
+                text += f' ({value - old:+.1f}, {"better" if better else "worse"})'
+            parts.append(text)
+        lines.append(f'{scene:>8}: ' + ', '.join(parts))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='page to measure (default: the --serve server)')
+    parser.add_argument('--serve', metavar='DIR', help='serve DIR with serve_with_headers for the run')
+    parser.add_argument('--scenes', default=','.join(SCENES), help='comma-separated, from ' + ', '.join(SCENES))
+    parser.add_argument('--seconds', type=float, default=10.0, help='FPS sampling window per scene')
+    parser.add_argument('--timeout', type=float, default=90.0, help='seconds to wait for the game to be ready')
+    parser.add_argument('--headed', action='store_true', help='show the browser')
+    parser.add_argument('--warm', action='store_true', help='share one browser context (warm HTTP/SW caches)')
+    parser.add_argument('--artifacts', help='directory for screenshots and console logs')
+    parser.add_argument('--out', help='write the JSON report here')
+    parser.add_argument('--compare', help='JSON report from an earlier run')
+    args = parser.parse_args(argv)
+
+    scenes = [s.strip() for s in args.scenes.split(',') if s.strip()]
+    unknown = [s for s in scenes if s not in SCENES]
+    if unknown:
+        parser.error(f'unknown scenes: {", ".join(unknown)}')
+    server = None
+    url = args.url
+    if args.serve:
+        import serve_with_headers
+        server, base = serve_with_headers.start(os.path.abspath(args.serve))
+        url = url or base + '/'
+    if not url:
+        parser.error('give --url or --serve')
+    try:
+        report = run(url, scenes, args.seconds, args.timeout, args.headed, args.warm, args.artifacts)
+    except ImportError:
+        print('playwright is not installed: pip install playwright && python -m playwright install chromium')
+        return 2
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    for line in format_report(report, baseline):
+        print(line)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
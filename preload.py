@@ -0,0 +1,208 @@
+"""Staged startup: a splash with a progress bar while assets load.
+
+`Preloader` runs a list of named loading tasks. On desktop it runs them on
+a daemon worker thread; under pygbag (no threads) the `LoadingScene` pumps
+them cooperatively a few milliseconds per frame so the browser stays
+responsive. Tasks are either required (needed for the hub's first frame)
+or nice-to-have; nice-to-have tasks keep loading after the hub is shown
+and can be forced early with `ensure()`.
+"""
+import sys
+import time
+import threading
+
+from mango_log import get_logger
+
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+from scenes import Scene
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+# Time slice spent on cooperative loading per frame (ms)
+PUMP_BUDGET_MS = 12
+
+
+class _Task:
+    __slots__ = ('name', 'fn', 'required', 'claimed', 'done', 'error', 'seconds')
+
+    def __init__(self, name, fn, required):
+        self.name = name
+        self.fn = fn
+        self.required = required
+        self.claimed = False
+        self.done = threading.Event()
+        self.error = None
+        self.seconds = 0.0
+
+
+class Preloader:
+    """Run loading tasks on a worker thread or cooperatively."""
+
+    def __init__(self, tasks=(), threaded=None, timer=None):
+        self.threaded = (not IS_WASM) if threaded is None else bool(threaded)
+        # optional startup_timing.PhaseTimer; each task is recorded as a phase
+        self.timer = timer
+        self._tasks = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self.current = None
+        for task in tasks:
+            self.add(*task)
+
+    def add(self, name, fn, required=True):
+        self._tasks.append(_Task(name, fn, required))
+
+    # --- status --------------------------------------------------------------
+    @property
+    def required(self):
+        return [t for t in self._tasks if t.required]
+
+    @property
+    def progress(self):
+        """Fraction (0..1) of required tasks finished."""
+        req = self.required
+        if not req:
+            return 1.0
+        return sum(1 for t in req if t.done.is_set()) / float(len(req))
+
+    @property
+    def ready(self):
+        return all(t.done.is_set() for t in self.required)
+
+    @property
+    def finished(self):
+        return all(t.done.is_set() for t in self._tasks)
+
+    def timings(self):
+        """Return {task name: seconds} for finished tasks."""
+        return {t.name: t.seconds for t in self._tasks if t.done.is_set()}
+
+    # --- running -------------------------------------------------------------
+    def _claim_next(self):
+        # required tasks first, then nice-to-have ones, each in insertion order
+        with self._lock:
+            for want_required in (True, False):
+                for task in self._tasks:
+                    if task.required == want_required and not task.claimed:
+                        task.claimed = True
+                        return task
+        return None
+
+    def _run(self, task):
+        self.current = task.name
+        start = time.perf_counter()
+        try:
+            task.fn()
+        except Exception as e:
+            task.error = e
+            get_logger('assets').error('%s failed: %s', task.name, e)
+        task.seconds = time.perf_counter() - start
+        if self.timer is not None:
+            self.timer.record(task.name, task.seconds)
+        task.done.set()
+
+    def _worker(self):
+        while True:
+            task = self._claim_next()
+            if task is None:
+                break
+            self._run(task)
+        self.current = None
+
+    def start(self):
+        """Begin loading; a no-op in cooperative mode (see pump())."""
+        if not self.threaded or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._worker, name='mango-preload', daemon=True)
+        self._thread.start()
+
+    def pump(self, budget_ms=PUMP_BUDGET_MS):
+        """Run queued tasks on this thread for about budget_ms.
+
+        At least one task runs per call so loading always makes progress.
+        Returns True once every task has finished.
+        """
+        if self.threaded and self._thread is not None:
+            return self.finished
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while True:
+            task = self._claim_next()
+            if task is None:
+                break
+            self._run(task)
+            if time.perf_counter() >= deadline:
+                break
+        return self.finished
+
+    def run_all(self):
+        """Run every remaining task synchronously."""
+        if self._thread is not None:
+            self._thread.join()
+            return
+        self.pump(budget_ms=float('inf'))
+
+    def ensure(self, *names, timeout=10.0):
+        """Make sure the named tasks have finished, running them here if unclaimed."""
+        for task in self._tasks:
+            if task.name not in names or task.done.is_set():
+                continue
+            with self._lock:
+                mine = not task.claimed
+                task.claimed = True
+            if mine:
+                self._run(task)
+            else:
+                task.done.wait(timeout)
+
+
+class LoadingScene(Scene):
+    """Splash with a progress bar; swaps itself for the next scene when ready."""
+
+    name = 'loading'
+
+    def __init__(self, game, preloader, next_scene):
+        super().__init__(game)
+        self.preloader = preloader
+        # callable returning the scene to show once required assets are in
+        self.next_scene = next_scene
+        self.started_at = time.time()
+
+    def enter(self, **kwargs):
+        self.preloader.start()
+
+    def update(self, dt):
+        if not self.preloader.threaded:
+            self.preloader.pump()
+        if self.preloader.ready and self.manager is not None:
+            self.manager.replace(self.next_scene())
+            try:
+                self.game.startup.finish()
+            except Exception:
+                pass
+
+    def draw(self, surface):
+        game = self.game
+        try:
+            w, h = surface.get_size()
+            surface.fill((24, 24, 24))
+            font = getattr(game, 'title_font', None)
+            small = getattr(game, 'small_font', None)
+            if font:
+                t = font.render('Mango: The Virtual Lovebird', True, (255, 255, 255))
+                surface.blit(t, t.get_rect(center=(w // 2, h // 2 - 60)))
+            bar_w, bar_h = min(420, w - 80), 18
+            bx, by = (w - bar_w) // 2, h // 2
+            pygame.draw.rect(surface, (70, 70, 70), (bx, by, bar_w, bar_h), border_radius=9)
+            fill = int(bar_w * self.preloader.progress)
+            if fill > 0:
+                pygame.draw.rect(surface, (255, 152, 0), (bx, by, fill, bar_h), border_radius=9)
+            if small:
+                label = self.preloader.current or 'starting'
+                txt = small.render(f'Loading {label}...', True, (200, 200, 200))
+                surface.blit(txt, txt.get_rect(center=(w // 2, by + 44)))
+        except Exception:
+            pass
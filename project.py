@@ -12,6 +12,12 @@ from datetime import datetime, timedelta
 import sys
 import os
 import math
+
+from mango_log import get_logger, DEBUG
+
+log = get_logger('game')
+wasm_log = get_logger('wasm')
+assets_log = get_logger('assets')
 import struct
 
 # Try to import pygame-ce (installed via PEP 723 in main.py)
@@ -20,109 +26,59 @@ pygame = None
 try:
     import pygame as _pygame
     pygame = _pygame
-    print('[project.py] pygame imported successfully')
 except Exception as e:
-    print(f'[project.py] pygame import failed: {e}')
-    # Don't retry here - if pygame isn't available yet, 
+    log.error('pygame import failed: %s', e)
+    # Don't retry here - if pygame isn't available yet,
     # MangoTamagotchi.__init__ will handle it
     pass
 
-# Import other optional dependencies
-try:
-    import sqlite3
-    SQLITE_AVAILABLE = True
-except Exception:
-    sqlite3 = None
-    SQLITE_AVAILABLE = False
-
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except Exception:
-    requests = None
-    REQUESTS_AVAILABLE = False
-
-try:
-    from PIL import Image, ImageDraw
-    PIL_AVAILABLE = True
-except Exception:
-    Image = None
-    ImageDraw = None
-    PIL_AVAILABLE = False
-
-# Initialize Pygame ONLY if pygame is available
-# Skip mixer initialization at module level for WASM compatibility
-if pygame is not None:
-    try:
-        # In WASM/pygbag, avoid initializing mixer at module level
-        # It will be initialized on first user interaction
-        import sys
-        is_wasm = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
-        
-        if not is_wasm:
-            # Desktop only: pre-init mixer and init pygame
-            try:
-                pygame.mixer.pre_init(44100, -16, 2, 512)
-            except Exception as e:
-                print(f'[project.py] mixer pre_init failed: {e}')
-            
-            try:
-                pygame.init()
-                print('[project.py] pygame.init() succeeded (desktop)')
-            except Exception as e:
-                print(f'[project.py] pygame.init() failed: {e}')
-        else:
-            # WASM: Don't call pygame.init() at module level
-            # It will be called in __init__ after user interaction
-            print('[project.py] WASM detected - deferring pygame.init()')
-    except Exception as e:
-        print(f'[project.py] pygame.init() failed: {e}')
-        pass
-else:
-    print('[project.py] pygame is None, skipping initialization')
-
-# Constants
-SCREEN_WIDTH = 1000
-SCREEN_HEIGHT = 700
-FPS = 60
+# sqlite3 and PIL are only needed by the inline fallbacks below and are
+# imported there on first use; db.py, assets.py and resources.py own the
+# normal code paths. pygame.init() runs in MangoTamagotchi.__init__ so that
+# importing this module stays cheap.
+
+# Constants, colours and GameState live in constants.py so mini-games can
+# use them without importing this module; re-exported here for callers
+# that still read them from project.
+import constants
+from mixer_bus import MixerBuses, SettingsStore, bus_property
+from constants import (  # noqa: F401
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS,
+    WHITE, BLACK, DARK_GRAY, LIGHT_GRAY, GREEN, RED, BLUE, YELLOW, ORANGE,
+    PINK, PURPLE, TEAL, LIGHT_BLUE, DARK_BLUE, GOLD, SILVER, BRONZE,
+    LIGHT_ORANGE, GRADIENT_START, GRADIENT_END, NIGHT_START, NIGHT_END,
+    GameState,
+)
 
 # If running under pygbag / web, prefer the actual display surface size to
 # avoid letterboxing. This must be done after pygame is importable; we'll
 # attempt to update SCREEN_WIDTH/HEIGHT inside MangoTamagotchi.__init__ once
 # pygame becomes available.
 
-# Modern Color Palette
-WHITE = (255, 255, 255)
-BLACK = (20, 20, 20)
-DARK_GRAY = (40, 40, 40)
-LIGHT_GRAY = (220, 220, 220)
-GREEN = (76, 175, 80)
-RED = (244, 67, 54)
-BLUE = (33, 150, 243)
-YELLOW = (255, 193, 7)
-ORANGE = (255, 152, 0)
-PINK = (233, 30, 99)
-PURPLE = (156, 39, 176)
-TEAL = (0, 150, 136)
-LIGHT_BLUE = (173, 216, 230)
-DARK_BLUE = (25, 25, 112)
-GOLD = (255, 215, 0)
-SILVER = (192, 192, 192)
-BRONZE = (205, 127, 50)
-LIGHT_ORANGE = (255, 223, 190)
-
-# Gradient Colors
-GRADIENT_START = (135, 206, 235)  # Sky blue
-GRADIENT_END = (70, 130, 180)     # Steel blue
-NIGHT_START = (25, 25, 112)       # Midnight blue
-NIGHT_END = (72, 61, 139)         # Dark slate blue
-
-# Game states
-class GameState:
-    MAIN_MENU = "main_menu"
-    TAMAGOTCHI_HUB = "tamagotchi_hub"
-    FLAPPY_MANGO = "flappy_mango"
-    GAME_OVER = "game_over"
+
+def _init_pygame():
+    """Initialize pygame on desktop (mixer pre-init first).
+
+    Skipped in WASM/pygbag, where the mixer must wait for a user gesture and
+    MangoTamagotchi.__init__ initializes only the safe subsystems.
+    """
+    if pygame is None:
+        return
+    try:
+        is_wasm = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+        if is_wasm:
+            return
+        try:
+            import audio_latency
+            audio_latency.pre_init()
+        except Exception as e:
+            get_logger('audio').warning('mixer pre_init failed: %s', e)
+        try:
+            pygame.init()
+        except Exception as e:
+            log.error('pygame.init() failed: %s', e)
+    except Exception as e:
+        log.error('pygame.init() failed: %s', e)
 
 try:
     from api import APIHandler
@@ -144,6 +100,11 @@ except Exception:
             return 0
 
 class MangoTamagotchi:
+    # slider values live on self.buses (see mixer_bus.py)
+    master_volume = bus_property('master')
+    music_volume = bus_property('music')
+    sfx_volume = bus_property('sfx')
+
     def _safe_set_mode(self, width, height, flags=None):
         """Safe display initialization that works on desktop and in WASM.
 
@@ -164,14 +125,13 @@ class MangoTamagotchi:
         # On web runtimes, use simple set_mode without flags
         if is_web:
             try:
-                print(f'[WASM] Attempting set_mode({w}, {h}, 0)')
-                surf = pygame.display.set_mode((w, h), 0)
-                print(f'[WASM] set_mode succeeded')
-                return surf
+                wasm_log.debug('set_mode(%d, %d, 0)', w, h)
+                return pygame.display.set_mode((w, h), 0)
             except Exception as e:
-                print(f'[WASM] Failed to set display mode: {e}')
-                import traceback
-                traceback.print_exc()
+                wasm_log.error('failed to set display mode: %s', e)
+                if wasm_log.enabled_for(DEBUG):
+                    import traceback
+                    traceback.print_exc()
                 return None
         # Desktop / non-web: allow SCALED when available
         try:
@@ -193,8 +153,18 @@ class MangoTamagotchi:
             except Exception:
                 return None
 
-    def __init__(self):
+    def __init__(self, preload=False):
+        """Create the game window and state.
+
+        With preload=True (used by main()) asset loading is deferred to a
+        Preloader and the first frame is a loading splash; otherwise all
+        assets are loaded before returning, as tests and embedders expect.
+        """
         global pygame, SCREEN_WIDTH, SCREEN_HEIGHT
+        # Startup phases are timed into self.startup (see startup_timing.py)
+        from startup_timing import PhaseTimer
+        self.startup = PhaseTimer()
+        _init_pygame()
         # Ensure pygame is imported and initialized here (after preloader may have
         # installed local wheels). This avoids ModuleNotFoundError at module import.
         if pygame is None:
@@ -202,31 +172,27 @@ class MangoTamagotchi:
                 import pygame as _pygame
                 pygame = _pygame
                 # Initialize pygame subsystems carefully for WASM
-                print('[WASM] Starting pygame initialization...')
+                wasm_log.debug('late pygame initialization')
                 try:
                     # Initialize only safe subsystems in WASM
-                    print('[WASM] Initializing display subsystem...')
                     try:
                         pygame.display.init()
-                        print('[WASM] display.init() OK')
                     except Exception as e:
-                        print(f'[WASM] display.init() failed: {e}')
-                    
-                    print('[WASM] Initializing font subsystem...')
+                        wasm_log.error('display.init() failed: %s', e)
                     try:
                         pygame.font.init()
-                        print('[WASM] font.init() OK')
                     except Exception as e:
-                        print(f'[WASM] font.init() failed: {e}')
-                    
+                        wasm_log.error('font.init() failed: %s', e)
                     # Skip mixer.init() - will be done on user interaction
-                    print('[WASM] Skipping mixer.init() until user interaction')
                 except Exception as e:
-                    print(f'[WASM] pygame subsystem init failed: {e}')
-                    import traceback
-                    traceback.print_exc()
+                    wasm_log.error('pygame subsystem init failed: %s', e)
+                    if wasm_log.enabled_for(DEBUG):
+                        import traceback
+                        traceback.print_exc()
             except Exception as e:
-                print(f'PYGBAG: pygame still not available at Mango init: {e}')
+                wasm_log.error('pygame still not available at Mango init: %s', e)
+
+        self.startup.lap('pygame_init')
 
         # Create the real display surface and a fixed-size logical surface.
         # Use the safe initializer for the primary display surface.
@@ -244,9 +210,9 @@ class MangoTamagotchi:
         
         # Set window caption with error handling
         try:
-            pygame.display.set_caption("Mango: The Virtual Lovebird v2.0")
+            pygame.display.set_caption(f"Mango: The Virtual Lovebird v{constants.VERSION}")
         except Exception as e:
-            print(f'[pygame] set_caption failed: {e}')
+            log.warning('set_caption failed: %s', e)
         
         # For pygbag/web, use the display surface directly as the screen
         # For desktop, keep the separate logical surface for better scaling
@@ -258,8 +224,8 @@ class MangoTamagotchi:
                 try:
                     info = pygame.display.Info()
                     if info.current_w and info.current_h:
-                        SCREEN_WIDTH = info.current_w
-                        SCREEN_HEIGHT = info.current_h
+                        SCREEN_WIDTH = constants.SCREEN_WIDTH = info.current_w
+                        SCREEN_HEIGHT = constants.SCREEN_HEIGHT = info.current_h
                 except Exception:
                     pass
 
@@ -281,6 +247,8 @@ class MangoTamagotchi:
         self.fullscreen = False
         self._windowed_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
         
+        self.startup.lap('set_mode')
+
         # Modern fonts
         try:
             self.title_font = pygame.font.Font(None, 48)
@@ -295,11 +263,18 @@ class MangoTamagotchi:
             self.small_font = pygame.font.SysFont('Arial', 20)
             self.tiny_font = pygame.font.SysFont('Arial', 16)
         
+        self.startup.lap('fonts')
+
         self.state = GameState.TAMAGOTCHI_HUB
         self.db_path = "db/mango.db"
         
         # Initialize API handler
-        self.api_handler = APIHandler()
+        try:
+            from http_cache import ResponseCache
+            # provider responses survive restarts (see http_cache.py)
+            self.api_handler = APIHandler(cache=ResponseCache(os.path.join(os.path.dirname(self.db_path), 'http_cache')))
+        except Exception:
+            self.api_handler = APIHandler()
         
         # UI animation variables
         self.animation_time = 0
@@ -311,15 +286,19 @@ class MangoTamagotchi:
             self.particle_system = ParticleSystem()
         except Exception:
             self.particle_system = None
-        # Audio volume controls (raised so sounds are audible by default)
-        self.master_volume = 0.9
-        self.sfx_volume = 0.9
-        self.music_volume = 0.6
+        # Audio volume controls (raised so sounds are audible by default),
+        # overridden by the saved settings
+        self.buses = MixerBuses(master=0.9, music=0.6, sfx=0.9)
+        self._settings_path = os.path.join(os.path.dirname(self.db_path), 'settings.json')
+        self.settings = SettingsStore(self._settings_path)
+        self.buses.load_settings(self.settings.load())
         # Do not start Flappy audio here during construction; defaults only
         self._force_short_flap_in_flappy = False
         # SFX visual indicator (last played SFX event)
         self._last_sfx_event = None
         
+        self.startup.lap('ui_setup')
+
         # Game variables
         self.last_stat_update = time.time()
         self.last_random_event = time.time()
@@ -366,48 +345,22 @@ class MangoTamagotchi:
                 'last_updated': datetime.now().isoformat()
             }
 
-        # Load background images and sprites
-        print('[__init__] Loading background images...')
-        try:
-            self.load_background_images()
-            print('[__init__] Background images loaded OK')
-        except Exception as e:
-            print(f'[__init__] Background images failed: {e}')
-            import traceback
-            traceback.print_exc()
-        
-        print('[__init__] Loading mango sprites...')
-        try:
-            self.load_mango_sprites()
-            print('[__init__] Mango sprites loaded OK')
-        except Exception as e:
-            print(f'[__init__] Mango sprites failed: {e}')
-            import traceback
-            traceback.print_exc()
+        self.startup.lap('db')
 
         # Audio manager: encapsulate mixer, sounds, channels and helpers
-        print('[__init__] Initializing audio...')
         try:
             from audio import AudioManager
             self.audio = AudioManager(self)
-            print('[__init__] AudioManager created')
             # mirror sounds dict for compatibility with rest of code
             self.sounds = self.audio.sounds
-            # load/create sounds and channels
-            try:
-                self.audio.load_sounds()
-                print('[__init__] Sounds loaded OK')
-            except Exception as e:
-                print(f'[__init__] load_sounds failed: {e}')
         except Exception as e:
             # fallback: keep old loader present but empty
-            print(f'[__init__] AudioManager failed: {e}')
+            get_logger('audio').error('AudioManager failed: %s', e)
             self.sounds = {}
+        self.startup.lap('audio_manager')
         # Track whether music has been started by a real user action (browsers block autoplay)
         self._music_started = False
 
-        print('[__init__] __init__ complete!')
-
         # music start flag: set when user has interacted (browsers block autoplay)
         self._music_started = False
 
@@ -419,6 +372,53 @@ class MangoTamagotchi:
         # You can tune these at runtime via game.fade_steps / game.fade_delay_ms
         self.fade_steps = 8
         self.fade_delay_ms = 10
+
+        # Backgrounds, sprites and sounds are loaded by the preloader: on a
+        # worker thread (desktop) or in per-frame slices (pygbag) behind a
+        # loading splash, or inline when preload is off.
+        from preload import Preloader, LoadingScene
+        self.preloader = Preloader(self._startup_tasks(), timer=self.startup)
+
+        # Scene stack: the hub is the root scene; mini-games are pushed on top
+        from scenes import SceneManager
+        from hub_ui import HubScene
+        self.scenes = SceneManager(self, fps=FPS)
+
+        def hub():
+            return self.scenes.get('hub', lambda: HubScene(self, GameState.TAMAGOTCHI_HUB))
+        self.startup.lap('scenes')
+        if preload:
+            self.scenes.push(LoadingScene(self, self.preloader, hub))
+        else:
+            # preloader tasks record their own phases
+            self.preloader.run_all()
+            assets_log.debug('assets loaded')
+            self.scenes.push(hub())
+            self.startup.finish()
+
+    @property
+    def startup_timings(self):
+        """Startup phase durations and marks in ms (see startup_timing.py)."""
+        try:
+            return self.startup.as_dict()
+        except Exception:
+            return {}
+
+    def _startup_tasks(self):
+        """Return (name, fn, required) loading tasks for the Preloader."""
+        tasks = []
+        try:
+            from assets import startup_tasks
+            tasks.extend(startup_tasks(self))
+        except Exception as e:
+            # fallback to the inline loaders as one required task each
+            assets_log.warning('assets helper unavailable: %s', e)
+            tasks.append(('backgrounds', self.load_background_images, True))
+            tasks.append(('sprites', self.load_mango_sprites, True))
+        if getattr(self, 'audio', None):
+            # load/create sounds and channels
+            tasks.append(('sounds', self.audio.load_sounds, True))
+        return tasks
         
     def init_database(self):
         """Initialize the SQLite database with schema."""
@@ -430,6 +430,7 @@ class MangoTamagotchi:
             # fallback to original inline behavior if helper unavailable
             try:
                 os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                import sqlite3
                 conn = sqlite3.connect(self.db_path)
                 cursor = conn.cursor()
                 with open('schema.sql', 'r') as f:
@@ -447,6 +448,7 @@ class MangoTamagotchi:
             _save_state(self.db_path, self.mango_state)
         except Exception:
             try:
+                import sqlite3
                 conn = sqlite3.connect(self.db_path)
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM mango_state")
@@ -478,6 +480,7 @@ class MangoTamagotchi:
             return _load_state(self.db_path)
         except Exception:
             try:
+                import sqlite3
                 conn = sqlite3.connect(self.db_path)
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM mango_state ORDER BY id DESC LIMIT 1")
@@ -570,7 +573,7 @@ class MangoTamagotchi:
         """Start the tickle minigame (replaces old discipline action)."""
         try:
             from tickle_minigame import play_tickle_minigame as _play
-            return _play(self, GameState.TAMAGOTCHI_HUB, GameState.TAMAGOTCHI_HUB)
+            return _play(self, GameState.TICKLE_MINIGAME, GameState.TAMAGOTCHI_HUB)
         except Exception:
             # Fallback to legacy discipline behavior
             try:
@@ -632,31 +635,13 @@ class MangoTamagotchi:
             self.save_state()
 
     def _apply_volume_settings(self):
-        """Apply current master/music/sfx volume settings to mixer and loaded sounds."""
-        try:
-            if pygame.mixer.get_init():
-                try:
-                    pygame.mixer.music.set_volume(self.music_volume * self.master_volume)
-                except Exception:
-                    pass
-            # apply to loaded sounds
-            for s in list(self.sounds.keys()):
-                try:
-                    if self.sounds.get(s):
-                        self.sounds[s].set_volume(self.sfx_volume * self.master_volume)
-                except Exception:
-                    pass
+        """Request the current volumes be applied (done once, at the end of the frame)."""
+        self.buses.mark_dirty()
 
-            # Also apply to any dedicated channels we created
-            try:
-                for k, ch in getattr(self, '_sfx_channels', {}).items():
-                    if ch:
-                        try:
-                            ch.set_volume(self.sfx_volume * self.master_volume)
-                        except Exception:
-                            pass
-            except Exception:
-                pass
+    def save_settings_later(self):
+        """Persist the volume settings after the debounce interval."""
+        try:
+            self.settings.schedule(self.buses.as_settings())
         except Exception:
             pass
 
@@ -794,6 +779,7 @@ class MangoTamagotchi:
 
             def load_and_prepare(path, size=(100, 100)):
                 try:
+                    from PIL import Image
                     img = Image.open(path).convert('RGBA')
                     bbox = img.split()[-1].getbbox()
                     if bbox:
@@ -828,13 +814,13 @@ class MangoTamagotchi:
                     sprite_path = f"assets/sprites/{filename}"
                     if os.path.exists(sprite_path):
                         self.mango_sprites[mood] = load_and_prepare(sprite_path, (100, 100))
-                        print(f"Loaded sprite: {filename}")
+                        assets_log.debug('loaded sprite %s', filename)
                     else:
                         self.mango_sprites[mood] = None
-                        print(f"Sprite not found: {filename}")
+                        assets_log.warning('sprite not found: %s', filename)
                 except Exception as e:
                     self.mango_sprites[mood] = None
-                    print(f"Error loading sprite {filename}: {e}")
+                    assets_log.error('could not load sprite %s: %s', filename, e)
 
             flying2_path = "assets/sprites/mango_flying2.png"
             try:
@@ -842,14 +828,14 @@ class MangoTamagotchi:
                     s2 = load_and_prepare(flying2_path, (100, 100))
                     if s2:
                         self.mango_sprites['flying2'] = s2
-                        print("Loaded sprite: mango_flying2.png (processed)")
+                        assets_log.debug('loaded sprite %s', flying2_path)
                     else:
                         self.mango_sprites['flying2'] = self.mango_sprites.get('flying')
                 else:
                     self.mango_sprites['flying2'] = self.mango_sprites.get('flying')
             except Exception as e:
                 self.mango_sprites['flying2'] = self.mango_sprites.get('flying')
-                print(f"Error loading flying2 sprite: {e}")
+                assets_log.error('could not load %s: %s', flying2_path, e)
 
             if 'flying' not in self.mango_sprites:
                 self.mango_sprites['flying'] = None
@@ -863,9 +849,9 @@ class MangoTamagotchi:
                     try:
                         img = pygame.image.load(tree_path).convert_alpha()
                         self.tree_texture = img
-                        print("Loaded tree texture for obstacles: tree.png")
+                        assets_log.debug('loaded tree texture %s', tree_path)
                     except Exception as e:
-                        print(f"Error loading tree texture: {e}")
+                        assets_log.error('could not load %s: %s', tree_path, e)
             except Exception:
                 pass
 
@@ -1131,6 +1117,7 @@ class MangoTamagotchi:
                 pass
         except Exception:
             try:
+                import sqlite3
                 conn = sqlite3.connect(self.db_path)
                 cursor = conn.cursor()
                 cursor.execute("INSERT INTO scores (score) VALUES (?)", (score,))
@@ -1155,6 +1142,7 @@ class MangoTamagotchi:
                 return 0
         except Exception:
             try:
+                import sqlite3
                 conn = sqlite3.connect(self.db_path)
                 cursor = conn.cursor()
                 cursor.execute("SELECT MAX(score) FROM scores")
@@ -1168,7 +1156,8 @@ class MangoTamagotchi:
         """Delegate to the Flappy mini-game implementation in flappy.py.
 
         The full Flappy logic was moved to a separate module to keep project.py small.
-        We pass `self` so the flappy module can call back into game helpers.
+        We pass `self` so the flappy module can call back into game helpers. The
+        call pushes the Flappy scene and returns; the main loop then drives it.
         """
         # Directly delegate to the flappy module. Let exceptions surface so
         # they are easier to diagnose during development rather than silently
@@ -1179,7 +1168,7 @@ class MangoTamagotchi:
     def play_feed_minigame(self):
         """Delegate to feed_minigame.play_feed_minigame."""
         from feed_minigame import play_feed_minigame as _play
-        return _play(self, GameState.TAMAGOTCHI_HUB, GameState.TAMAGOTCHI_HUB)
+        return _play(self, GameState.FEED_MINIGAME, GameState.TAMAGOTCHI_HUB)
     
     def draw_home_screen(self):
         # Delegate fully to the hub_ui module which owns hub rendering.
@@ -1208,239 +1197,14 @@ class MangoTamagotchi:
                     pass
         except Exception:
             pass
-        running = True
-        
-        while running:
-            # Compute logical mouse position from display coords for scaled rendering
-            try:
-                disp = getattr(self, '_display_screen', None)
-                disp_w, disp_h = disp.get_size() if disp else (self.screen.get_width(), self.screen.get_height())
-            except Exception:
-                disp_w, disp_h = (self.screen.get_width(), self.screen.get_height())
-            try:
-                logical_w, logical_h = self.screen.get_size()
-            except Exception:
-                logical_w, logical_h = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        # The scene manager owns the loop: event pumping, logical mouse
+        # mapping, update/draw of the active scene, present() and timing.
+        await self.scenes.run()
 
-            # store logical mouse pos on the game instance for UI modules to use
-            try:
-                mx_disp, my_disp = pygame.mouse.get_pos()
-                if disp_w and disp_h:
-                    mx_log = int(mx_disp * logical_w / float(disp_w))
-                    my_log = int(my_disp * logical_h / float(disp_h))
-                else:
-                    mx_log, my_log = mx_disp, my_disp
-                self._mouse_pos_logical = (mx_log, my_log)
-            except Exception:
-                self._mouse_pos_logical = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:  # Left click
-                        # map display coords to logical coords before handling
-                        try:
-                            px, py = event.pos
-                            if disp_w and disp_h:
-                                lx = int(px * logical_w / float(disp_w))
-                                ly = int(py * logical_h / float(disp_h))
-                            else:
-                                lx, ly = px, py
-                            self.handle_click((lx, ly))
-                        except Exception:
-                            self.handle_click(event.pos)
-                        # Browsers require a user gesture to unlock audio. Ensure
-                        # the mixer is initialized on first click/key so audio can play.
-                        try:
-                            if getattr(self, 'audio', None):
-                                try:
-                                    self.audio.ensure_audio()
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                        # Mark music started and attempt to start hub music
-                        try:
-                            self.start_music()
-                        except Exception:
-                            pass
-                elif event.type == pygame.MOUSEMOTION:
-                    try:
-                        mx, my = event.pos
-                        # convert to logical coords for slider dragging
-                        try:
-                            if disp_w and disp_h:
-                                mx = int(mx * logical_w / float(disp_w))
-                                my = int(my * logical_h / float(disp_h))
-                        except Exception:
-                            pass
-                        for key, meta in self._audio_sliders.items():
-                            if meta.get('dragging') and meta.get('rect'):
-                                r = meta['rect']
-                                rel = (mx - r.x) / float(r.w)
-                                val = max(0.0, min(1.0, rel))
-                                if key == 'master':
-                                    self.master_volume = val
-                                elif key == 'music':
-                                    self.music_volume = val
-                                elif key == 'sfx':
-                                    self.sfx_volume = val
-                                # apply volumes live
-                                try:
-                                    pygame.mixer.music.set_volume(self.music_volume * self.master_volume)
-                                except Exception:
-                                    pass
-                                try:
-                                    for s in ['flap', 'medicine', 'button', 'chirp', 'thump']:
-                                        if s in self.sounds and self.sounds[s]:
-                                            try:
-                                                self.sounds[s].set_volume(self.sfx_volume * self.master_volume)
-                                            except Exception:
-                                                pass
-                                except Exception:
-                                    pass
-                    except Exception:
-                        pass
-                elif event.type == pygame.MOUSEBUTTONUP:
-                    try:
-                        if event.button == 1:
-                            # stop any dragging and persist settings
-                            changed = False
-                            for key, meta in self._audio_sliders.items():
-                                if meta.get('dragging'):
-                                    meta['dragging'] = False
-                                    changed = True
-                            if changed:
-                                import json as _json
-                                with open(self._settings_path, 'w') as _f:
-                                    _json.dump({'master_volume': self.master_volume, 'music_volume': self.music_volume, 'sfx_volume': self.sfx_volume}, _f)
-                    except Exception:
-                        pass
-                elif event.type == pygame.KEYDOWN:
-                    # Any key press should also be considered a user gesture
-                    try:
-                        if getattr(self, 'audio', None):
-                            try:
-                                self.audio.ensure_audio()
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-                    # Fullscreen toggles: F11 or Alt+Enter
-                    try:
-                        if event.key == pygame.K_F11:
-                            self.toggle_fullscreen()
-                            continue
-                        if event.key == pygame.K_RETURN and (event.mod & pygame.KMOD_ALT):
-                            self.toggle_fullscreen()
-                            continue
-                    except Exception:
-                        pass
-                    # Developer audio self-test: press T in the hub to play all SFX/music
-                    if event.key == pygame.K_t and self.state == GameState.TAMAGOTCHI_HUB:
-                        try:
-                            print("Audio self-test: playing flap, button, medicine, chirp, starting/stopping music...")
-                            if 'flap' in self.sounds:
-                                self._play_sfx('flap')
-                                pygame.time.delay(300)
-                            if 'button' in self.sounds:
-                                self._play_sfx('button')
-                                pygame.time.delay(300)
-                            if 'medicine' in self.sounds:
-                                self._play_sfx('medicine')
-                                pygame.time.delay(400)
-                            if 'chirp' in self.sounds:
-                                self._play_sfx('chirp')
-                                pygame.time.delay(300)
-                            # Play home music briefly then switch to forest
-                            self._play_music('home')
-                            pygame.time.delay(800)
-                            self._play_music('forest')
-                            pygame.time.delay(800)
-                            self._stop_music()
-                            print("Audio self-test complete.")
-                        except Exception as e:
-                            print(f"Audio self-test failed: {e}")
-                        continue
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-            
-            # Update game state
-            self.update_stats()
-            self.age_mango()
-            
-            # Force sickness if health is low (real-time check)
-            if self.mango_state['health'] <= 30 and not self.is_sick:
-                self.is_sick = True
-            
-            # Update day/night cycle
-            current_hour = datetime.now().hour
-            if current_hour != self.current_hour:
-                self.current_hour = current_hour
-                self.is_night = current_hour < 6 or current_hour > 18
-            
-            # Check game over
-            if self.is_game_over():
-                self.state = GameState.GAME_OVER
-
-            # Update particle system
-            try:
-                if getattr(self, 'particle_system', None):
-                    self.particle_system.update(1.0 / float(FPS))
-            except Exception:
-                pass
-
-            # Advance a simple animation timer used by UI modules
-            try:
-                self.animation_time += 1.0 / float(FPS)
-            except Exception:
-                pass
-
-            # Draw current state
-            if self.state == GameState.TAMAGOTCHI_HUB:
-                self.draw_home_screen()
-                # Draw particle overlays on top of hub UI
-                try:
-                    if getattr(self, 'particle_system', None):
-                        self.particle_system.draw(self.screen)
-                except Exception:
-                    pass
-            elif self.state == GameState.GAME_OVER:
-                self.draw_game_over_screen()
-            
-            # Update display - simplified for pygbag compatibility
-            try:
-                # Check if we're using the display surface directly (pygbag)
-                if self.screen is self._display_screen:
-                    # Already drawing to display surface, just flip
-                    pygame.display.flip()
-                else:
-                    # Desktop: scale logical surface to display
-                    disp = getattr(self, '_display_screen', None)
-                    if disp is not None:
-                        # Smooth scale for nicer visuals when stretching
-                        try:
-                            scaled = pygame.transform.smoothscale(self.screen, disp.get_size())
-                        except Exception:
-                            scaled = pygame.transform.scale(self.screen, disp.get_size())
-                        disp.blit(scaled, (0, 0))
-                        pygame.display.flip()
-                    else:
-                        pygame.display.flip()
-            except Exception:
-                try:
-                    pygame.display.flip()
-                except Exception:
-                    pass
-            self.clock.tick(FPS)
-            # Essential for pygbag - yield control to browser
-            import asyncio
-            try:
-                await asyncio.sleep(0)
-            except:
-                pass
-        
+        try:
+            self.settings.flush()
+        except Exception:
+            pass
         try:
             pygame.quit()
         except Exception:
@@ -1448,13 +1212,7 @@ class MangoTamagotchi:
         # In embedded environments (pygbag) avoid calling sys.exit() which
         # can terminate the module import/execution unexpectedly. Return from
         # main instead and let the embedder handle process lifecycle.
-            try:
-                pygame.quit()
-            except Exception:
-                pass
-            # Do not call sys.exit() here - returning lets the caller (or pygbag) cleanly
-            # finish without forcibly exiting the process which can cause issues in WASM.
-            return
+        return
     
     def draw_game_over_screen(self):
         """Delegate the game-over screen drawing to hub_ui.draw_game_over_screen."""
@@ -1782,6 +1540,10 @@ class MangoTamagotchi:
         """
         try:
             disp = getattr(self, '_display_screen', None)
+            if disp is not None and self.screen is disp:
+                # pygbag: already drawing to the display surface, just flip
+                pygame.display.flip()
+                return
             if disp is not None:
                 try:
                     scaled = pygame.transform.smoothscale(self.screen, disp.get_size())
@@ -1852,7 +1614,7 @@ def main():
     asyncio.run() for a normal desktop run.
     """
     import asyncio
-    game = MangoTamagotchi()
+    game = MangoTamagotchi(preload=True)
 
     # In pygbag / Python-WASM the asyncio event loop is already running.
     # Calling asyncio.run() inside an active loop raises RuntimeError. Detect
@@ -0,0 +1,515 @@
+"""Shared cache for images, scaled surfaces, sounds and fonts.
+
+Every loaded resource lives in one `ResourceManager` keyed by
+``(source, size, transform)`` so the same file scaled to the same size is
+only decoded and scaled once, no matter which module asks for it.
+
+Entries can be owned (reference counted) by a scene or by the game; owned
+entries are never evicted. Unowned entries stay cached in LRU order until
+the total size goes over the byte budget, so re-entering a mini-game is
+normally a cache hit.
+"""
+import os
+import sys
+import struct
+import threading
+from collections import OrderedDict
+
+import sprite_cache
+import asset_bundle
+from mango_log import get_logger
+
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+# PIL is imported on first sprite load (see _pil_image), not at import time
+_PIL_IMAGE = False
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+# Browsers give the WASM heap much less room than a desktop process
+DEFAULT_BUDGET = (24 if IS_WASM else 64) * 1024 * 1024
+# Rough size charged for a font when the file size is unknown (system fonts)
+FONT_BYTES = 64 * 1024
+
+
+class _Entry:
+    __slots__ = ('value', 'nbytes', 'kind', 'owners', 'source')
+
+    def __init__(self, value, nbytes, kind, source=None):
+        self.value = value
+        self.nbytes = nbytes
+        self.kind = kind
+        self.owners = set()
+        # keeps an in-memory source surface alive so its id() stays unique
+        self.source = source
+
+
+def _scale_smooth(surf, size):
+    try:
+        return pygame.transform.smoothscale(surf, size)
+    except Exception:
+        # smoothscale needs 24/32-bit surfaces; fall back to nearest-neighbour
+        return pygame.transform.scale(surf, size)
+
+
+def _scale_fast(surf, size):
+    return pygame.transform.scale(surf, size)
+
+
+def _flip_v(surf, size):
+    return pygame.transform.flip(surf, False, True)
+
+
+def _flip_h(surf, size):
+    return pygame.transform.flip(surf, True, False)
+
+
+# transform name -> fn(surface, size); names can be chained with '+'
+TRANSFORMS = {
+    'smooth': _scale_smooth,
+    'scale': _scale_fast,
+    'flipv': _flip_v,
+    'fliph': _flip_h,
+}
+
+
+def surface_nbytes(surf):
+    """Return the pixel memory used by a surface."""
+    try:
+        w, h = surf.get_size()
+        return int(w * h * surf.get_bytesize())
+    except Exception:
+        return 0
+
+
+def sound_nbytes(snd):
+    """Return the decoded PCM size of a mixer Sound."""
+    try:
+        freq, fmt, channels = pygame.mixer.get_init()
+        return int(snd.get_length() * freq * channels * (abs(fmt) // 8))
+    except Exception:
+        return 0
+
+
+def _nbytes(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if hasattr(value, 'get_bytesize'):
+        return surface_nbytes(value)
+    if hasattr(value, 'get_length'):
+        return sound_nbytes(value)
+    return 0
+
+
+def load_surface(path):
+    """pygame.image.load from the asset bundle when present, else from disk."""
+    bundle = asset_bundle.bundle_for(path)
+    if bundle is not None:
+        return pygame.image.load(bundle.open(path), os.path.basename(path))
+    return pygame.image.load(path)
+
+
+def _wav_pcm(view):
+    """Return (pcm memoryview, rate, sample width, channels) for a PCM WAV, else None."""
+    try:
+        if bytes(view[0:4]) != b'RIFF' or bytes(view[8:12]) != b'WAVE':
+            return None
+        pos = 12
+        fmt = None
+        while pos + 8 <= len(view):
+            cid = bytes(view[pos:pos + 4])
+            size = int.from_bytes(view[pos + 4:pos + 8], 'little')
+            body = pos + 8
+            if cid == b'fmt ':
+                tag, channels, rate = struct.unpack_from('<HHI', view, body)
+                bits = struct.unpack_from('<H', view, body + 14)[0]
+                if tag != 1:
+                    return None
+                fmt = (rate, bits // 8, channels)
+            elif cid == b'data' and fmt is not None:
+                return (view[body:body + size],) + fmt
+            pos = body + size + (size & 1)
+    except Exception:
+        pass
+    return None
+
+
+def load_sound(path):
+    """mixer.Sound for path, reading from the asset bundle when present.
+
+    PCM WAV data that already matches the mixer format is passed as a
+    zero-copy buffer; anything else is decoded from a bundle reader.
+    """
+    bundle = asset_bundle.bundle_for(path)
+    if bundle is None:
+        return pygame.mixer.Sound(path)
+    view = bundle.view(path)
+    if path.lower().endswith('.wav'):
+        pcm = _wav_pcm(view)
+        init = pygame.mixer.get_init()
+        if pcm and init:
+            data, rate, width, channels = pcm
+            freq, fmt, mix_channels = init
+            # 16-bit WAV is signed (-16); 8-bit WAV is unsigned (8)
+            want_fmt = -16 if width == 2 else (8 if width == 1 else None)
+            if (rate, want_fmt, channels) == (freq, fmt, mix_channels):
+                return pygame.mixer.Sound(buffer=data)
+    return pygame.mixer.Sound(file=bundle.open(path))
+
+
+def _convert(surf, alpha=True):
+    try:
+        return surf.convert_alpha() if alpha else surf.convert()
+    except Exception:
+        # no display yet (tests, headless); keep the raw surface
+        return surf
+
+
+class ResourceManager:
+    """Keyed resource cache with reference counting and an LRU byte budget.
+
+    Safe to use from the startup preload thread: bookkeeping is locked,
+    loaders run outside the lock.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET):
+        self.budget_bytes = int(budget_bytes)
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    # --- core ----------------------------------------------------------------
+    def get(self, key, loader, owner=None, kind='misc', source=None, nbytes=None):
+        """Return the cached value for key, calling loader() on a miss.
+
+        A loader returning None is not cached so a missing file can appear
+        later (e.g. after a background download) without a restart. nbytes
+        overrides the measured size for values that can't report their own.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                if owner is not None:
+                    entry.owners.add(owner)
+                return entry.value
+            self.misses += 1
+        try:
+            value = loader()
+        except Exception:
+            value = None
+        if value is None:
+            return None
+        with self._lock:
+            # another thread may have loaded the same key meanwhile
+            entry = self._entries.get(key)
+            if entry is None:
+                size = _nbytes(value) if nbytes is None else int(nbytes)
+                entry = _Entry(value, size, kind, source)
+                self._entries[key] = entry
+                self.total_bytes += entry.nbytes
+                self._evict(keep=key)
+            if owner is not None:
+                entry.owners.add(owner)
+            return entry.value
+
+    def peek(self, key):
+        """Return the cached value for key without loading or touching LRU order."""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def acquire(self, key, owner):
+        """Add owner as a reference on an already cached key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry.owners.add(owner)
+            return True
+
+    def release(self, owner, key=None):
+        """Drop owner's reference on key, or on every entry when key is None."""
+        with self._lock:
+            if key is not None:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.owners.discard(owner)
+            else:
+                for entry in self._entries.values():
+                    entry.owners.discard(owner)
+            self._evict()
+
+    def discard(self, key):
+        """Remove key from the cache regardless of owners; return the bytes freed."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return 0
+            self.total_bytes -= entry.nbytes
+            return entry.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = int(budget_bytes)
+            self._evict()
+
+    def _evict(self, keep=None):
+        """Drop least recently used unowned entries until under budget.
+
+        Callers hold self._lock.
+        """
+        if self.total_bytes <= self.budget_bytes:
+            return
+        for key in list(self._entries.keys()):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if key == keep or entry.owners:
+                continue
+            del self._entries[key]
+            self.total_bytes -= entry.nbytes
+            self.evictions += 1
+
+    # --- typed loaders -------------------------------------------------------
+    def image(self, path, alpha=True, owner=None):
+        """Load an image file, converted for fast blitting."""
+        def load():
+            if not asset_bundle.exists(path):
+                return None
+            return _convert(load_surface(path), alpha)
+        return self.get((path, None, 'alpha' if alpha else 'opaque'), load, owner, 'image')
+
+    def scaled(self, source, size, transform='smooth', owner=None, alpha=True):
+        """Return source resized to size and passed through transform.
+
+        source is an image path, the key of another cached entry, or an
+        in-memory Surface (cached by identity). transform names come from
+        TRANSFORMS and may be chained, e.g. 'smooth+flipv'.
+        """
+        size = (int(size[0]), int(size[1]))
+        pinned = None
+        if isinstance(source, (str, tuple)):
+            src_key = source
+        else:
+            pinned = source
+            src_key = ('surface', id(source))
+
+        def load():
+            if pinned is not None:
+                base = pinned
+            elif isinstance(source, str):
+                base = self.image(source, alpha=alpha)
+            else:
+                base = self.peek(source)
+            if base is None:
+                return None
+            out = base
+            for name in transform.split('+'):
+                fn = TRANSFORMS.get(name)
+                if fn is not None:
+                    out = fn(out, size)
+            return out
+        return self.get((src_key, size, transform), load, owner, 'scaled', source=pinned)
+
+    def sprite(self, path, size=(100, 100), owner=None):
+        """Load a character sprite: trimmed, aspect-fit into size, alpha fixed up.
+
+        Uses PIL on desktop for better resampling and falls back to a plain
+        pygame scale in the browser or when PIL is missing.
+        """
+        size = (int(size[0]), int(size[1]))
+        return self.get((path, size, 'sprite'), lambda: _prepare_sprite(path, size), owner, 'image')
+
+    def sound(self, path, owner=None, kind='sound', loader=load_sound):
+        """Load and decode a sound once; kind='music' files are accounted separately."""
+        def load():
+            if not asset_bundle.exists(path):
+                return None
+            return loader(path)
+        return self.get((asset_bundle.normalize(path), None, kind), load, owner, kind)
+
+    def font(self, name, size, bold=False, system=False, owner=None):
+        """Load a font file (or a system font when system=True)."""
+        transform = ('sysfont' if system else 'font') + ('-bold' if bold else '')
+        nbytes = FONT_BYTES
+        try:
+            # fonts don't expose their memory; charge the file size instead
+            if name and not system and os.path.exists(name):
+                nbytes = os.path.getsize(name)
+        except Exception:
+            pass
+
+        def load():
+            if system:
+                return pygame.font.SysFont(name, size, bold=bold)
+            f = pygame.font.Font(name, size)
+            if bold:
+                try:
+                    f.set_bold(True)
+                except Exception:
+                    pass
+            return f
+        return self.get((name, int(size), transform), load, owner, 'font', nbytes=nbytes)
+
+    # --- reporting -----------------------------------------------------------
+    def memory_report(self, top=10):
+        """Return a dict describing cache usage, largest entries first."""
+        with self._lock:
+            entries = list(self._entries.items())
+        by_kind = {}
+        for _key, entry in entries:
+            k = by_kind.setdefault(entry.kind, {'count': 0, 'bytes': 0})
+            k['count'] += 1
+            k['bytes'] += entry.nbytes
+        largest = sorted(entries, key=lambda kv: kv[1].nbytes, reverse=True)[:top]
+        return {
+            'entries': len(entries),
+            'bytes': self.total_bytes,
+            'budget': self.budget_bytes,
+            'pinned': sum(1 for _k, e in entries if e.owners),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'by_kind': by_kind,
+            'sprite_disk_cache': dict(sprite_cache.stats),
+            'largest': [(repr(k), e.nbytes, sorted(map(str, e.owners))) for k, e in largest],
+        }
+
+    def format_report(self, top=10):
+        """Return memory_report() as printable lines."""
+        r = self.memory_report(top)
+        lines = [
+            f"resources: {r['entries']} entries, {r['bytes'] / 1048576.0:.1f}/"
+            f"{r['budget'] / 1048576.0:.0f} MB, pinned={r['pinned']} hits={r['hits']} "
+            f"misses={r['misses']} evictions={r['evictions']}"
+        ]
+        for kind, info in sorted(r['by_kind'].items()):
+            lines.append(f"  {kind}: {info['count']} ({info['bytes'] / 1024.0:.0f} KB)")
+        for key, nbytes, owners in r['largest']:
+            lines.append(f"  {nbytes / 1024.0:8.0f} KB {key} {','.join(owners)}")
+        return lines
+
+
+def _pil_image():
+    """Return PIL.Image, or None when Pillow is unavailable (cached)."""
+    global _PIL_IMAGE
+    if _PIL_IMAGE is False:
+        try:
+            from PIL import Image
+            _PIL_IMAGE = Image
+        except Exception:
+            _PIL_IMAGE = None
+    return _PIL_IMAGE
+
+
+def _prepare_sprite(path, size):
+    if not asset_bundle.exists(path):
+        return None
+    # In WASM, avoid PIL Image.LANCZOS and pygame.transform.smoothscale - use simpler methods
+    if IS_WASM:
+        try:
+            s = load_surface(path).convert_alpha()
+            return pygame.transform.scale(s, size)
+        except Exception as e:
+            get_logger('wasm').warning('could not load sprite %s: %s', path, e)
+            return None
+
+    # Warm start: reuse the processed pixels from the on-disk sprite cache
+    data = sprite_cache.read(path, size)
+    if data is not None:
+        try:
+            return _convert(pygame.image.frombuffer(data, size, 'RGBA'))
+        except Exception:
+            pass
+
+    # Desktop: Prefer PIL if available for better resizing/alpha handling
+    Image = _pil_image()
+    if Image is not None:
+        try:
+            img = Image.open(asset_bundle.open_asset(path)).convert('RGBA')
+
+            # Trim fully-transparent borders if present
+            bbox = img.split()[-1].getbbox()
+            if bbox:
+                img = img.crop(bbox)
+
+            # Resize preserving aspect into a square canvas
+            img.thumbnail(size, Image.LANCZOS)
+            canvas = Image.new('RGBA', size, (0, 0, 0, 0))
+            x = (size[0] - img.width) // 2
+            y = (size[1] - img.height) // 2
+            canvas.paste(img, (x, y), img)
+
+            # Boost alpha if the sprite is accidentally faint
+            try:
+                alpha = canvas.split()[-1]
+                # mean alpha computed in C (was a Python sum over getdata())
+                from PIL import ImageStat
+                avg = ImageStat.Stat(alpha).mean[0]
+                if avg < 60:
+                    def boost(a):
+                        return min(255, int(a * 1.6))
+                    alpha = alpha.point(boost)
+                    canvas.putalpha(alpha)
+            except Exception:
+                pass
+
+            data = canvas.tobytes()
+            sprite_cache.write(path, size, data)
+            surf = pygame.image.frombuffer(data, size, 'RGBA')
+            return _convert(surf)
+        except Exception:
+            # Fall through to pygame loader
+            pass
+
+    # PIL not available or failed; use pygame loader with smoothscale
+    try:
+        s = _convert(load_surface(path))
+        return _scale_smooth(s, size)
+    except Exception:
+        return None
+
+
+def get_resources(game=None):
+    """Return the game's ResourceManager, creating one on first use.
+
+    Without a game, a module-wide manager is returned so helpers that run
+    before the game object exists still share one cache.
+    """
+    global _default
+    if game is not None:
+        res = getattr(game, 'resources', None)
+        if res is None:
+            res = _default if _default is not None else ResourceManager()
+            _default = res
+            try:
+                game.resources = res
+            except Exception:
+                pass
+        return res
+    if _default is None:
+        _default = ResourceManager()
+    return _default
+
+
+_default = None
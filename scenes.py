@@ -0,0 +1,450 @@
+"""Scene stack and the single shared main loop.
+
+Every screen in the game (hub, Flappy, Feed, Tickle and game-over) is a
+`Scene`. The `SceneManager` keeps them on a stack and owns the pieces
+that used to be copied into every mini-game loop: event pumping, mapping
+display coordinates to the logical surface, `present()`, `clock.tick`,
+music switching and the fade transitions.
+
+Scenes are kept in a registry by name so leaving and re-entering a
+mini-game reuses the same instance (and therefore its cached surfaces).
+"""
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+
+class Scene:
+    """Base class for a screen managed by SceneManager.
+
+    Subclasses override the hooks they need. Class attributes describe
+    how the manager should treat the scene:
+
+    - state: legacy GameState value mirrored onto ``game.state``
+    - music: music key played while the scene is on top (None = leave as is)
+    - music_watchdog: keep the music looping via AudioManager's watchdog
+    - overlay: draw the scene underneath before drawing this one
+    - pausable: the P key pushes a PauseScene on top of this scene
+    - transition: fade out/in when the scene is pushed and fade out on pop
+    """
+
+    name = 'scene'
+    state = None
+    music = None
+    music_watchdog = False
+    overlay = False
+    pausable = False
+    transition = False
+
+    def __init__(self, game):
+        self.game = game
+        self.manager = None
+        self.suspended = False
+
+    # --- lifecycle hooks -----------------------------------------------------
+    def enter(self, **kwargs):
+        """Called when the scene is pushed onto the stack."""
+
+    def exit(self):
+        """Called when the scene is popped; caches should survive this."""
+
+    def suspend(self):
+        """Called when another scene is pushed on top of this one."""
+
+    def resume(self):
+        """Called when the scene above this one is popped."""
+
+    # --- per-frame hooks -----------------------------------------------------
+    def handle_event(self, event):
+        """Handle one event. Mouse positions are already in logical coords."""
+
+    def update(self, dt):
+        """Advance the scene by dt seconds."""
+
+    def draw(self, surface):
+        """Draw the scene onto the logical surface."""
+
+    # --- helpers -------------------------------------------------------------
+    def close(self):
+        """Pop this scene off the stack."""
+        if self.manager is not None:
+            self.manager.pop(self)
+
+
+class PauseScene(Scene):
+    """Overlay shown while a mini-game is paused (P or ESC resumes)."""
+
+    name = 'pause'
+    overlay = True
+
+    def handle_event(self, event):
+        try:
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_p, pygame.K_ESCAPE):
+                self.close()
+        except Exception:
+            pass
+
+    def draw(self, surface):
+        try:
+            w, h = surface.get_size()
+            shade = pygame.Surface((w, h), pygame.SRCALPHA)
+            shade.fill((0, 0, 0, 150))
+            surface.blit(shade, (0, 0))
+            font = getattr(self.game, 'title_font', None)
+            small = getattr(self.game, 'small_font', None)
+            if font:
+                txt = font.render('Paused', True, (255, 255, 255))
+                surface.blit(txt, txt.get_rect(center=(w // 2, h // 2 - 20)))
+            if small:
+                hint = small.render('Press P to resume', True, (220, 220, 220))
+                surface.blit(hint, hint.get_rect(center=(w // 2, h // 2 + 24)))
+        except Exception:
+            pass
+
+
+class SceneManager:
+    """Stack of scenes plus the main loop that drives the top one."""
+
+    def __init__(self, game, fps=60):
+        self.game = game
+        self.fps = fps
+        self.stack = []
+        self.running = False
+        self._registry = {}
+
+    # --- registry ------------------------------------------------------------
+    def get(self, name, factory=None):
+        """Return the registered scene called name, creating it with factory."""
+        scene = self._registry.get(name)
+        if scene is None and factory is not None:
+            scene = factory()
+            scene.name = name
+            self._registry[name] = scene
+        return scene
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    @property
+    def paused(self):
+        return isinstance(self.top, PauseScene)
+
+    # --- stack operations ----------------------------------------------------
+    def push(self, scene, **kwargs):
+        """Push scene on top, suspending (not exiting) the current one."""
+        below = self.top
+        if scene.transition and below is not None:
+            self._fade_out()
+        if below is not None:
+            below.suspended = True
+            try:
+                below.suspend()
+            except Exception:
+                pass
+        scene.manager = self
+        scene.suspended = False
+        self.stack.append(scene)
+        self._sync_state(scene)
+        try:
+            scene.enter(**kwargs)
+        except Exception:
+            pass
+        try:
+            # lets perf_harness.py see scene changes in the browser
+            from startup_timing import browser_mark
+            browser_mark('scene:' + scene.name)
+        except Exception:
+            pass
+        self._apply_music(scene)
+        if scene.transition:
+            self._fade_in()
+        return scene
+
+    def pop(self, scene=None):
+        """Pop the top scene (or scene, if given and on the stack)."""
+        if not self.stack:
+            return None
+        if scene is None:
+            scene = self.stack[-1]
+        if scene not in self.stack:
+            return None
+        # pop everything above the requested scene as well
+        while self.stack and self.stack[-1] is not scene:
+            self._pop_one()
+        self._pop_one()
+        return scene
+
+    def replace(self, scene, **kwargs):
+        """Swap the top scene for scene."""
+        if self.stack:
+            self._pop_one(resume_below=False)
+        return self.push(scene, **kwargs)
+
+    def toggle_pause(self):
+        if self.paused:
+            self.pop()
+        elif self.top is not None and self.top.pausable:
+            self.push(self.get('pause', lambda: PauseScene(self.game)))
+
+    def quit(self):
+        self.running = False
+
+    def _pop_one(self, resume_below=True):
+        scene = self.stack.pop()
+        if scene.transition:
+            self._fade_out()
+        try:
+            scene.exit()
+        except Exception:
+            pass
+        if scene.music_watchdog:
+            try:
+                if getattr(self.game, 'audio', None):
+                    self.game.audio.stop_watchdog()
+            except Exception:
+                pass
+        scene.manager = None
+        below = self.top
+        if below is not None and resume_below:
+            below.suspended = False
+            self._sync_state(below)
+            try:
+                below.resume()
+            except Exception:
+                pass
+            self._apply_music(below)
+
+    def _sync_state(self, scene):
+        if scene.state is not None:
+            try:
+                self.game.state = scene.state
+            except Exception:
+                pass
+
+    # --- shared services -----------------------------------------------------
+    def _apply_music(self, scene):
+        """Switch to the scene's music, queueing it until the first gesture."""
+        key = scene.music
+        if not key:
+            return
+        game = self.game
+        try:
+            if getattr(game, '_music_started', False):
+                if getattr(game, '_music_playing', None) != key:
+                    game._stop_music()
+                game._play_music(key)
+                if scene.music_watchdog and getattr(game, 'audio', None):
+                    game.audio.start_watchdog(key)
+            else:
+                game._queued_music = key
+        except Exception:
+            pass
+
+    def _fade_out(self):
+        try:
+            if hasattr(self.game, 'fade_out'):
+                self.game.fade_out()
+        except Exception:
+            pass
+
+    def _fade_in(self):
+        try:
+            self.draw(self.game.screen)
+            if hasattr(self.game, 'fade_in'):
+                self.game.fade_in()
+        except Exception:
+            pass
+
+    def _logical_scale(self):
+        """Return (sx, sy) to convert display coordinates to logical ones."""
+        game = self.game
+        try:
+            disp = getattr(game, '_display_screen', None)
+            disp_w, disp_h = disp.get_size() if disp else game.screen.get_size()
+            logical_w, logical_h = game.screen.get_size()
+            if disp_w and disp_h:
+                return logical_w / float(disp_w), logical_h / float(disp_h)
+        except Exception:
+            pass
+        return 1.0, 1.0
+
+    def to_logical(self, event, scale):
+        """Return event with any `pos` mapped into logical coordinates."""
+        pos = getattr(event, 'pos', None)
+        if pos is None or scale == (1.0, 1.0):
+            return event
+        try:
+            attrs = dict(event.dict)
+            attrs['pos'] = (int(pos[0] * scale[0]), int(pos[1] * scale[1]))
+            return pygame.event.Event(event.type, attrs)
+        except Exception:
+            return event
+
+    def _handle_global(self, event):
+        """Input handled for every scene. Returns True when consumed."""
+        game = self.game
+        if event.type == pygame.MOUSEBUTTONDOWN and getattr(event, 'button', 0) == 1:
+            # Browsers require a user gesture before audio can start
+            try:
+                if getattr(game, 'audio', None):
+                    game.audio.ensure_audio()
+            except Exception:
+                pass
+            try:
+                game.start_music()
+            except Exception:
+                pass
+            return False
+        if event.type == pygame.KEYDOWN:
+            try:
+                if getattr(game, 'audio', None):
+                    game.audio.ensure_audio()
+            except Exception:
+                pass
+            try:
+                if event.key == pygame.K_F11 or (event.key == pygame.K_RETURN and (event.mod & pygame.KMOD_ALT)):
+                    game.toggle_fullscreen()
+                    return True
+            except Exception:
+                pass
+            if event.key == pygame.K_F3:
+                # developer overlay (startup timings and per-scene debug info)
+                game._dev_mode = not getattr(game, '_dev_mode', False)
+                try:
+                    import audio_log
+                    audio_log.get_log().set_verbose(game._dev_mode)
+                except Exception:
+                    pass
+                return True
+            if event.key == pygame.K_p and (self.paused or (self.top is not None and self.top.pausable)):
+                self.toggle_pause()
+                return True
+        return False
+
+    # --- frame ---------------------------------------------------------------
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.quit()
+            return
+        if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+            probe = getattr(getattr(self.game, 'audio', None), 'latency', None)
+            if probe is not None:
+                probe.input()
+        if self._handle_global(event):
+            return
+        try:
+            # music end events (restart / refill the music stream)
+            if self.game.audio.handle_event(event):
+                return
+        except Exception:
+            pass
+        top = self.top
+        if top is not None:
+            top.handle_event(event)
+
+    def update(self, dt):
+        top = self.top
+        if top is not None:
+            top.update(dt)
+        try:
+            if getattr(self.game, 'audio', None):
+                self.game.audio.watchdog_tick()
+                self.game.audio.end_frame()
+        except Exception:
+            pass
+
+    def draw(self, surface):
+        """Draw the top scene, and any scenes below it visible through overlays."""
+        if not self.stack:
+            return
+        first = len(self.stack) - 1
+        while first > 0 and self.stack[first].overlay:
+            first -= 1
+        for scene in self.stack[first:]:
+            try:
+                scene.draw(surface)
+            except Exception:
+                pass
+        if getattr(self.game, '_dev_mode', False):
+            self._draw_dev_overlay(surface)
+
+    def _draw_dev_overlay(self, surface):
+        try:
+            from startup_timing import draw_overlay
+            draw_overlay(self.game, surface)
+        except Exception:
+            pass
+
+    def step(self, events, dt):
+        """Run one frame: dispatch events, update, draw and present."""
+        game = self.game
+        scale = self._logical_scale()
+        try:
+            mx, my = pygame.mouse.get_pos()
+            game._mouse_pos_logical = (int(mx * scale[0]), int(my * scale[1]))
+        except Exception:
+            pass
+        for event in events:
+            self.handle_event(self.to_logical(event, scale))
+            if not self.running:
+                return
+        self.update(dt)
+        self.draw(game.screen)
+        try:
+            game.present()
+        except Exception:
+            pass
+        startup = getattr(game, 'startup', None)
+        if startup is not None and 'first_frame' not in startup.marks:
+            startup.mark('first_frame')
+
+    async def run(self):
+        """Main loop shared by all scenes; yields to the browser every frame."""
+        import asyncio
+        game = self.game
+        self.running = True
+        dt = 1.0 / float(self.fps)
+        while self.running and self.stack:
+            try:
+                events = pygame.event.get()
+            except Exception:
+                events = []
+            self.step(events, dt)
+            try:
+                ms = game.clock.tick(self.fps)
+                dt = (ms / 1000.0) if ms else 1.0 / float(self.fps)
+            except Exception:
+                dt = 1.0 / float(self.fps)
+            try:
+                await asyncio.sleep(0)
+            except Exception:
+                pass
+        self.running = False
+
+
+def get_manager(game):
+    """Return the game's SceneManager, creating one on first use."""
+    manager = getattr(game, 'scenes', None)
+    if manager is None:
+        manager = SceneManager(game, fps=getattr(game, 'FPS', 60))
+        try:
+            game.scenes = manager
+        except Exception:
+            pass
+    return manager
+
+
+def launch(game, name, factory, **kwargs):
+    """Push the registered scene called name, creating it with factory once.
+
+    Mini-game entry points use this so repeated visits reuse the same scene
+    instance instead of reloading its resources.
+    """
+    manager = get_manager(game)
+    scene = manager.get(name, factory)
+    if scene in manager.stack:
+        return True
+    manager.push(scene, **kwargs)
+    return True
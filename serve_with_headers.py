@@ -1,21 +1,366 @@
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import sys, os
+"""Serve the pygbag build with the headers the browser build needs.
+
+- COEP/COOP on every response, so WASM threads and SharedArrayBuffer
+  keep working.
+- One thread per connection, over HTTP/1.1 keep-alive, so the page, the
+  loader scripts and the .apk download in parallel.
+- Precompressed siblings: ``app.js.br`` or ``app.js.gz`` is sent for
+  ``app.js`` when the client accepts that encoding and the sibling is no
+  older than the file. Nothing is compressed per request. Write the
+  siblings once with ``--precompress`` (``.br`` needs the brotli module).
+- A strong ETag per representation, answering If-None-Match (and
+  If-Modified-Since) with 304.
+- Single byte ranges (``Range: bytes=a-b``) with 206/416, honouring
+  If-Range. Audio seeking relies on them.
+- Cache-Control: content-hashed names (``app.3f2a9c1d.js``) are
+  immutable for a year. So are ``path?v=<hash>`` URLs, the keys the
+  service worker precaches, when the hash matches the file's entry in
+  the build's asset-manifest.json. Everything else must revalidate,
+  which costs a 304 thanks to the ETag.
+
+    python serve_with_headers.py 8000
+    python serve_with_headers.py --dir dist/pygbag --precompress
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import argparse
+from functools import partial
+from urllib.parse import urlsplit, parse_qs
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build', 'web')
+
+# Encodings we look for on disk, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE = ('.html', '.js', '.mjs', '.css', '.json', '.wasm', '.py', '.txt', '.svg', '.tsv', '.map')
+MIN_COMPRESS_SIZE = 1024
+
+# name.<8+ hex>.ext or name-<8+ hex>.ext
+HASHED_NAME = re.compile(r'[.-][0-9a-f]{8,}\.[^/]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+# served file -> content hash, written by package_web
+ASSET_MANIFEST = 'asset-manifest.json'
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _etag(st, encoding=None):
+    tag = f'{st.st_mtime_ns:x}-{st.st_size:x}'
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def _accepts(header, encoding):
+    """True if the Accept-Encoding header allows encoding (q=0 refuses it)."""
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip().lower() in (encoding, '*'):
+            q = params.strip()
+            if q.startswith('q='):
+                try:
+                    return float(q[2:]) > 0
+                except ValueError:
+                    return False
+            return True
+    return False
+
+
+_manifests = {}
+
+
+def manifest_hashes(root):
+    """{posix path: content hash} from root's asset-manifest.json ({} if absent).
+
+    Re-read only when the manifest's mtime changes.
+    """
+    path = os.path.join(root, ASSET_MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != mtime:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                files = json.load(f).get('files', {})
+        except (OSError, ValueError, AttributeError):
+            files = {}
+        cached = _manifests[path] = (mtime, files)
+    return cached[1]
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single byte range, None to ignore, or 'unsatisfiable'."""
+    m = _RANGE.match((header or '').strip())
+    if not m:
+        # multiple ranges or another unit: send the whole file
+        return None
+    first, last = m.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range: the last N bytes
+        n = int(last)
+        if n == 0:
+            return 'unsatisfiable'
+        return max(0, size - n), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return 'unsatisfiable'
+    return start, end
+
 
 class COEPHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    extensions_map = dict(SimpleHTTPRequestHandler.extensions_map, **{
+        '.wasm': 'application/wasm',
+        '.js': 'text/javascript',
+        '.mjs': 'text/javascript',
+        '.apk': 'application/zip',
+        '.ogg': 'audio/ogg',
+        '.wav': 'audio/wav',
+        '.tsv': 'text/tab-separated-values',
+    })
+
     def end_headers(self):
         # Required headers for cross-origin WASM/CORP resources
         self.send_header('Cross-Origin-Embedder-Policy', 'require-corp')
         self.send_header('Cross-Origin-Opener-Policy', 'same-origin')
         SimpleHTTPRequestHandler.end_headers(self)
 
+    def log_message(self, fmt, *args):
+        if getattr(self.server, 'verbose', True):
+            SimpleHTTPRequestHandler.log_message(self, fmt, *args)
+
+    # --- selection -----------------------------------------------------------
+    def _select(self, path, st):
+        """Pick the representation of path: (file path, stat, encoding or None)."""
+        if path.endswith(COMPRESSIBLE):
+            accept = self.headers.get('Accept-Encoding')
+            for encoding, suffix in ENCODINGS:
+                if not _accepts(accept, encoding):
+                    continue
+                try:
+                    sib = os.stat(path + suffix)
+                except OSError:
+                    continue
+                if sib.st_mtime_ns >= st.st_mtime_ns:
+                    return path + suffix, sib, encoding
+        return path, st, None
+
+    def _not_modified(self, etag, st):
+        inm = self.headers.get('If-None-Match')
+        if inm is not None:
+            tags = [t.strip() for t in inm.split(',')]
+            return '*' in tags or etag in tags or ('W/' + etag) in tags
+        ims = self.headers.get('If-Modified-Since')
+        if ims:
+            try:
+                return int(st.st_mtime) <= parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+        return False
+
+    def _cache_control(self, path):
+        if HASHED_NAME.search(os.path.basename(path)):
+            return IMMUTABLE
+        version = parse_qs(urlsplit(self.path).query).get('v')
+        if version:
+            rel = os.path.relpath(path, self.directory).replace(os.sep, '/')
+            if manifest_hashes(self.directory).get(rel) == version[0]:
+                return IMMUTABLE
+        return REVALIDATE
+
+    # --- SimpleHTTPRequestHandler hooks --------------------------------------
+    def send_head(self):
+        # the connection is kept alive: never let a length from the previous
+        # request cut short this one's body (304/416, redirects, listings)
+        self._remaining = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, 'index.html')
+            if not os.path.isfile(index) or not self.path.split('?', 1)[0].endswith('/'):
+                # redirects and directory listings stay with the base class
+                return SimpleHTTPRequestHandler.send_head(self)
+            path = index
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+        ctype = self.guess_type(path)
+        served, st, encoding = self._select(path, st)
+        etag = _etag(st, encoding)
+        cache = self._cache_control(path)
+
+        def common():
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', formatdate(st.st_mtime, usegmt=True))
+            self.send_header('Cache-Control', cache)
+            self.send_header('Accept-Ranges', 'bytes')
+            if path.endswith(COMPRESSIBLE):
+                self.send_header('Vary', 'Accept-Encoding')
+
+        if self._not_modified(etag, st):
+            self.send_response(304)
+            common()
+            self.end_headers()
+            return None
+
+        rng = None
+        if 'Range' in self.headers:
+            if_range = self.headers.get('If-Range')
+            if if_range is None or if_range.strip() == etag:
+                rng = parse_range(self.headers['Range'], st.st_size)
+        if rng == 'unsatisfiable':
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{st.st_size}')
+            self.send_header('Content-Length', '0')
+            common()
+            self.end_headers()
+            return None
+
+        try:
+            f = open(served, 'rb')
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+        try:
+            if rng is None:
+                self.send_response(200)
+                self._remaining = st.st_size
+                self.send_header('Content-Length', str(st.st_size))
+            else:
+                start, end = rng
+                f.seek(start)
+                self._remaining = end - start + 1
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{st.st_size}')
+                self.send_header('Content-Length', str(self._remaining))
+            self.send_header('Content-Type', ctype)
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            common()
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def do_HEAD(self):
+        try:
+            SimpleHTTPRequestHandler.do_HEAD(self)
+        finally:
+            # no body was copied, so the length set by send_head is unused
+            self._remaining = None
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, '_remaining', None)
+        if remaining is None:
+            return SimpleHTTPRequestHandler.copyfile(self, source, outputfile)
+        self._remaining = None
+        while remaining > 0:
+            chunk = source.read(min(64 * 1024, remaining))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+
+
+def _brotli():
+    try:
+        import brotli  # type: ignore
+        return brotli
+    except Exception:
+        return None
+
+
+def precompress(root, force=False):
+    """Write .gz (and .br if brotli is installed) next to compressible files.
+
+    Siblings newer than their file are left alone unless force is set,
+    and ones that save nothing are removed. Returns (written, bytes saved).
+    """
+    brotli = _brotli()
+    written, saved = 0, 0
+    for dirpath, _dirs, names in os.walk(root):
+        for name in names:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(dirpath, name)
+            st = os.stat(path)
+            if st.st_size < MIN_COMPRESS_SIZE:
+                continue
+            encoders = [('.gz', lambda data: gzip.compress(data, 9, mtime=0))]
+            if brotli is not None:
+                encoders.append(('.br', lambda data: brotli.compress(data, quality=11)))
+            data = None
+            for suffix, compress in encoders:
+                out = path + suffix
+                try:
+                    if not force and os.stat(out).st_mtime_ns >= st.st_mtime_ns:
+                        continue
+                except OSError:
+                    pass
+                if data is None:
+                    with open(path, 'rb') as fh:
+                        data = fh.read()
+                packed = compress(data)
+                if len(packed) >= len(data):
+                    if os.path.exists(out):
+                        os.remove(out)
+                    continue
+                with open(out, 'wb') as fh:
+                    fh.write(packed)
+                written += 1
+                saved += len(data) - len(packed)
+    return written, saved
+
+
+def make_server(directory=DEFAULT_ROOT, host='0.0.0.0', port=8000, verbose=True):
+    """Return the threaded server for directory (port 0 picks a free one)."""
+    server = ThreadingHTTPServer((host, port), partial(COEPHandler, directory=directory))
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def start(directory, host='127.0.0.1', port=0, verbose=False):
+    """Serve in a daemon thread; returns (server, base_url). Call server.shutdown()."""
+    import threading
+    server = make_server(directory, host, port, verbose)
+    threading.Thread(target=server.serve_forever, name='web-server', daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f'http://{host}:{port}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('port', nargs='?', type=int, default=8000)
+    parser.add_argument('--dir', default=DEFAULT_ROOT, help='directory to serve (default build/web)')
+    parser.add_argument('--bind', default='0.0.0.0')
+    parser.add_argument('--precompress', action='store_true', help='write .gz/.br siblings before serving')
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.dir):
+        print(f'{args.dir} not found; run python -m pygbag --build . first')
+        return 1
+    if args.precompress:
+        written, saved = precompress(args.dir)
+        print(f'Precompressed {written} files ({saved / 1e6:.2f} MB saved)'
+              + ('' if _brotli() else '; install brotli for .br'))
+    server = make_server(args.dir, args.bind, args.port)
+    print(f'Serving {args.dir} on port {server.server_address[1]} with COEP/COOP headers')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
 if __name__ == '__main__':
-    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
-    webroot = os.path.join(os.path.dirname(__file__), 'build', 'web')
-    if os.path.isdir(webroot):
-        os.chdir(webroot)
-    else:
-        print('build/web not found; run python -m pygbag --build . first')
-        sys.exit(1)
-    server = HTTPServer(('0.0.0.0', port), COEPHandler)
-    print(f'Serving {os.getcwd()} on port {port} with COEP/COOP headers')
-    server.serve_forever()
+    sys.exit(main())
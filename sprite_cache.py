@@ -0,0 +1,119 @@
+"""On-disk cache of processed sprite pixels.
+
+The PIL sprite pipeline in resources.py (trim, LANCZOS thumbnail, alpha
+fix-up) is the slowest part of a cold start. Its output is stored here as
+raw RGBA bytes so a warm start reads the buffer and hands it to
+`pygame.image.frombuffer` without touching PIL.
+
+Entries are keyed by source path, source mtime and size, target size and
+PROCESS_VERSION; bump PROCESS_VERSION whenever the pipeline's output
+changes. Set MANGO_SPRITE_CACHE=0 to disable, MANGO_CACHE_DIR to move it.
+Disabled in the browser, where the filesystem does not persist.
+"""
+import os
+import sys
+import hashlib
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+# Version of the sprite processing pipeline baked into every cache key
+PROCESS_VERSION = 1
+
+DEFAULT_DIR = os.path.join('cache', 'sprites')
+
+stats = {'hits': 0, 'misses': 0, 'writes': 0, 'errors': 0}
+
+
+def enabled():
+    return not IS_WASM and os.environ.get('MANGO_SPRITE_CACHE', '1') != '0'
+
+
+def cache_dir():
+    return os.environ.get('MANGO_CACHE_DIR') or DEFAULT_DIR
+
+
+def _prefix(path):
+    # readable name plus a hash of the full path, so pruning stale entries
+    # never touches another source that shares the basename
+    base = os.path.splitext(os.path.basename(path))[0]
+    base = ''.join(c if c.isalnum() or c in '-_' else '_' for c in base)
+    source = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+    return f'{base}-{source}'
+
+
+def cache_path(path, size):
+    """Return the cache file for path processed to size, or None if path is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = '|'.join([
+        os.path.abspath(path), str(st.st_mtime_ns), str(st.st_size),
+        f'{size[0]}x{size[1]}', f'v{PROCESS_VERSION}',
+    ])
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir(), f'{_prefix(path)}-{size[0]}x{size[1]}-{digest}.rgba')
+
+
+def read(path, size):
+    """Return cached RGBA bytes for path at size, or None on a miss."""
+    if not enabled():
+        return None
+    cp = cache_path(path, size)
+    if cp is None:
+        return None
+    try:
+        with open(cp, 'rb') as f:
+            data = f.read()
+    except OSError:
+        stats['misses'] += 1
+        return None
+    if len(data) != size[0] * size[1] * 4:
+        # truncated or foreign file; rebuild it
+        stats['misses'] += 1
+        return None
+    stats['hits'] += 1
+    return data
+
+
+def write(path, size, data):
+    """Store RGBA bytes for path at size and prune older entries for it."""
+    if not enabled():
+        return False
+    cp = cache_path(path, size)
+    if cp is None:
+        return False
+    try:
+        d = os.path.dirname(cp)
+        os.makedirs(d, exist_ok=True)
+        tmp = cp + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, cp)
+        stats['writes'] += 1
+    except OSError:
+        stats['errors'] += 1
+        return False
+    # drop entries made from an older version of the same source at this size
+    stale_prefix = f'{_prefix(path)}-{size[0]}x{size[1]}-'
+    try:
+        for name in os.listdir(d):
+            if name.startswith(stale_prefix) and os.path.join(d, name) != cp:
+                try:
+                    os.remove(os.path.join(d, name))
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return True
+
+
+def clear():
+    """Delete every cached sprite."""
+    d = cache_dir()
+    try:
+        for name in os.listdir(d):
+            if name.endswith('.rgba'):
+                os.remove(os.path.join(d, name))
+    except OSError:
+        pass
@@ -0,0 +1,192 @@
+"""Startup phase timing.
+
+`PhaseTimer` records how long each startup phase takes (pygame init,
+set_mode, fonts, database, audio, each preloaded asset) using
+`time.perf_counter`, plus marks such as the first presented frame. The
+game keeps one as ``game.startup`` and exposes ``game.startup_timings``.
+
+Set ``MANGO_STARTUP_JSON=<path>`` to append one JSON record per start to
+that file. Each start is labelled from the sprite disk cache (see
+sprite_cache.py):
+- "cold" if any sprite had to go through PIL;
+- "warm" if every sprite came from the cache;
+- "unknown" if the cache was not consulted (disabled, or in the browser).
+
+The label cannot see the OS file cache. When comparing starts after a
+reboot or a dropped page cache, set ``MANGO_START_KIND`` to label them
+yourself. In dev mode (F3) the timings are drawn in the corner of the
+screen.
+
+In the browser every mark is also published as a User Timing mark
+(``performance.mark('mango:<name>')``), so perf_harness.py can read it
+on the page's clock; `browser_mark` does the same for scene changes.
+"""
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+import constants
+import sprite_cache
+from mango_log import get_logger
+
+IS_WASM = sys.platform == 'emscripten' or hasattr(sys, '_emscripten_info')
+
+
+def browser_mark(name):
+    """Add a 'mango:<name>' User Timing mark to the page (web builds only)."""
+    if not IS_WASM:
+        return
+    try:
+        import platform
+        platform.window.performance.mark('mango:' + name)
+    except Exception:
+        pass
+
+
+class PhaseTimer:
+    """Collect named phase durations and time-since-start marks (ms)."""
+
+    def __init__(self, start=None):
+        self.t0 = time.perf_counter() if start is None else start
+        self._last = self.t0
+        self.phases = {}
+        self.marks = {}
+        self.finished = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with-block as phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def lap(self, name):
+        """Record the time since the previous lap (or start) as phase name.
+
+        Lets a long sequential constructor be split into phases without
+        re-indenting it into with-blocks.
+        """
+        now = time.perf_counter()
+        self.record(name, now - self._last)
+        self._last = now
+
+    def record(self, name, seconds):
+        with self._lock:
+            # repeated phases (e.g. a retried loader) accumulate
+            self.phases[name] = self.phases.get(name, 0.0) + seconds * 1000.0
+
+    def mark(self, name):
+        """Record the time since start for name, once."""
+        with self._lock:
+            if name in self.marks:
+                return
+            self.marks[name] = (time.perf_counter() - self.t0) * 1000.0
+        browser_mark(name)
+
+    def as_dict(self):
+        """Return phases, grouped totals and marks, all in milliseconds."""
+        with self._lock:
+            phases = dict(self.phases)
+            marks = dict(self.marks)
+        groups = {}
+        for name, ms in phases.items():
+            if ':' in name:
+                group = name.split(':', 1)[0]
+                groups[group] = groups.get(group, 0.0) + ms
+        return {
+            'phases': {k: round(v, 2) for k, v in phases.items()},
+            'groups': {k: round(v, 2) for k, v in groups.items()},
+            'marks': {k: round(v, 2) for k, v in marks.items()},
+            'total_ms': round(sum(phases.values()), 2),
+        }
+
+    def finish(self, path=None):
+        """Mark startup as complete and append a JSON record if configured."""
+        self.mark('ready')
+        if self.finished:
+            return None
+        self.finished = True
+        path = path or os.environ.get('MANGO_STARTUP_JSON')
+        if not path:
+            return None
+        try:
+            return write_record(self.as_dict(), path)
+        except Exception as e:
+            get_logger('game').warning('could not write %s: %s', path, e)
+            return None
+
+
+def start_kind(stats=None):
+    """'cold', 'warm' or 'unknown' from the sprite disk cache's hits and misses."""
+    kind = os.environ.get('MANGO_START_KIND')
+    if kind:
+        return kind
+    stats = sprite_cache.stats if stats is None else stats
+    if stats.get('misses'):
+        return 'cold'
+    if stats.get('hits'):
+        return 'warm'
+    return 'unknown'
+
+
+def write_record(timings, path):
+    """Append one start record (JSON line) to path and return it."""
+    record = dict(timings)
+    record.update({
+        'version': getattr(constants, 'VERSION', 'dev'),
+        'start': start_kind(),
+        'sprite_cache': dict(sprite_cache.stats),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'platform': sys.platform,
+    })
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+    return record
+
+
+def overlay_lines(timings, limit=12):
+    """Return short text lines summarising timings for the dev overlay."""
+    lines = [f"startup {timings['marks'].get('ready', 0):.0f} ms to ready"]
+    if 'first_frame' in timings['marks']:
+        lines.append(f"first frame {timings['marks']['first_frame']:.0f} ms")
+    rows = [(k, v) for k, v in timings['phases'].items() if ':' not in k]
+    rows += list(timings['groups'].items())
+    rows.sort(key=lambda kv: kv[1], reverse=True)
+    for name, ms in rows[:limit]:
+        lines.append(f"{name}: {ms:.1f} ms")
+    return lines
+
+
+def draw_overlay(game, surface):
+    """Draw the startup timings in the top-right corner (dev mode)."""
+    timer = getattr(game, 'startup', None)
+    font = getattr(game, 'tiny_font', None)
+    if timer is None or font is None:
+        return
+    try:
+        lines = overlay_lines(timer.as_dict())
+        w = 230
+        h = 8 + 16 * len(lines)
+        x = surface.get_width() - w - 8
+        box = pygame.Surface((w, h), pygame.SRCALPHA)
+        box.fill((20, 20, 20, 180))
+        surface.blit(box, (x, 8))
+        for i, ln in enumerate(lines):
+            txt = font.render(ln, True, (220, 220, 220))
+            surface.blit(txt, (x + 8, 12 + i * 16))
+    except Exception:
+        pass
@@ -0,0 +1,143 @@
+"""Procedural sound effects built in memory.
+
+Placeholder SFX, placeholder music and debug tones used to be written to
+WAV files one frame at a time and read back. This module computes the
+samples in one vectorized pass (NumPy when it is installed, the stdlib
+`array` module otherwise), returns raw 16-bit PCM in the mixer's format
+and hands it to ``pygame.mixer.Sound(buffer=...)``. Both the PCM and the
+Sound objects are memoized by their parameters, so asking for the same
+tone again costs a dict lookup and nothing touches the disk.
+
+    snd = synth.sound('tone', freq=800, duration_ms=300, volume=1.0)
+    snd = synth.sound('thump', duration_ms=260)
+    snd = synth.sound('chirp', f0=1800, f1=3200, duration_ms=180)
+"""
+import io
+import math
+import functools
+from array import array
+
+try:
+    import pygame
+except Exception:
+    pygame = None
+
+from resources import get_resources
+
+# Mixer format assumed when the mixer is not initialized yet
+DEFAULT_FORMAT = (44100, -16, 2)
+
+# NumPy is optional and imported on first use (see _numpy)
+_NUMPY = False
+
+
+def _numpy():
+    global _NUMPY
+    if _NUMPY is False:
+        try:
+            import numpy
+            _NUMPY = numpy
+        except Exception:
+            _NUMPY = None
+    return _NUMPY
+
+
+# Waveforms take m (numpy or math), t (seconds), x (0..1 position in the
+# sound) and the parameters; with numpy t and x are whole arrays, with math
+# they are scalars, so one definition serves both paths.
+def _tone(m, t, x, freq=800.0):
+    return m.sin(2 * m.pi * freq * t)
+
+
+def _thump(m, t, x, freq=120.0):
+    # low sine with a linear decay
+    return (1.0 - x) * m.sin(2 * m.pi * freq * t)
+
+
+def _chirp(m, t, x, f0=1800.0, f1=3200.0, duration=0.18):
+    # linear sweep f0 -> f1 under a half-sine envelope (no clicks at the ends)
+    phase = 2 * m.pi * (f0 * t + (f1 - f0) * t * t / (2.0 * duration))
+    return m.sin(m.pi * x) * m.sin(phase)
+
+
+WAVEFORMS = {
+    'tone': _tone,
+    'thump': _thump,
+    'chirp': _chirp,
+}
+
+
+def mixer_format():
+    """Return (frequency, size, channels) of the mixer, or DEFAULT_FORMAT."""
+    try:
+        init = pygame.mixer.get_init()
+        if init:
+            return tuple(init)
+    except Exception:
+        pass
+    return DEFAULT_FORMAT
+
+
+# small: the decoded Sounds are cached by sound(), this mostly serves wav_bytes
+@functools.lru_cache(maxsize=16)
+def pcm(kind, duration_ms, volume=1.0, rate=44100, channels=2, **params):
+    """Return interleaved signed 16-bit native-endian PCM bytes for a sound.
+
+    Memoized: the same arguments return the same bytes object.
+    """
+    fn = WAVEFORMS[kind]
+    if kind == 'chirp':
+        params.setdefault('duration', duration_ms / 1000.0)
+    n = max(1, int(rate * duration_ms / 1000))
+    amp = 32767 * max(0.0, min(1.0, volume))
+    np = _numpy()
+    if np is not None:
+        i = np.arange(n, dtype=np.float64)
+        mono = fn(np, i / rate, i / n, **params) * amp
+        return np.repeat(mono.astype(np.int16), channels).tobytes()
+
+    mono = array('h', (int(amp * fn(math, i / rate, i / n, **params)) for i in range(n)))
+    if channels == 1:
+        return mono.tobytes()
+    out = array('h', bytes(2 * n * channels))
+    for c in range(channels):
+        out[c::channels] = mono
+    return out.tobytes()
+
+
+def wav_bytes(kind, duration_ms, volume=1.0, rate=44100, channels=2, **params):
+    """Return a complete 16-bit WAV file for a sound (for tools that want files)."""
+    import wave
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm(kind, duration_ms, volume, rate, channels, **params))
+    return buf.getvalue()
+
+
+def sound(kind, duration_ms=300, volume=1.0, owner='audio', resources=None, **params):
+    """Return a memoized mixer.Sound for a procedural sound, or None.
+
+    The Sound is cached in the game's ResourceManager (kind 'sound') so it
+    is shared and counted like any loaded effect. Returns None when the
+    mixer is not running or does not use 16-bit samples.
+    """
+    if not pygame:
+        return None
+    try:
+        if not pygame.mixer.get_init():
+            return None
+    except Exception:
+        return None
+    rate, size, channels = mixer_format()
+    if size != -16:
+        return None
+    args = (kind, int(duration_ms), round(float(volume), 3), rate, channels)
+    extra = tuple(sorted((k, round(float(v), 3)) for k, v in params.items()))
+
+    def load():
+        return pygame.mixer.Sound(buffer=pcm(*args, **dict(extra)))
+    res = resources if resources is not None else get_resources()
+    return res.get(('synth',) + args + extra, load, owner, 'sound')
@@ -0,0 +1,145 @@
+import sys
+import os
+import time
+import threading
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from api import APIHandler, StaleWhileRevalidate, Provider, HttpWeather, HttpFact, get_executor
+import api_stub_server
+
+
+class _Gate(Provider):
+    """Blocks in fetch until released, so tests control when refreshes land."""
+    name = 'gate'
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def fetch(self, timeout):
+        self.calls += 1
+        self.release.wait(2)
+        return f'v{self.calls}'
+
+
+def _wait(cond, limit=2.0):
+    end = time.time() + limit
+    while not cond() and time.time() < end:
+        time.sleep(0.01)
+    return cond()
+
+
+def test_stale_value_is_served_while_refreshing():
+    now = [0.0]
+    prov = _Gate()
+    cache = StaleWhileRevalidate(prov, ttl=10, fallback='none', timeout=5,
+                                 executor=get_executor(), clock=lambda: now[0])
+    # first call returns the fallback at once and starts one fetch
+    assert cache.get() == 'none' and cache.get() == 'none'
+    prov.release.set()
+    assert _wait(lambda: cache.value == 'v1')
+    assert prov.calls == 1
+
+    prov.release.clear()
+    now[0] = 11.0
+    assert cache.get() == 'v1'  # stale, refresh running in the background
+    assert cache.refreshing
+    # a refresh that outlives the timeout is abandoned; its result is ignored
+    now[0] = 17.0
+    assert cache.get() == 'v1'
+    assert cache.stats['timeouts'] == 1 and not cache.refreshing
+    prov.release.set()
+    time.sleep(0.05)
+    assert cache.value == 'v1'
+
+
+def test_handler_reads_from_local_stub_server():
+    server, url = api_stub_server.start(seed=1)
+    try:
+        handler = APIHandler(HttpWeather(url + '/weather'), HttpFact(url + '/fact'))
+        assert handler.get_weather_mood_effect() == 0  # nothing fetched yet
+        handler.get_bird_fact()
+        assert _wait(lambda: handler.weather_data is not None and handler.bird_fact is not None)
+        assert handler.get_weather()['condition'] in ('sunny', 'cloudy', 'rainy', 'stormy', 'snowy')
+        assert handler.get_bird_fact() == handler.bird_fact
+        assert server.requests == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_failed_refresh_keeps_value_and_backs_off():
+    now = [0.0]
+
+    class Flaky(Provider):
+        inline = True
+        ok = True
+
+        def fetch(self, timeout):
+            if not self.ok:
+                raise OSError('down')
+            return 'fresh'
+
+    prov = Flaky()
+    cache = StaleWhileRevalidate(prov, ttl=60, clock=lambda: now[0])
+    assert cache.get() == 'fresh'
+    prov.ok = False
+    now[0] = 61.0
+    assert cache.get() == 'fresh'
+    assert cache.stats['errors'] == 1
+    # no retry until the back-off has passed
+    now[0] = 62.0
+    cache.get()
+    assert cache.stats['errors'] == 1
+    prov.ok = True
+    now[0] = 61.0 + 15.0
+    cache.get()
+    assert cache.stats['refreshes'] == 2
+
+
+def test_disk_cache_seeds_startup_and_revalidates(tmp_path):
+    from http_cache import ResponseCache
+    server, url = api_stub_server.start(seed=2)
+    try:
+        cache = ResponseCache(str(tmp_path / 'http_cache'))
+        first = APIHandler(HttpWeather(url + '/weather', cache=cache), HttpFact(url + '/fact', cache=cache))
+        first.get_weather()
+        first.get_bird_fact()
+        assert _wait(lambda: first.weather_data is not None and first.bird_fact is not None)
+        assert cache.stats()['entries'] == 2
+
+        # a new handler (next launch) has the values before any request
+        fact = HttpFact(url + '/fact', cache=cache)
+        second = APIHandler(HttpWeather(url + '/weather', cache=cache), fact)
+        assert second.bird_fact == first.bird_fact
+        assert second.get_weather() == first.weather_data
+        assert server.requests == 2
+
+        # once stale, the refresh is a conditional request answered with 304
+        second.bird_fact_update_interval = 0
+        second.facts.updated_at -= 1
+        assert second.get_bird_fact() == first.bird_fact
+        assert _wait(lambda: second.facts.stats['refreshes'] == 1)
+        assert server.not_modified == 1 and second.bird_fact == first.bird_fact
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_response_cache_limits(tmp_path):
+    from http_cache import ResponseCache
+    now = [1000.0]
+    cache = ResponseCache(str(tmp_path), max_bytes=400, max_entries=3, max_age=100,
+                          clock=lambda: now[0])
+    assert cache.put('http://x/big', 'x' * 500) is None
+    for i in range(4):
+        now[0] += 1
+        cache.put(f'http://x/{i}', '{"fact": "f"}', etag=f'"e{i}"')
+    # oldest entry pruned to stay within max_entries
+    assert cache.get('http://x/0') is None
+    assert cache.conditional_headers(cache.get('http://x/3')) == {'If-None-Match': '"e3"'}
+    now[0] += 101
+    assert cache.get('http://x/3') is None
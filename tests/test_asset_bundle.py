@@ -0,0 +1,103 @@
+import sys
+import os
+import struct
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+import asset_bundle
+from asset_bundle import AssetBundle, BundleError, build
+from resources import _wav_pcm
+
+
+def _make_tree(tmp_path):
+    (tmp_path / 'assets' / 'sprites').mkdir(parents=True)
+    (tmp_path / 'assets' / 'sounds').mkdir()
+    (tmp_path / 'assets' / 'sprites' / 'seed.png').write_bytes(b'\x89PNG seed')
+    (tmp_path / 'assets' / 'sounds' / 'chirp.wav').write_bytes(b'RIFF chirp data')
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_build_and_read(tmp_path, monkeypatch, use_mmap):
+    _make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    assert build('assets', 'assets.bundle') == 2
+    bundle = AssetBundle('assets.bundle', use_mmap=use_mmap)
+    assert bundle.names() == ['assets/sounds/chirp.wav', 'assets/sprites/seed.png']
+    assert './assets/sprites/seed.png' in bundle
+    view = bundle.view('assets/sprites/seed.png')
+    assert isinstance(view, memoryview)
+    assert bytes(view) == b'\x89PNG seed'
+    # entries are aligned for direct buffer use
+    assert all(off % asset_bundle.ALIGN == 0 for off, _ in bundle.index.values())
+    reader = bundle.open('assets/sounds/chirp.wav')
+    assert reader.read(4) == b'RIFF'
+    reader.seek(0)
+    assert reader.read() == b'RIFF chirp data'
+    del view, reader
+    bundle.close()
+
+
+def test_rejects_foreign_file(tmp_path):
+    p = tmp_path / 'bad.bundle'
+    p.write_bytes(b'not a bundle at all')
+    with pytest.raises(BundleError):
+        AssetBundle(str(p), use_mmap=False)
+
+
+def test_exists_falls_back_to_disk(tmp_path, monkeypatch):
+    _make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    build('assets', 'assets.bundle')
+    os.remove('assets/sprites/seed.png')
+    monkeypatch.setenv('MANGO_ASSET_BUNDLE', 'assets.bundle')
+    asset_bundle.reset()
+    try:
+        assert asset_bundle.exists('assets/sprites/seed.png')
+        assert asset_bundle.exists('assets/sounds/chirp.wav')
+        assert not asset_bundle.exists('assets/sprites/missing.png')
+        assert asset_bundle.open_asset('assets/sprites/seed.png').read() == b'\x89PNG seed'
+    finally:
+        asset_bundle.reset()
+
+
+def test_files_edited_after_the_bundle_are_read_from_disk(tmp_path, monkeypatch):
+    _make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    build('assets', 'assets.bundle')
+    seed = tmp_path / 'assets' / 'sprites' / 'seed.png'
+    seed.write_bytes(b'\x89PNG edited')
+    later = os.path.getmtime('assets.bundle') + 10
+    os.utime(seed, (later, later))
+    monkeypatch.setenv('MANGO_ASSET_BUNDLE', 'assets.bundle')
+    asset_bundle.reset()
+    try:
+        assert asset_bundle.bundle_for('assets/sprites/seed.png') is None
+        assert asset_bundle.open_asset('assets/sprites/seed.png').read() == b'\x89PNG edited'
+        # untouched files still come from the bundle
+        assert asset_bundle.bundle_for('assets/sounds/chirp.wav') is asset_bundle.get_bundle()
+    finally:
+        asset_bundle.reset()
+
+
+def test_build_names_entries_relative_to_base(tmp_path):
+    _make_tree(tmp_path)
+    out = str(tmp_path / 'out.bundle')
+    assert build('assets', out, base=str(tmp_path)) == 2
+    bundle = AssetBundle(out)
+    assert bundle.names() == ['assets/sounds/chirp.wav', 'assets/sprites/seed.png']
+    bundle.close()
+
+
+def test_wav_pcm_slice():
+    pcm = b'\x01\x00\x02\x00'
+    fmt = struct.pack('<HHIIHH', 1, 1, 22050, 44100, 2, 16)
+    wav = (b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + len(pcm)) + b'WAVE'
+           + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+           + b'data' + struct.pack('<I', len(pcm)) + pcm)
+    data, rate, width, channels = _wav_pcm(memoryview(wav))
+    assert bytes(data) == pcm
+    assert (rate, width, channels) == (22050, 2, 1)
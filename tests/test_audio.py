@@ -0,0 +1,142 @@
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import asset_bundle
+from audio import SoundRegistry
+from resources import ResourceManager
+
+
+def _registry(tmp_path, monkeypatch, budget=10000):
+    monkeypatch.setenv('MANGO_ASSET_BUNDLE', '0')
+    asset_bundle.reset()
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        # stands in for a decoded Sound; the cache measures its length
+        return bytearray(os.path.getsize(path))
+
+    for name, size in (('flap.wav', 100), ('home.wav', 3000)):
+        (tmp_path / name).write_bytes(b'\0' * size)
+    return SoundRegistry(ResourceManager(budget), loader=loader), calls
+
+
+def test_sounds_decode_once_and_are_shared(tmp_path, monkeypatch):
+    reg, calls = _registry(tmp_path, monkeypatch)
+    flap = str(tmp_path / 'flap.wav')
+    a = reg.get(flap)
+    b = reg.resources.sound(flap, owner='flappy', loader=reg.loader)
+    assert a is b
+    assert calls == [flap]
+    assert reg.get(str(tmp_path / 'missing.wav')) is None
+
+
+def test_music_accounting_release_and_unload(tmp_path, monkeypatch):
+    reg, calls = _registry(tmp_path, monkeypatch)
+    home = str(tmp_path / 'home.wav')
+    reg.get(str(tmp_path / 'flap.wav'))
+    reg.music(home)
+    mem = reg.memory()
+    assert mem['sound'] == {'count': 1, 'bytes': 100}
+    assert mem['music'] == {'count': 1, 'bytes': 3000}
+
+    # released music stays cached until the budget needs the room
+    reg.release(home)
+    assert reg.loaded(home, kind='music')
+    reg.resources.set_budget(1000)
+    assert not reg.loaded(home, kind='music')
+
+    reg.resources.set_budget(10000)
+    reg.music(home)
+    assert reg.unload(home) == 3000
+    assert reg.memory()['music']['bytes'] == 0
+    assert len(calls) == 3
+
+
+class _Clip:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def get_length(self):
+        return self.seconds
+
+
+def _allocator(n):
+    from audio import VoiceAllocator
+    now = [0.0]
+    return VoiceAllocator([f'ch{i}' for i in range(n)], clock=lambda: now[0]), now
+
+
+def test_voice_polyphony_retriggers_oldest():
+    voices, now = _allocator(8)
+    clip = _Clip(1.0)
+    got = [voices.allocate('chirp', clip) for _ in range(4)]
+    # chirp is limited to 3 voices: the 4th reuses the first one
+    assert got[3] == got[0]
+    assert voices.stats()['busy'] == 3
+
+
+def test_voice_stealing_respects_priority():
+    voices, now = _allocator(2)
+    long_clip = _Clip(5.0)
+    a = voices.allocate('chirp', long_clip)
+    b = voices.allocate('chirp', long_clip)
+    # thump outranks chirp and steals the oldest chirp voice
+    assert voices.allocate('thump', long_clip) == a
+    voices.allocate('medicine', long_clip)
+    # a chirp cannot take a voice from thump or medicine
+    assert voices.allocate('chirp', long_clip) is None
+    assert voices.stolen == 2 and voices.dropped == 1
+    # once the sounds have finished their voices are free again
+    now[0] = 6.0
+    assert voices.allocate('chirp', _Clip(0.1)) in (a, b)
+    assert voices.stats()['busy'] == 1
+
+
+def test_sfx_limiter_coalesces_cools_down_and_budgets():
+    from audio import SfxLimiter, PLAY, COALESCED, DROPPED
+    now = [0.0]
+    limits = {'chirp': (0.15, 0.10, 0.0), 'flap': (0.0, 0.0, 0.0)}
+    lim = SfxLimiter(limits, frame_budget=2, clock=lambda: now[0])
+    assert lim.admit('chirp') == (PLAY, 1.0)
+    now[0] = 0.05
+    assert lim.admit('chirp')[0] == COALESCED
+    now[0] = 0.12
+    assert lim.admit('chirp')[0] == DROPPED
+    # chirp used one of the two plays this frame
+    assert lim.admit('flap')[0] == PLAY
+    assert lim.admit('flap')[0] == DROPPED
+    lim.end_frame()
+    assert lim.admit('flap')[0] == PLAY
+    stats = lim.stats()
+    assert (stats[PLAY], stats[COALESCED], stats[DROPPED]) == (3, 1, 2)
+    assert stats['by_key']['chirp'][COALESCED] == 1
+
+
+def test_music_end_event_restarts_watched_track():
+    from types import SimpleNamespace
+    from audio import AudioManager
+    owner = SimpleNamespace(music_volume=1.0, master_volume=1.0, sfx_volume=1.0)
+    audio = AudioManager(owner)
+    restarted = []
+    audio.play_music = restarted.append
+    audio._end_event = 4242
+    audio._events_armed = True
+    audio.start_watchdog('forest')
+    owner._music_playing = 'forest'
+
+    assert not audio.handle_event(SimpleNamespace(type=1))
+    assert audio.handle_event(SimpleNamespace(type=4242))
+    assert restarted == ['forest']
+    # an intentional stop clears _music_playing, so its end event is ignored
+    owner._music_playing = None
+    audio.handle_event(SimpleNamespace(type=4242))
+    assert restarted == ['forest']
+    # while end events are armed the polling watchdog does nothing
+    owner._music_playing = 'forest'
+    audio.watchdog_tick()
+    assert restarted == ['forest']
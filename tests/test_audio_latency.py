@@ -0,0 +1,73 @@
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import audio_latency
+from audio_latency import LatencyProbe, Histogram
+from mango_log import get_logger, WARNING
+
+
+class _Channel:
+    """Goes busy `start` seconds after play and idle `length + lag` later."""
+
+    def __init__(self, now, start, lag):
+        self.now, self.start, self.lag = now, start, lag
+        self.played_at = None
+
+    def play(self, length):
+        self.played_at, self.length = self.now[0], length
+
+    def get_busy(self):
+        t = self.now[0] - self.played_at
+        return self.start <= t < self.length + self.lag
+
+
+class _Sound:
+    def get_length(self):
+        return 0.05
+
+
+def test_presets_resolve_from_env(monkeypatch):
+    monkeypatch.setenv('MANGO_MIXER_PRESET', 'LOW')
+    assert audio_latency.preset_name() == 'low'
+    assert audio_latency.get_preset()['buffer'] == 256
+    monkeypatch.setenv('MANGO_MIXER_PRESET', 'nope')
+    log = get_logger('audio')
+    monkeypatch.setattr(log, 'level', WARNING)
+    assert audio_latency.preset_name() == audio_latency.DEFAULT_PRESET
+    assert "'nope'" in log.ring[-1][2]
+    assert abs(audio_latency.buffer_ms(audio_latency.PRESETS['safe']) - 23.2) < 0.1
+
+
+def test_histogram_buckets_and_percentiles():
+    h = Histogram(edges=(1, 10))
+    for ms in (0.5, 5, 5, 50):
+        h.add(ms)
+    s = h.summary()
+    assert s['buckets'] == {'<=1': 1, '<=10': 2, '>10': 1}
+    assert s['p50'] == 5 and s['max'] == 50
+
+
+def test_probe_times_input_play_busy_and_end():
+    now = [0.0]
+    probe = LatencyProbe(clock=lambda: now[0])
+    ch = _Channel(now, start=0.004, lag=0.012)
+    probe.input()
+    now[0] = 0.010
+    ch.play(0.05)
+    probe.played('flap', ch, _Sound())
+    while probe.watching:
+        probe.poll()
+        now[0] += 0.001
+    rep = probe.report()
+    assert abs(rep['input_to_play']['p50'] - 10) < 1e-6
+    assert 3.5 < rep['play_to_busy']['p50'] < 5.5
+    assert 11 < rep['end_lag']['p50'] < 13.5
+    # a play with no recent input only counts the channel metrics
+    now[0] += 1.0
+    ch.play(0.05)
+    probe.played('flap', ch, _Sound())
+    assert rep['input_to_play']['count'] == probe.report()['input_to_play']['count']
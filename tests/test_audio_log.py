@@ -0,0 +1,56 @@
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import audio_log
+from audio_log import AudioLog
+
+
+def test_levels_ring_buffer_and_verbose():
+    log = AudioLog('warning', ring_size=3)
+    log.debug('hidden %s', 1)
+    assert not log.ring
+    for i in range(5):
+        log.warning('w%d', i)
+    assert [r[2] for r in log.ring] == ['w2', 'w3', 'w4']
+    assert log.tail(1)[0].endswith('WARNING w4')
+
+    log.set_verbose(True)
+    log.debug('shown')
+    log.set_verbose(False)
+    log.debug('hidden again')
+    assert log.ring[-1][2] == 'shown'
+    assert log.level == audio_log.WARNING
+
+
+def test_batched_flush_rotates(tmp_path):
+    path = str(tmp_path / 'audio.log')
+    log = AudioLog('info', path, max_bytes=200, backups=1, flush_interval=60)
+    for i in range(10):
+        log.info('line %02d %s', i, 'x' * 20)
+    assert not os.path.exists(path)
+    assert log.flush() == 10
+    log.info('after rotation')
+    log.flush()
+    assert os.path.exists(path + '.1')
+    with open(path) as f:
+        assert f.read().strip().endswith('INFO after rotation')
+
+
+def test_file_sink_only_when_asked_for(monkeypatch):
+    import mango_log
+    monkeypatch.setattr(audio_log, 'IS_WASM', False)
+    for var in ('MANGO_AUDIO_LOG', 'MANGO_AUDIO_LOG_FILE', 'MANGO_DEBUG'):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(audio_log, '_log', None)
+    mango_log.reset()
+    assert audio_log.get_log().path is None
+
+    monkeypatch.setenv('MANGO_AUDIO_LOG', 'debug')
+    monkeypatch.setattr(audio_log, '_log', None)
+    assert audio_log.get_log().path == audio_log.DEFAULT_FILE
+    monkeypatch.setattr(audio_log, '_log', None)
+    mango_log.reset()
@@ -0,0 +1,67 @@
+import sys
+import os
+import random
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import asset_bundle
+from fact_corpus import FactCorpus, ShuffleBag, build_index
+
+
+def _corpus(tmp_path, monkeypatch, n=50, index=True):
+    monkeypatch.setenv('MANGO_ASSET_BUNDLE', '0')
+    asset_bundle.reset()
+    lines = ['# comment', '']
+    for i in range(n):
+        tags = ['species'] if i % 2 else ['behavior']
+        if i % 5 == 0:
+            tags.append('care')
+        lines.append(f"{','.join(tags)}\tfact {i} ✓")
+    path = tmp_path / 'facts.en.tsv'
+    path.write_text('\r\n'.join(lines) + '\n', encoding='utf-8')
+    if index:
+        assert build_index(str(path)) == n
+    return FactCorpus(str(path), rng=random.Random(3))
+
+
+def test_shuffle_bag_visits_everything_before_repeating():
+    bag = ShuffleBag(12, random.Random(1))
+    first = [bag.next() for _ in range(12)]
+    second = [bag.next() for _ in range(12)]
+    assert sorted(first) == sorted(second) == list(range(12))
+    assert first[-1] != second[0]
+
+
+def test_sample_does_not_repeat_until_exhausted(tmp_path, monkeypatch):
+    corpus = _corpus(tmp_path, monkeypatch)
+    assert corpus._data is None  # nothing opened until first use
+    seen = [corpus.sample() for _ in range(50)]
+    assert len(set(seen)) == 50
+    assert corpus.fact(7) == 'fact 7 ✓'
+    assert corpus.tags() == {'behavior': 25, 'species': 25, 'care': 10}
+    corpus.close()
+
+
+def test_tag_filter_draws_each_tagged_fact_once(tmp_path, monkeypatch):
+    corpus = _corpus(tmp_path, monkeypatch)
+    # 25 behavior facts plus 5 odd care ones; 0, 10, 20, ... carry both tags
+    drawn = [corpus.sample(('care', 'behavior')) for _ in range(30)]
+    nums = {int(f.split()[1]) for f in drawn}
+    assert len(nums) == 30
+    assert all(i % 2 == 0 or i % 5 == 0 for i in nums)
+    assert corpus.sample('missing') is None
+
+
+def test_stale_or_missing_index_is_rebuilt_in_memory(tmp_path, monkeypatch):
+    corpus = _corpus(tmp_path, monkeypatch, n=10)
+    path = tmp_path / 'facts.en.tsv'
+    path.write_text('behavior\tonly fact\n', encoding='utf-8')
+    # the 10-fact index is still on disk but no longer matches the text
+    assert os.path.exists(corpus.index_path)
+    stale = FactCorpus(str(path))
+    assert len(stale) == 1 and stale.sample() == 'only fact'
+    unindexed = _corpus(tmp_path, monkeypatch, n=4, index=False)
+    os.remove(unindexed.index_path)
+    assert len(unindexed) == 4
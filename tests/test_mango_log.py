@@ -0,0 +1,58 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import mango_log
+from mango_log import Logger, DEBUG, INFO, WARNING, ERROR, OFF
+
+
+class Loud:
+    formatted = 0
+
+    def __str__(self):
+        Loud.formatted += 1
+        return 'loud'
+
+
+def test_disabled_levels_are_noops_and_never_format(capsys):
+    log = Logger('assets', 'warning')
+    log.debug('sprite %s', Loud())
+    log.info('sprite %s', Loud())
+    assert Loud.formatted == 0 and not log.ring
+    assert log.debug is mango_log._noop
+
+    log.warning('missing %s', Loud())
+    assert Loud.formatted == 1
+    assert capsys.readouterr().out == '[assets] missing loud\n'
+
+    log.level = 'debug'
+    log.debug('now %s', 'shown')
+    assert log.ring[-1][2] == 'now shown'
+    log.level = OFF
+    log.error('hidden')
+    assert capsys.readouterr().out == '[assets] now shown\n'
+
+
+def test_mango_debug_config():
+    assert mango_log.parse_config('1') == (DEBUG, {})
+    assert mango_log.parse_config('0') == (None, {})
+    assert mango_log.parse_config('info') == (INFO, {})
+    assert mango_log.parse_config('assets, WASM') == (None, {'assets': DEBUG, 'wasm': DEBUG})
+    assert mango_log.parse_config('warning,audio=info,db=off') == (WARNING, {'audio': INFO, 'db': OFF})
+
+
+def test_reset_relevels_existing_loggers():
+    log = mango_log.get_logger('test_category')
+    try:
+        mango_log.reset('test_category=debug')
+        assert log.level == DEBUG and mango_log.configured('test_category')
+        mango_log.reset('error')
+        assert log.level == ERROR
+        assert mango_log.level_for('other', default=INFO) == ERROR
+    finally:
+        mango_log.reset()
+    assert log.level == mango_log.level_for('test_category')
+    assert mango_log.get_logger('test_category') is log
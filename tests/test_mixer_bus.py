@@ -0,0 +1,71 @@
+import sys
+import os
+import json
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from mixer_bus import MixerBuses, SettingsStore, bus_property
+
+
+class _Game:
+    master_volume = bus_property('master')
+    sfx_volume = bus_property('sfx')
+
+    def __init__(self):
+        self.buses = MixerBuses(master=0.5, sfx=0.8)
+
+
+def test_bus_gains_dirty_flag_and_properties():
+    game = _Game()
+    buses = game.buses
+    assert buses.consume() and not buses.consume()
+    assert abs(buses.sfx_gain - 0.4) < 1e-9
+    game.master_volume = 1.5
+    assert game.master_volume == 1.0
+    assert buses.consume()
+    # setting the same value again is not a change
+    game.master_volume = 1.0
+    assert not buses.consume()
+    buses.load_settings({'music_volume': 0.25, 'unknown': 3})
+    assert buses.get('music') == 0.25
+
+
+def test_settings_write_is_debounced(tmp_path):
+    now = [0.0]
+    path = str(tmp_path / 'db' / 'settings.json')
+    store = SettingsStore(path, debounce=0.5, clock=lambda: now[0])
+    for i in range(10):
+        now[0] = i * 0.1
+        store.schedule({'master_volume': i / 10.0})
+        assert not store.tick()
+    now[0] = 1.5
+    assert store.tick()
+    assert store.writes == 1
+    with open(path) as f:
+        assert json.load(f) == {'master_volume': 0.9}
+    assert store.load() == {'master_volume': 0.9}
+
+
+def test_end_frame_applies_changed_bus_gain_to_mixer_music(monkeypatch):
+    from types import SimpleNamespace
+    import audio
+    volumes = []
+    music = SimpleNamespace(set_volume=volumes.append)
+    mixer = SimpleNamespace(get_init=lambda: True, music=music)
+    monkeypatch.setattr(audio, 'pygame', SimpleNamespace(mixer=mixer))
+    monkeypatch.setattr(audio, 'IS_WASM', False)
+    owner = SimpleNamespace(buses=MixerBuses(master=1.0, music=1.0))
+    manager = audio.AudioManager(owner)
+    # a track is playing through pygame.mixer.music
+    owner._music_mode = 'music'
+    manager.end_frame()
+    owner.buses.set('music', 0.5)
+    owner.buses.set('master', 0.5)
+    manager.end_frame()
+    assert volumes and abs(volumes[-1] - 0.25) < 1e-9
+    # nothing changed: the volume is not pushed again
+    count = len(volumes)
+    manager.end_frame()
+    assert len(volumes) == count
@@ -0,0 +1,86 @@
+import sys
+import os
+import wave
+from array import array
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import asset_bundle
+from music_stream import MusicStream, convert, streamable
+
+
+class _Channel:
+    """Mimics Channel.play/queue: a queued sound starts when the current one ends."""
+
+    def __init__(self):
+        self.playing = None
+        self.queued = None
+        self.played = []
+
+    def play(self, snd):
+        self.playing = snd
+        self.played.append(snd)
+
+    def queue(self, snd):
+        self.queued = snd
+
+    def get_queue(self):
+        return self.queued
+
+    def get_busy(self):
+        return self.playing is not None
+
+    def set_volume(self, v):
+        pass
+
+    def stop(self):
+        self.playing = self.queued = None
+
+    def finish_current(self):
+        self.playing, self.queued = self.queued, None
+        if self.playing is not None:
+            self.played.append(self.playing)
+
+
+def _write_wav(path, frames, rate=8000, channels=2):
+    samples = array('h', [i % 1000 for i in range(frames * channels)])
+    with wave.open(str(path), 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(samples.tobytes())
+
+
+def test_convert_decimates_and_remixes():
+    stereo = array('h', [1, 2, 3, 4, 5, 6, 7, 8]).tobytes()
+    assert array('h', convert(stereo, 44100, 2, 22050, 2)).tolist() == [1, 2, 5, 6]
+    assert array('h', convert(stereo, 8000, 2, 8000, 1)).tolist() == [1, 3, 5, 7]
+    mono = array('h', [1, 2]).tobytes()
+    assert array('h', convert(mono, 8000, 1, 8000, 2)).tolist() == [1, 1, 2, 2]
+
+
+def test_stream_queues_bounded_chunks_and_loops(tmp_path, monkeypatch):
+    monkeypatch.setenv('MANGO_ASSET_BUNDLE', '0')
+    asset_bundle.reset()
+    path = str(tmp_path / 'song.wav')
+    # 1 second at 8 kHz, streamed in 250 ms chunks to a 4 kHz mixer
+    _write_wav(path, 8000)
+    assert streamable(path)
+    ch = _Channel()
+    stream = MusicStream(path, ch, chunk_ms=250, mixer_format=(4000, -16, 2), make_sound=bytes)
+    assert stream.start()
+    # playing + queued + prefetched, nothing more
+    assert stream.chunks_decoded == 3
+    assert len(ch.played[0]) == 1000 * 2 * 2
+    stream.pump()
+    assert stream.chunks_decoded == 3
+    for _ in range(6):
+        ch.finish_current()
+        stream.pump()
+    # the 4-chunk track looped around
+    assert stream.chunks_decoded == 9
+    assert ch.get_busy()
+    stream.stop()
+    assert not ch.get_busy()
@@ -0,0 +1,44 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import perf_harness
+import startup_timing
+
+
+def test_frame_stats_counts_canvas_changes_not_raf_ticks():
+    raf = [i * 1000.0 / 60 for i in range(61)]
+    # the game only changed the canvas on every other tick, with one 100 ms stall
+    changes = [t for i, t in enumerate(raf) if i % 2 == 0 and not 20 < i < 26]
+    stats = perf_harness.frame_stats(raf, changes)
+    assert stats['raf_fps'] == 60.0
+    assert 25 < stats['fps'] < 30
+    assert stats['long_frames'] == 1
+    assert stats['frame_ms_p50'] == round(2000.0 / 60, 1)
+    assert perf_harness.frame_stats([], [])['fps'] == 0.0
+
+
+def test_hub_targets_follow_hub_layout():
+    assert perf_harness.hub_target('hub', 1000) is None
+    assert perf_harness.hub_target('flappy', 1000) == (875, 50)
+    assert perf_harness.hub_target('feed', 1000) == (260, 194)
+    assert perf_harness.hub_target('tickle', 1000) == (740, 326)
+
+
+def test_format_report_compares_with_baseline():
+    base = {'scenes': {'hub': {'ttff_ms': 900.0, 'fps': 50.0}}}
+    report = {'scenes': {'hub': {'ttff_ms': 800.0, 'fps': 45.0, 'tti_ms': None}}}
+    line, = perf_harness.format_report(report, base)
+    assert 'ttff_ms 800.0ms (-100.0, better)' in line
+    assert 'fps 45.0fps (-5.0, worse)' in line
+    assert 'tti_ms' not in line
+
+
+def test_marks_still_recorded_without_a_browser():
+    timer = startup_timing.PhaseTimer()
+    timer.mark('first_frame')
+    startup_timing.browser_mark('scene:hub')
+    assert 'first_frame' in timer.marks
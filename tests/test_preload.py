@@ -0,0 +1,57 @@
+import sys
+import os
+from types import SimpleNamespace
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from preload import Preloader, LoadingScene
+from scenes import Scene, SceneManager
+
+
+def test_cooperative_pump_runs_required_tasks_first():
+    order = []
+    pre = Preloader(threaded=False)
+    pre.add('lazy', lambda: order.append('lazy'), required=False)
+    pre.add('a', lambda: order.append('a'))
+    pre.add('b', lambda: order.append('b'))
+    assert pre.progress == 0.0
+    pre.pump(budget_ms=0)
+    assert order == ['a']
+    assert pre.progress == 0.5
+    pre.pump(budget_ms=0)
+    assert pre.ready and not pre.finished
+    pre.run_all()
+    assert order == ['a', 'b', 'lazy']
+    assert set(pre.timings()) == {'a', 'b', 'lazy'}
+
+
+def test_threaded_preloader_and_ensure():
+    order = []
+    pre = Preloader([('a', lambda: order.append('a'), True),
+                     ('lazy', lambda: order.append('lazy'), False)], threaded=True)
+    pre.start()
+    pre.ensure('lazy')
+    pre.run_all()
+    assert pre.finished
+    assert sorted(order) == ['a', 'lazy']
+
+
+def test_failing_task_still_counts_as_done():
+    def boom():
+        raise RuntimeError('missing file')
+    pre = Preloader([('bad', boom, True)], threaded=False)
+    pre.run_all()
+    assert pre.ready
+
+
+def test_loading_scene_swaps_to_next_scene_when_ready():
+    game = SimpleNamespace(state=None, screen=None)
+    mgr = SceneManager(game)
+    hub = Scene(game)
+    pre = Preloader([('a', lambda: None, True)], threaded=False)
+    mgr.push(LoadingScene(game, pre, lambda: hub))
+    mgr.update(0.016)
+    assert mgr.top is hub
+    assert len(mgr.stack) == 1
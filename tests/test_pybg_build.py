@@ -16,3 +16,109 @@ def test_simulated_build_creates_output(tmp_path):
     with open(index, "r", encoding="utf-8") as fh:
         data = fh.read()
     assert "Mango Web Build (simulated)" in data
+
+
+def _project(root):
+    (root / "assets" / "sub").mkdir(parents=True)
+    (root / "main.py").write_text("print('mango')\n")
+    (root / "assets" / "a.txt").write_text("a")
+    (root / "assets" / "sub" / "b.txt").write_text("b")
+
+
+def test_incremental_build_only_redoes_changed_work(tmp_path, monkeypatch):
+    import package_web
+    _project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    out = "dist/web"
+    first = package_web.build_incremental(out, simulate=True)
+    assert first["copied"] == 3 and first["generated"] == 2
+
+    again = package_web.build_incremental(out, simulate=True)
+    assert (again["copied"], again["generated"], again["hashed"]) == (0, 0, 0)
+    assert again["unchanged"] == 3 and again["seconds"] < 1.0
+
+    (tmp_path / "assets" / "sub" / "b.txt").write_text("bb")
+    os.remove(tmp_path / "assets" / "a.txt")
+    changed = package_web.build_incremental(out, simulate=True)
+    assert (changed["copied"], changed["removed"]) == (1, 1)
+    assert (tmp_path / out / "assets" / "sub" / "b.txt").read_text() == "bb"
+    assert not (tmp_path / out / "assets" / "a.txt").exists()
+
+
+def test_incremental_build_reuses_pygbag_output(tmp_path, monkeypatch):
+    import package_web
+    _project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    runs = []
+
+    def fake_pygbag(output, cwd=None):
+        # stands in for the real pygbag run: an index plus the packed app
+        runs.append(output)
+        with open(os.path.join(output, "index.html"), "w") as fh:
+            fh.write("<html>background-color: transparent;</html>")
+        with open(os.path.join(output, "mango.apk"), "wb") as fh:
+            fh.write(b"apk")
+
+    monkeypatch.setattr(package_web, "_run_pygbag", fake_pygbag)
+    assert package_web.build_incremental("web")["pygbag"] == "ran"
+    assert package_web.build_incremental("web")["pygbag"] == "skipped"
+    (tmp_path / "assets" / "a.txt").write_text("changed")
+    assert package_web.build_incremental("web")["pygbag"] == "ran"
+    (tmp_path / "notes.md").write_text("not a pygbag input")
+    assert package_web.build_incremental("web")["pygbag"] == "skipped"
+    assert len(runs) == 2
+
+
+def test_build_writes_offline_cache(tmp_path, monkeypatch):
+    import json
+    import package_web
+    _project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    package_web.build_incremental("web", simulate=True)
+    manifest = json.loads((tmp_path / "web" / package_web.ASSET_MANIFEST).read_text())
+    assert {"index.html", "main.py", "assets/a.txt", "assets/sub/b.txt"} <= set(manifest["files"])
+    assert package_web.MANIFEST_NAME not in manifest["files"]
+    worker = (tmp_path / "web" / package_web.SERVICE_WORKER).read_text()
+    assert manifest["version"] in worker and manifest["files"]["assets/a.txt"] in worker
+    assert (tmp_path / "web" / "index.html").read_text().count("serviceWorker.register") == 1
+
+    again = package_web.build_incremental("web", simulate=True)
+    assert again["generated"] == 0
+    assert json.loads((tmp_path / "web" / package_web.ASSET_MANIFEST).read_text()) == manifest
+
+    (tmp_path / "assets" / "a.txt").write_text("changed")
+    package_web.build_incremental("web", simulate=True)
+    updated = json.loads((tmp_path / "web" / package_web.ASSET_MANIFEST).read_text())
+    assert updated["version"] != manifest["version"]
+    assert updated["files"]["assets/a.txt"] != manifest["files"]["assets/a.txt"]
+    assert updated["files"]["assets/sub/b.txt"] == manifest["files"]["assets/sub/b.txt"]
+
+
+def test_bundled_build_precaches_the_bundle(tmp_path, monkeypatch):
+    import json
+    import asset_bundle
+    import package_web
+    _project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    first = package_web.build_incremental("web", simulate=True, bundle=True)
+    bundle = asset_bundle.AssetBundle(str(tmp_path / "web" / package_web.BUNDLE))
+    assert bundle.names() == ["assets/a.txt", "assets/sub/b.txt"]
+    bundle.close()
+    manifest = json.loads((tmp_path / "web" / package_web.ASSET_MANIFEST).read_text())
+    assert package_web.BUNDLE in manifest["files"]
+    assert manifest["bundled"] == ["assets/a.txt", "assets/sub/b.txt"]
+    assert '"assets/a.txt"' in (tmp_path / "web" / package_web.SERVICE_WORKER).read_text()
+
+    # index.html, the pythonrc placeholder and the bundle
+    assert first["generated"] == 3
+    assert package_web.build_incremental("web", simulate=True, bundle=True)["generated"] == 0
+
+    (tmp_path / "assets" / "a.txt").write_text("changed")
+    assert package_web.build_incremental("web", simulate=True, bundle=True)["generated"] == 1
+    bundle = asset_bundle.AssetBundle(str(tmp_path / "web" / package_web.BUNDLE))
+    assert bytes(bundle.view("assets/a.txt")) == b"changed"
+    bundle.close()
+
+    # dropping --bundle removes it again
+    package_web.build_incremental("web", simulate=True)
+    assert not (tmp_path / "web" / package_web.BUNDLE).exists()
@@ -0,0 +1,62 @@
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from resources import ResourceManager
+
+
+def test_get_caches_by_key():
+    res = ResourceManager(budget_bytes=1000)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return b'x' * 10
+
+    assert res.get(('a.png', (10, 10), 'smooth'), loader) == b'x' * 10
+    assert res.get(('a.png', (10, 10), 'smooth'), loader) == b'x' * 10
+    assert len(calls) == 1
+    assert res.hits == 1 and res.misses == 1
+    # a different size is a different entry
+    res.get(('a.png', (20, 20), 'smooth'), loader)
+    assert len(calls) == 2
+    assert res.total_bytes == 20
+
+
+def test_lru_eviction_skips_owned_entries():
+    res = ResourceManager(budget_bytes=250)
+    res.get('pinned', lambda: b'p' * 100, owner='flappy')
+    res.get('old', lambda: b'o' * 100)
+    res.get('new', lambda: b'n' * 100)
+    assert 'pinned' in res
+    assert 'old' not in res
+    assert 'new' in res
+    assert res.evictions == 1
+    # releasing the owner makes the entry evictable again
+    res.release('flappy')
+    res.get('newer', lambda: b'w' * 100)
+    assert 'pinned' not in res
+    assert res.total_bytes <= 250
+
+
+def test_missing_resource_is_not_cached():
+    res = ResourceManager()
+    assert res.get('missing', lambda: None) is None
+    assert 'missing' not in res
+    assert res.image('does/not/exist.png') is None
+
+
+def test_memory_report():
+    res = ResourceManager(budget_bytes=1000)
+    res.get('a', lambda: b'a' * 40, owner='game', kind='image')
+    res.get('b', lambda: b'b' * 60, kind='sound')
+    report = res.memory_report()
+    assert report['entries'] == 2
+    assert report['bytes'] == 100
+    assert report['pinned'] == 1
+    assert report['by_kind']['sound'] == {'count': 1, 'bytes': 60}
+    assert report['largest'][0][1] == 60
+    assert res.format_report()[0].startswith('resources: 2 entries')
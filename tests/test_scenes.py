@@ -0,0 +1,83 @@
+import sys
+import os
+from types import SimpleNamespace
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from scenes import Scene, SceneManager, launch
+
+
+class _Recorder(Scene):
+    def __init__(self, game, log, overlay=False):
+        super().__init__(game)
+        self.log = log
+        self.overlay = overlay
+
+    def enter(self, **kwargs):
+        self.log.append((self.name, 'enter'))
+
+    def exit(self):
+        self.log.append((self.name, 'exit'))
+
+    def suspend(self):
+        self.log.append((self.name, 'suspend'))
+
+    def resume(self):
+        self.log.append((self.name, 'resume'))
+
+    def draw(self, surface):
+        self.log.append((self.name, 'draw'))
+
+
+def _game():
+    return SimpleNamespace(state=None, screen=None)
+
+
+def test_push_suspends_and_pop_resumes():
+    game = _game()
+    log = []
+    mgr = SceneManager(game)
+    hub = mgr.get('hub', lambda: _Recorder(game, log))
+    hub.state = 'hub_state'
+    mini = mgr.get('mini', lambda: _Recorder(game, log))
+    mini.state = 'mini_state'
+    mgr.push(hub)
+    mgr.push(mini)
+    assert game.state == 'mini_state'
+    assert hub.suspended
+    mini.close()
+    assert mgr.top is hub
+    assert game.state == 'hub_state'
+    assert log == [('hub', 'enter'), ('hub', 'suspend'), ('mini', 'enter'),
+                   ('mini', 'exit'), ('hub', 'resume')]
+
+
+def test_overlay_draws_scene_below():
+    game = _game()
+    log = []
+    mgr = SceneManager(game)
+    mgr.push(mgr.get('a', lambda: _Recorder(game, log)))
+    mgr.push(mgr.get('b', lambda: _Recorder(game, log)))
+    mgr.push(mgr.get('c', lambda: _Recorder(game, log, overlay=True)))
+    del log[:]
+    mgr.draw(None)
+    assert log == [('b', 'draw'), ('c', 'draw')]
+
+
+def test_launch_reuses_registered_scene():
+    game = _game()
+    game.scenes = SceneManager(game)
+    created = []
+
+    def factory():
+        created.append(1)
+        return Scene(game)
+
+    assert launch(game, 'mini', factory)
+    first = game.scenes.top
+    game.scenes.pop()
+    assert launch(game, 'mini', factory)
+    assert game.scenes.top is first
+    assert len(created) == 1
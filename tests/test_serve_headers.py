@@ -0,0 +1,113 @@
+import os
+import sys
+import gzip
+import urllib.request
+import urllib.error
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import serve_with_headers
+
+
+def _get(url, **headers):
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=2) as resp:
+            return resp.status, resp.headers, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def _site(tmp_path):
+    (tmp_path / 'index.html').write_text('<html>mango</html>')
+    (tmp_path / 'app.js').write_text('console.log("mango");\n' * 200)
+    (tmp_path / 'mango.0123abcd.apk').write_bytes(bytes(range(256)) * 8)
+    written, saved = serve_with_headers.precompress(str(tmp_path))
+    assert written >= 1 and saved > 0
+    return serve_with_headers.start(str(tmp_path))
+
+
+def test_precompressed_etag_and_cache_headers(tmp_path):
+    server, url = _site(tmp_path)
+    try:
+        status, headers, body = _get(url + '/app.js', **{'Accept-Encoding': 'gzip, br;q=0'})
+        assert status == 200 and headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(body) == (tmp_path / 'app.js').read_bytes()
+        assert headers['Cross-Origin-Embedder-Policy'] == 'require-corp'
+        assert headers['Cross-Origin-Opener-Policy'] == 'same-origin'
+        assert headers['Cache-Control'] == serve_with_headers.REVALIDATE
+
+        status, plain, body = _get(url + '/app.js')
+        assert 'Content-Encoding' not in plain and body == (tmp_path / 'app.js').read_bytes()
+        assert plain['ETag'] != headers['ETag']
+
+        status, _, body = _get(url + '/app.js', **{'If-None-Match': plain['ETag']})
+        assert status == 304 and body == b''
+
+        status, headers, _ = _get(url + '/')
+        assert status == 200 and headers['Content-Type'].startswith('text/html')
+    finally:
+        server.shutdown()
+
+
+def test_ranges_on_hashed_assets(tmp_path):
+    server, url = _site(tmp_path)
+    data = (tmp_path / 'mango.0123abcd.apk').read_bytes()
+    try:
+        status, headers, body = _get(url + '/mango.0123abcd.apk', Range='bytes=10-19')
+        assert status == 206 and body == data[10:20]
+        assert headers['Content-Range'] == f'bytes 10-19/{len(data)}'
+        assert headers['Cache-Control'] == serve_with_headers.IMMUTABLE
+
+        status, _, body = _get(url + '/mango.0123abcd.apk', Range='bytes=-4')
+        assert status == 206 and body == data[-4:]
+        status, _, _ = _get(url + '/mango.0123abcd.apk', Range=f'bytes={len(data)}-')
+        assert status == 416
+        # a stale If-Range gets the whole file
+        status, _, body = _get(url + '/mango.0123abcd.apk', Range='bytes=0-0', **{'If-Range': '"old"'})
+        assert status == 200 and body == data
+    finally:
+        server.shutdown()
+
+
+def test_versioned_urls_from_the_asset_manifest_are_immutable(tmp_path):
+    import json
+    import hashlib
+    server, url = _site(tmp_path)
+    digest = hashlib.sha256((tmp_path / 'app.js').read_bytes()).hexdigest()[:12]
+    (tmp_path / serve_with_headers.ASSET_MANIFEST).write_text(json.dumps({'files': {'app.js': digest}}))
+    try:
+        status, headers, _ = _get(url + '/app.js?v=' + digest)
+        assert status == 200 and headers['Cache-Control'] == serve_with_headers.IMMUTABLE
+        # an out-of-date key must not pin the current file forever
+        _, headers, _ = _get(url + '/app.js?v=000000000000')
+        assert headers['Cache-Control'] == serve_with_headers.REVALIDATE
+        _, headers, _ = _get(url + '/app.js')
+        assert headers['Cache-Control'] == serve_with_headers.REVALIDATE
+    finally:
+        server.shutdown()
+
+
+def test_head_then_listing_on_one_connection(tmp_path):
+    import http.client
+    server, url = _site(tmp_path)
+    (tmp_path / 'sub').mkdir()
+    for i in range(40):
+        (tmp_path / 'sub' / f'file_{i:02d}.txt').write_text('x')
+    host, port = server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=2)
+    try:
+        conn.request('HEAD', '/mango.0123abcd.apk', headers={'Range': 'bytes=0-9'})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 206
+        # same keep-alive connection: the listing is not cut to 10 bytes
+        conn.request('GET', '/sub/')
+        resp = conn.getresponse()
+        body = resp.read()
+        assert resp.status == 200 and b'file_39.txt' in body
+    finally:
+        conn.close()
+        server.shutdown()
@@ -0,0 +1,58 @@
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import sprite_cache
+
+
+def test_roundtrip_and_invalidation(tmp_path, monkeypatch):
+    monkeypatch.setenv('MANGO_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('MANGO_SPRITE_CACHE', raising=False)
+    src = tmp_path / 'mango_idle.png'
+    src.write_bytes(b'png-1')
+    size = (2, 2)
+    pixels = bytes(range(16))
+
+    assert sprite_cache.read(str(src), size) is None
+    assert sprite_cache.write(str(src), size, pixels)
+    assert sprite_cache.read(str(src), size) == pixels
+    # a different target size is a different entry
+    assert sprite_cache.read(str(src), (4, 4)) is None
+
+    # touching the source invalidates the entry and the rewrite prunes it
+    old_path = sprite_cache.cache_path(str(src), size)
+    os.utime(src, ns=(1, 1))
+    assert sprite_cache.read(str(src), size) is None
+    sprite_cache.write(str(src), size, pixels)
+    assert not os.path.exists(old_path)
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+
+
+def test_version_bump_and_disable(tmp_path, monkeypatch):
+    monkeypatch.setenv('MANGO_CACHE_DIR', str(tmp_path))
+    src = tmp_path / 'seed.png'
+    src.write_bytes(b'png')
+    sprite_cache.write(str(src), (1, 1), b'abcd')
+    monkeypatch.setattr(sprite_cache, 'PROCESS_VERSION', sprite_cache.PROCESS_VERSION + 1)
+    assert sprite_cache.read(str(src), (1, 1)) is None
+    monkeypatch.setenv('MANGO_SPRITE_CACHE', '0')
+    assert not sprite_cache.write(str(src), (1, 1), b'abcd')
+
+
+def test_sources_sharing_a_basename_keep_their_entries(tmp_path, monkeypatch):
+    monkeypatch.setenv('MANGO_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('MANGO_SPRITE_CACHE', raising=False)
+    (tmp_path / 'feed').mkdir()
+    (tmp_path / 'tickle').mkdir()
+    a = tmp_path / 'feed' / 'mango.png'
+    b = tmp_path / 'tickle' / 'mango.png'
+    a.write_bytes(b'a')
+    b.write_bytes(b'b')
+    size = (1, 1)
+    sprite_cache.write(str(a), size, b'aaaa')
+    sprite_cache.write(str(b), size, b'bbbb')
+    assert sprite_cache.read(str(a), size) == b'aaaa'
+    assert sprite_cache.read(str(b), size) == b'bbbb'
@@ -0,0 +1,65 @@
+import sys
+import os
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench_startup import parse_importtime, subtree
+
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       300 |        300 | site
+import time:        50 |         50 |     _json
+import time:       100 |        150 |   json
+import time:        20 |         20 |   constants
+import time:       400 |        570 | flappy
+"""
+
+
+def test_parse_importtime_subtree():
+    rows = parse_importtime(SAMPLE)
+    assert rows[0] == ('site', 0, 300, 300)
+    row, children = subtree(rows, 'flappy')
+    assert row == ('flappy', 0, 400, 570)
+    assert sorted(name for name, *_ in children) == ['_json', 'constants', 'json']
+
+
+def test_minigames_do_not_import_project():
+    code = ("import sys, flappy, feed_minigame, tickle_minigame, hub_ui; "
+            "assert 'project' not in sys.modules; assert 'PIL' not in sys.modules")
+    proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_phase_timer_groups_and_record(tmp_path, monkeypatch):
+    from startup_timing import PhaseTimer
+    monkeypatch.delenv('MANGO_START_KIND', raising=False)
+    timer = PhaseTimer()
+    timer.lap('fonts')
+    timer.record('sprites:idle', 0.010)
+    timer.record('sprites:happy', 0.005)
+    with timer.phase('db'):
+        pass
+    timings = timer.as_dict()
+    assert set(timings['phases']) == {'fonts', 'sprites:idle', 'sprites:happy', 'db'}
+    assert timings['groups']['sprites'] == 15.0
+
+    import sprite_cache
+    path = str(tmp_path / 'startup.jsonl')
+    monkeypatch.setattr(sprite_cache, 'stats', {'hits': 3, 'misses': 1, 'writes': 1, 'errors': 0})
+    first = timer.finish(path)
+    assert first['start'] == 'cold'
+    assert first['sprite_cache']['misses'] == 1
+    assert 'ready' in first['marks']
+    # a later start of the same version is only warm if the cache served it
+    monkeypatch.setattr(sprite_cache, 'stats', {'hits': 4, 'misses': 0, 'writes': 0, 'errors': 0})
+    assert PhaseTimer().finish(path)['start'] == 'warm'
+    monkeypatch.setattr(sprite_cache, 'stats', {'hits': 0, 'misses': 2, 'writes': 2, 'errors': 0})
+    assert PhaseTimer().finish(path)['start'] == 'cold'
+
+    from startup_timing import start_kind
+    assert start_kind({'hits': 0, 'misses': 0}) == 'unknown'
+    monkeypatch.setenv('MANGO_START_KIND', 'reboot')
+    assert start_kind() == 'reboot'
@@ -0,0 +1,35 @@
+import sys
+import os
+import wave
+import io
+from array import array
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import synth
+
+
+def test_pcm_is_interleaved_and_memoized():
+    data = synth.pcm('tone', 10, 1.0, rate=8000, channels=2, freq=1000)
+    samples = array('h', data)
+    assert len(samples) == 80 * 2
+    # left and right carry the same mono signal
+    assert samples[0::2] == samples[1::2]
+    assert max(samples) > 30000
+    assert synth.pcm('tone', 10, 1.0, rate=8000, channels=2, freq=1000) is data
+
+
+def test_thump_decays_and_chirp_is_enveloped():
+    thump = array('h', synth.pcm('thump', 100, 1.0, rate=8000, channels=1))
+    assert max(map(abs, thump[:200])) > max(map(abs, thump[-200:]))
+    chirp = array('h', synth.pcm('chirp', 50, 1.0, rate=8000, channels=1))
+    assert chirp[0] == 0 and abs(chirp[-1]) < 2000
+
+
+def test_wav_bytes_round_trip():
+    data = synth.wav_bytes('tone', 20, 0.5, rate=8000, channels=2, freq=440)
+    with wave.open(io.BytesIO(data)) as wf:
+        assert (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (2, 2, 8000)
+        assert wf.getnframes() == 160
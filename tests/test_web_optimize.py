@@ -0,0 +1,69 @@
+import os
+import sys
+import wave
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import web_optimize
+
+
+def _wav(path, rate=44100, channels=2, frames=4410):
+    with wave.open(str(path), 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b'\x01\x02' * channels * frames)
+
+
+def test_resample_wav_halves_44k_audio(tmp_path):
+    src, dst = tmp_path / 'in.wav', tmp_path / 'out.wav'
+    _wav(src)
+    assert web_optimize.resample_wav(str(src), str(dst))
+    with wave.open(str(dst), 'rb') as wf:
+        assert wf.getframerate() == web_optimize.WEB_RATE
+        assert wf.getnchannels() == 2 and wf.getsampwidth() == 2
+    assert os.path.getsize(dst) < os.path.getsize(src) * 0.55
+
+
+def test_scale_factor_covers_box_and_never_upscales():
+    assert web_optimize.scale_factor((2048, 1358), (1920, 1080)) == 1920 / 2048
+    assert web_optimize.scale_factor((100, 100), (1920, 1080)) == 1.0
+    # trimmed sprites are measured by their visible area
+    assert web_optimize.scale_factor((408, 612), (120, 100), (240, 200)) == 0.5
+
+
+def test_optimize_file_drops_debug_sounds_and_keeps_music_wav(tmp_path):
+    (tmp_path / 'assets' / 'sounds').mkdir(parents=True)
+    debug = tmp_path / 'assets' / 'sounds' / '_debug.wav'
+    music = tmp_path / 'assets' / 'sounds' / 'home.wav'
+    _wav(debug)
+    _wav(music)
+    out = tmp_path / 'out'
+    report = web_optimize.Report()
+    assert web_optimize.optimize_file(str(debug), str(out), 'assets/sounds/_debug.wav', report) == []
+    # streamed music stays WAV even when an encoder is available
+    outs = web_optimize.optimize_file(str(music), str(out), 'assets/sounds/home.wav', report,
+                                      encoder=('ffmpeg', '/nonexistent/ffmpeg'))
+    assert outs == ['assets/sounds/home.wav']
+    assert report.after < report.before / 3
+    assert 'saved' in report.format()[0]
+
+
+def test_optimized_build_reports_savings(tmp_path, monkeypatch):
+    import package_web
+    (tmp_path / 'assets' / 'sounds').mkdir(parents=True)
+    (tmp_path / 'main.py').write_text("print('mango')\n")
+    _wav(tmp_path / 'assets' / 'sounds' / 'home.wav')
+    _wav(tmp_path / 'assets' / 'sounds' / '_flap_debug.wav')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(web_optimize, 'find_encoder', lambda: None)
+    stats = package_web.build_incremental('web', simulate=True, optimize=True)
+    assert stats['report'].after < stats['report'].before
+    assert not (tmp_path / 'web' / 'assets' / 'sounds' / '_flap_debug.wav').exists()
+    again = package_web.build_incremental('web', simulate=True, optimize=True)
+    assert again['copied'] == 0 and again['unchanged'] == 3
+    # switching optimization off redoes every output
+    plain = package_web.build_incremental('web', simulate=True)
+    assert plain['copied'] == 3 and (tmp_path / 'web' / 'assets' / 'sounds' / '_flap_debug.wav').exists()
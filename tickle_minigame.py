@@ -1,8 +1,8 @@
 """Simple Tickle minigame: click Mango to tickle him and increase happiness.
 
-Exports: play_tickle_minigame(game, tickle_state, exit_state)
+Exports: play_tickle_minigame(game, tickle_state, exit_state), which pushes a
+`TickleScene` onto the game's scene stack.
 """
-import time
 import random
 try:
     import pygame
@@ -11,168 +11,174 @@ except Exception:
 import math
 import os
 
-try:
-    import project as _project
-except Exception:
-    _project = None
+import constants as _constants
 
+from scenes import Scene, launch
+from resources import get_resources
+import asset_bundle
 
-def play_tickle_minigame(game, tickle_state, exit_state):
-    try:
-        game.state = tickle_state
-    except Exception:
-        pass
 
-    SCREEN_WIDTH = getattr(_project, 'SCREEN_WIDTH', game.screen.get_width())
-    SCREEN_HEIGHT = getattr(_project, 'SCREEN_HEIGHT', game.screen.get_height())
-    FPS = getattr(_project, 'FPS', 60)
+class TickleScene(Scene):
+    """Click the wandering Mango; SPACE starts, R restarts, ESC returns."""
+
+    name = 'tickle'
+    # use same minigame music as others: 'forest'
+    music = 'forest'
+    pausable = True
+    transition = True
 
-    # use floats for smooth movement
-    mango_x = float(SCREEN_WIDTH // 2)
-    mango_y = float(SCREEN_HEIGHT // 2)
     mango_w = 120
     mango_h = 96
-
-    # movement state
-    vx = 0.0
-    vy = 0.0
     # increase base speed to make the mini-game more challenging
     speed = 480.0  # px per second approximate (was 220)
-
-    particles = []
-    clock = pygame.time.Clock() if pygame else None
-    tickles = 0
     target = 12
-    running = True
-    started = False
-    show_instructions = True
-    show_end = False
-    end_message = ""
-    # Try to load easter-egg image 'ericv.png' (optional)
-    eric_img = None
-    try:
+
+    def __init__(self, game, tickle_state=None, exit_state=None):
+        super().__init__(game)
+        self.state = tickle_state
+        self.exit_state = exit_state
+        self.screen_w = getattr(_constants, 'SCREEN_WIDTH', game.screen.get_width())
+        self.screen_h = getattr(_constants, 'SCREEN_HEIGHT', game.screen.get_height())
+        self.eric_path = None
+        self.reset()
+
+    def reset(self):
+        # use floats for smooth movement
+        self.mango_x = float(self.screen_w // 2)
+        self.mango_y = float(self.screen_h // 2)
+        self.vx = 0.0
+        self.vy = 0.0
+        self.tickles = 0
+        self.started = False
+        self.show_instructions = True
+        self.show_end = False
+        self.end_message = ""
+
+    # --- lifecycle -----------------------------------------------------------
+    def enter(self, **kwargs):
+        if self.eric_path is None:
+            self._find_resources()
+        self.reset()
+
+    def exit(self):
+        try:
+            if self.exit_state is not None:
+                self.game.state = self.exit_state
+        except Exception:
+            pass
+        get_resources(self.game).release(self.name)
+
+    def _find_resources(self):
+        # Locate the optional easter-egg image 'ericv.png'; it is loaded and
+        # scaled through the ResourceManager the first time it is drawn
+        self.eric_path = ''
         possible_paths = [
             os.path.join('assets', 'sprites', 'ericv.png'),
             os.path.join('assets', 'ericv.png'),
             'ericv.png'
         ]
         for p in possible_paths:
-            try:
-                if os.path.exists(p):
-                    im = pygame.image.load(p)
-                    eric_img = im.convert_alpha()
-                    break
-            except Exception:
-                continue
-    except Exception:
-        eric_img = None
+            if asset_bundle.exists(p):
+                self.eric_path = p
+                break
 
-    # Play cheerful music for tickle (use same minigame music as others: 'forest')
-    try:
-        if getattr(game, '_music_started', False):
-            game._play_music('forest')
-        else:
-            game._queued_music = 'forest'
-    except Exception:
-        pass
+    def _scaled(self, source, size):
+        """Return source scaled to size, cached across frames."""
+        return get_resources(self.game).scaled(source, size, owner=self.name)
 
-    last_time = time.time()
-    while running and getattr(game, 'state', None) == tickle_state:
-        now = time.time()
-        dt = now - last_time if now > last_time else 1.0 / FPS
-        last_time = now
+    # --- input ---------------------------------------------------------------
+    def handle_event(self, event):
+        game = self.game
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.close()
+                return
+            if not self.started:
+                # space to start
+                if event.key == pygame.K_SPACE:
+                    self.started = True
+                    self.show_instructions = False
+            elif self.show_end and event.key == pygame.K_r:
+                # reset game (Mango keeps its position)
+                x, y = self.mango_x, self.mango_y
+                self.reset()
+                self.mango_x, self.mango_y = x, y
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.started and not self.show_end:
+            mx, my = event.pos
+            mango_w, mango_h = self.mango_w, self.mango_h
+            rect = pygame.Rect(self.mango_x - mango_w // 2, self.mango_y - mango_h // 2, mango_w, mango_h)
+            if rect.collidepoint(mx, my):
+                self.tickles += 1
+                # spawn particle on sprite
+                try:
+                    if hasattr(game, 'particle_system') and game.particle_system:
+                        game.particle_system.add_button_effect(mx, my, 'tickle')
+                        game.particle_system.add_sprite_animation('tickle')
+                except Exception:
+                    pass
+                try:
+                    game._play_sfx('chirp')
+                except Exception:
+                    pass
+                if self.tickles >= self.target:
+                    try:
+                        game.mango_state['happiness'] = min(100, game.mango_state.get('happiness', 0) + 20)
+                        if hasattr(game, 'misbehavior_count'):
+                            game.misbehavior_count = max(0, game.misbehavior_count - 2)
+                        game.save_state()
+                    except Exception:
+                        pass
+                    # end state
+                    self.show_end = True
+                    self.end_message = "Congrats! Mango had fun!"
 
-        if pygame:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                    break
-                elif event.type == pygame.KEYDOWN:
-                    if not started:
-                        # space to start
-                        if event.key == pygame.K_SPACE:
-                            started = True
-                            show_instructions = False
-                        elif event.key == pygame.K_ESCAPE:
-                            running = False
-                            break
-                    else:
-                        if event.key == pygame.K_ESCAPE:
-                            running = False
-                            break
-                        if show_end:
-                            if event.key == pygame.K_r:
-                                # reset game
-                                tickles = 0
-                                started = False
-                                show_instructions = True
-                                show_end = False
-                                end_message = ""
-                        
-                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and started and not show_end:
-                    mx, my = event.pos
-                    rect = pygame.Rect(mango_x - mango_w//2, mango_y - mango_h//2, mango_w, mango_h)
-                    if rect.collidepoint(mx, my):
-                        tickles += 1
-                        # spawn particle on sprite
-                        try:
-                            if hasattr(game, 'particle_system') and game.particle_system:
-                                # spawn directly over sprite
-                                game.particle_system.add_button_effect(mx, my, 'tickle')
-                                game.particle_system.add_sprite_animation('tickle')
-                        except Exception:
-                            pass
-                        try:
-                            game._play_sfx('chirp')
-                        except Exception:
-                            pass
-                        if tickles >= target:
-                            try:
-                                game.mango_state['happiness'] = min(100, game.mango_state.get('happiness', 0) + 20)
-                                if hasattr(game, 'misbehavior_count'):
-                                    game.misbehavior_count = max(0, game.misbehavior_count - 2)
-                                game.save_state()
-                            except Exception:
-                                pass
-                            # end state
-                            show_end = True
-                            end_message = "Congrats! Mango had fun!"
+    # --- simulation ----------------------------------------------------------
+    def update(self, dt):
+        mango_w, mango_h = self.mango_w, self.mango_h
+        if self.started and not self.show_end:
+            # choose a new random velocity target often for erratic wandering
+            if random.random() < 0.08:
+                angle = random.uniform(0, 2 * math.pi)
+                mult = random.uniform(0.7, 1.4)
+                self.vx = math.cos(angle) * self.speed * mult
+                self.vy = math.sin(angle) * self.speed * mult
+            # integrate movement scaled by dt (keep as floats for smoothness)
+            self.mango_x += self.vx * dt
+            self.mango_y += self.vy * dt
+            self.mango_x = max(float(mango_w // 2), min(float(self.screen_w - mango_w // 2), self.mango_x))
+            self.mango_y = max(float(mango_h // 2), min(float(self.screen_h - mango_h // 2), self.mango_y))
+        try:
+            if hasattr(self.game, 'particle_system') and self.game.particle_system:
+                self.game.particle_system.update(dt)
+        except Exception:
+            pass
 
-        # draw
+    # --- rendering -----------------------------------------------------------
+    def draw(self, surface):
+        game = self.game
+        SCREEN_WIDTH = self.screen_w
+        mango_x, mango_y = self.mango_x, self.mango_y
+        mango_w, mango_h = self.mango_w, self.mango_h
         try:
             try:
                 game.draw_hub_background()
             except Exception:
-                game.screen.fill((135,206,250))
+                surface.fill((135, 206, 250))
             # title
             try:
-                t = game.title_font.render('Tickle Mango!', True, (255,255,255))
-                game.screen.blit(t, t.get_rect(center=(SCREEN_WIDTH//2, 60)))
+                t = game.title_font.render('Tickle Mango!', True, (255, 255, 255))
+                surface.blit(t, t.get_rect(center=(SCREEN_WIDTH // 2, 60)))
             except Exception:
                 pass
-                # draw mango: movement when started
+            # draw mango: moving sprite when started
             sprite_drawn = False
             try:
-                if started and not show_end:
-                    # move mango randomly across screen - more frequent and faster wandering
-                    # choose a new random velocity target more often for erratic motion
-                    if random.random() < 0.08:
-                        angle = random.uniform(0, 2 * math.pi)
-                        mult = random.uniform(0.7, 1.4)
-                        vx = math.cos(angle) * speed * mult
-                        vy = math.sin(angle) * speed * mult
-                    # integrate movement scaled by dt (keep as floats for smoothness)
-                    mango_x += vx * dt
-                    mango_y += vy * dt
-                    # bounds
-                    mango_x = max(float(mango_w//2), min(float(SCREEN_WIDTH - mango_w//2), mango_x))
-                    mango_y = max(float(mango_h//2), min(float(SCREEN_HEIGHT - mango_h//2), mango_y))
-                    # show moving sprite if available (mango_still when flying/moving)
+                if self.started and not self.show_end:
                     try:
                         if hasattr(game, 'mango_sprites') and game.mango_sprites.get('still'):
                             sp = game.mango_sprites.get('still')
-                            s = pygame.transform.smoothscale(sp, (mango_w, mango_h))
-                            game.screen.blit(s, s.get_rect(center=(int(mango_x), int(mango_y))))
+                            s = self._scaled(sp, (mango_w, mango_h))
+                            surface.blit(s, s.get_rect(center=(int(mango_x), int(mango_y))))
                             sprite_drawn = True
                     except Exception:
                         sprite_drawn = False
@@ -183,149 +189,121 @@ def play_tickle_minigame(game, tickle_state, exit_state):
                         sprite_name = None
                         if hasattr(game, 'particle_system') and game.particle_system:
                             sprite_name = game.particle_system.get_current_sprite(None)
-                        if sprite_name and sprite_name.replace('mango_','') in getattr(game, 'mango_sprites', {}):
-                            sp = game.mango_sprites.get(sprite_name.replace('mango_',''))
+                        if sprite_name and sprite_name.replace('mango_', '') in getattr(game, 'mango_sprites', {}):
+                            sp = game.mango_sprites.get(sprite_name.replace('mango_', ''))
                         else:
                             sp = game.mango_sprites.get(mood if mood in game.mango_sprites else 'idle')
                         if sp:
-                            s = pygame.transform.smoothscale(sp, (mango_w, mango_h))
-                            game.screen.blit(s, s.get_rect(center=(int(mango_x), int(mango_y))))
+                            s = self._scaled(sp, (mango_w, mango_h))
+                            surface.blit(s, s.get_rect(center=(int(mango_x), int(mango_y))))
                             sprite_drawn = True
                     except Exception:
                         sprite_drawn = False
                 if not sprite_drawn:
-                    pygame.draw.ellipse(game.screen, (255,152,0), (int(mango_x) - mango_w//2, int(mango_y) - mango_h//2, mango_w, mango_h))
+                    pygame.draw.ellipse(surface, (255, 152, 0), (int(mango_x) - mango_w // 2, int(mango_y) - mango_h // 2, mango_w, mango_h))
             except Exception:
                 try:
-                    pygame.draw.ellipse(game.screen, (255,152,0), (int(mango_x) - mango_w//2, int(mango_y) - mango_h//2, mango_w, mango_h))
+                    pygame.draw.ellipse(surface, (255, 152, 0), (int(mango_x) - mango_w // 2, int(mango_y) - mango_h // 2, mango_w, mango_h))
                 except Exception:
                     pass
 
             # draw particles from game's particle system if present (on sprite and hub)
             try:
                 if hasattr(game, 'particle_system') and game.particle_system:
-                    game.particle_system.update(dt)
-                    game.particle_system.draw(game.screen)
+                    game.particle_system.draw(surface)
             except Exception:
                 pass
 
-            # progress / instructions / end messages (Flappy-like board styling)
-            try:
-                panel_w = 460
-                panel_h = 220
-                panel_surf = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                # dark panel background similar to Flappy's board
-                panel_surf.fill((24, 24, 24, 230))
-                # subtle border
-                try:
-                    pygame.draw.rect(panel_surf, (255,255,255,30), (0, 0, panel_w, panel_h), 2)
-                except Exception:
-                    pass
-                px = SCREEN_WIDTH // 2 - panel_w // 2
-                py = SCREEN_HEIGHT // 2 - panel_h // 2 + 40
+            self._draw_panel(surface)
+        except Exception:
+            pass
 
-                if not started and show_instructions:
-                    # draw panel and instructions
-                    try:
-                        # draw background panel as subtle backdrop
-                        game.screen.blit(panel_surf, (px, py))
+    def _draw_panel(self, surface):
+        """Progress / instructions / end messages (Flappy-like board styling)."""
+        game = self.game
+        SCREEN_WIDTH, SCREEN_HEIGHT = self.screen_w, self.screen_h
+        try:
+            panel_w = 460
+            panel_h = 220
+            panel_surf = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+            # dark panel background similar to Flappy's board
+            panel_surf.fill((24, 24, 24, 230))
+            try:
+                pygame.draw.rect(panel_surf, (255, 255, 255, 30), (0, 0, panel_w, panel_h), 2)
+            except Exception:
+                pass
+            px = SCREEN_WIDTH // 2 - panel_w // 2
+            py = SCREEN_HEIGHT // 2 - panel_h // 2 + 40
 
-                        # Position Eric to the right of the panel, even larger
-                        eric_w, eric_h = 600, 600
-                        # Position Eric so he slightly overlaps the panel (keeps him visible)
-                        eric_x = px + panel_w - (eric_w // 3)
-                        # lower Eric vertically so he sits more naturally beside the panel
-                        eric_y = py + (panel_h // 2) - (eric_h // 2) + 120
-                        if eric_img:
-                            try:
-                                ers = pygame.transform.smoothscale(eric_img, (eric_w, eric_h))
-                                game.screen.blit(ers, ers.get_rect(topleft=(eric_x, eric_y)))
-                            except Exception:
-                                pass
+            if not self.started and self.show_instructions:
+                try:
+                    surface.blit(panel_surf, (px, py))
 
-                        # Draw a speech-bubble style instruction box that matches
-                        # the overlay area of the grey panel so text stays readable
-                        bubble_x = px + 12
-                        bubble_y = py + 18
-                        bubble_w = panel_w - 36
-                        bubble_h = panel_h - 64
-                        bubble_rect = pygame.Rect(bubble_x, bubble_y, bubble_w, bubble_h)
+                    # Position Eric to the right of the panel, even larger
+                    eric_w, eric_h = 600, 600
+                    # Position Eric so he slightly overlaps the panel (keeps him visible)
+                    eric_x = px + panel_w - (eric_w // 3)
+                    # lower Eric vertically so he sits more naturally beside the panel
+                    eric_y = py + (panel_h // 2) - (eric_h // 2) + 120
+                    if self.eric_path:
                         try:
-                            # light bubble with dark border (no pointer)
-                            pygame.draw.rect(game.screen, (255,255,255), bubble_rect, border_radius=14)
-                            pygame.draw.rect(game.screen, (30,30,30), bubble_rect, 2, border_radius=14)
+                            ers = self._scaled(self.eric_path, (eric_w, eric_h))
+                            surface.blit(ers, ers.get_rect(topleft=(eric_x, eric_y)))
                         except Exception:
                             pass
 
-                        title = getattr(game, 'title_font', None)
-                        lf = getattr(game, 'large_font', None)
-                        sf = getattr(game, 'small_font', None)
-                        # Center the title and lines inside the bubble for better readability
-                        try:
-                            if title:
-                                t = title.render('Tickle Mango!', True, (20,20,20))
-                                game.screen.blit(t, t.get_rect(center=(bubble_x + bubble_w // 2, bubble_y + 26)))
-                            lines = [
-                                "Click on Mango to tickle him!",
-                                "Mango will fly around once the game starts.",
-                                "Controls: Click = Tickle, SPACE = Start, ESC = Back"
-                            ]
-                            for i, ln in enumerate(lines):
-                                if sf:
-                                    txt = sf.render(ln, True, (30,30,30))
-                                    txt_rect = txt.get_rect(center=(bubble_x + bubble_w // 2, bubble_y + 62 + i * 28))
-                                    game.screen.blit(txt, txt_rect)
-                        except Exception:
-                            pass
+                    # Speech-bubble style instruction box over the grey panel
+                    bubble_x = px + 12
+                    bubble_y = py + 18
+                    bubble_w = panel_w - 36
+                    bubble_h = panel_h - 64
+                    bubble_rect = pygame.Rect(bubble_x, bubble_y, bubble_w, bubble_h)
+                    try:
+                        pygame.draw.rect(surface, (255, 255, 255), bubble_rect, border_radius=14)
+                        pygame.draw.rect(surface, (30, 30, 30), bubble_rect, 2, border_radius=14)
                     except Exception:
                         pass
-                elif show_end:
+
+                    title = getattr(game, 'title_font', None)
+                    sf = getattr(game, 'small_font', None)
                     try:
-                        # draw panel and end message
-                        game.screen.blit(panel_surf, (px, py))
-                        lf = getattr(game, 'large_font', None)
-                        sf = getattr(game, 'small_font', None)
-                        if lf:
-                            msg = lf.render(end_message or 'Well done!', True, (255,255,255))
-                            game.screen.blit(msg, msg.get_rect(center=(SCREEN_WIDTH//2, py + 70)))
-                        if sf:
-                            hint = sf.render('Press R to play again or ESC to return to hub', True, (220,220,220))
-                            game.screen.blit(hint, hint.get_rect(center=(SCREEN_WIDTH//2, py + 120)))
+                        if title:
+                            t = title.render('Tickle Mango!', True, (20, 20, 20))
+                            surface.blit(t, t.get_rect(center=(bubble_x + bubble_w // 2, bubble_y + 26)))
+                        lines = [
+                            "Click on Mango to tickle him!",
+                            "Mango will fly around once the game starts.",
+                            "Controls: Click = Tickle, SPACE = Start, ESC = Back"
+                        ]
+                        for i, ln in enumerate(lines):
+                            if sf:
+                                txt = sf.render(ln, True, (30, 30, 30))
+                                txt_rect = txt.get_rect(center=(bubble_x + bubble_w // 2, bubble_y + 62 + i * 28))
+                                surface.blit(txt, txt_rect)
                     except Exception:
                         pass
-                else:
-                    txt = game.small_font.render(f"Tickles: {tickles}/{target}", True, (255,255,255))
-                    game.screen.blit(txt, (20, 20))
-            except Exception:
-                pass
-
-            try:
-                game.present()
-            except Exception:
+                except Exception:
+                    pass
+            elif self.show_end:
                 try:
-                    pygame.display.flip()
+                    surface.blit(panel_surf, (px, py))
+                    lf = getattr(game, 'large_font', None)
+                    sf = getattr(game, 'small_font', None)
+                    if lf:
+                        msg = lf.render(self.end_message or 'Well done!', True, (255, 255, 255))
+                        surface.blit(msg, msg.get_rect(center=(SCREEN_WIDTH // 2, py + 70)))
+                    if sf:
+                        hint = sf.render('Press R to play again or ESC to return to hub', True, (220, 220, 220))
+                        surface.blit(hint, hint.get_rect(center=(SCREEN_WIDTH // 2, py + 120)))
                 except Exception:
                     pass
+            else:
+                txt = game.small_font.render(f"Tickles: {self.tickles}/{self.target}", True, (255, 255, 255))
+                surface.blit(txt, (20, 20))
         except Exception:
             pass
 
-        if clock:
-            clock.tick(FPS)
-        else:
-            time.sleep(1.0 / FPS)
-
-    # restore hub music
-    try:
-        game._stop_music()
-        if getattr(game, '_music_started', False):
-            game._play_music('home')
-        else:
-            game._queued_music = 'home'
-    except Exception:
-        pass
 
-    try:
-        game.state = exit_state
-    except Exception:
-        pass
-    return True
+def play_tickle_minigame(game, tickle_state, exit_state):
+    """Push the Tickle mini-game scene onto the game's scene stack."""
+    return launch(game, 'tickle', lambda: TickleScene(game, tickle_state, exit_state))
@@ -0,0 +1,265 @@
+"""Shrink assets for the web build.
+
+package_web runs each file under ``assets/`` through `optimize_file` when
+the build is made with ``--optimize``:
+
+- sounds:
+  - debug leftovers (``sounds/_*``) are dropped;
+  - streamed music (STREAMED_MUSIC) stays a 16-bit PCM WAV, so
+    music_stream can still play it in chunks, but it is resampled to
+    the web mixer preset's rate;
+  - other WAVs are transcoded to OGG Vorbis when ``ffmpeg`` or
+    ``oggenc`` is on PATH; AudioManager.load_sounds already prefers
+    ``.ogg``. Without an encoder they are resampled to 16-bit at the
+    web rate instead.
+- images (needs Pillow; copied unchanged without it):
+  - downscaled to the largest size the game draws them at (IMAGE_RULES).
+    Sprites are measured without their transparent border, because
+    resources._prepare_sprite trims that off before scaling.
+  - JPEGs are re-encoded with progressive, optimized Huffman tables;
+  - PNGs are saved optimized, and as a lossless palette image when they
+    use at most 256 colours.
+  - A recompressed file is kept only if it is smaller.
+- everything else (and ``*.md``) is copied, or dropped, unchanged.
+
+`Report` adds up the bytes saved; package_web prints it after the build.
+"""
+import io
+import os
+import sys
+import wave
+import shutil
+import fnmatch
+import subprocess
+
+import music_stream
+
+# Mixer rate of the 'web' preset in audio_latency.PRESETS
+WEB_RATE = 22050
+OGG_QUALITY = 4
+JPEG_QUALITY = 85
+
+# Played through music_stream in the browser, which needs 16-bit PCM WAV
+STREAMED_MUSIC = ('assets/sounds/home.wav', 'assets/sounds/forest.wav')
+EXCLUDE = ('assets/sounds/_*', '*.md')
+
+# (pattern, (w, h), trim): smallest box the image must still cover when
+# scaled; trim measures the non-transparent area instead of the canvas
+IMAGE_RULES = (
+    # scaled to the screen; the browser canvas can be up to a desktop display
+    ('assets/backgrounds/*', (1920, 1080), False),
+    # mood sprites: hub 100x100, feed 110x88, tickle 120x96
+    ('assets/sprites/mango_*.png', (120, 100), True),
+    ('assets/sprites/seed.png', (28, 28), True),
+    # stretched to 70 px wide pipes up to the screen height
+    ('assets/sprites/tree.png', (70, 1080), False),
+    # tickle easter egg, drawn at 600x600
+    ('assets/sprites/ericv.png', (600, 600), False),
+)
+
+
+class Report:
+    """Bytes in/out per optimized file."""
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, rel, before, after, action):
+        self.rows.append((rel, before, after, action))
+
+    @property
+    def before(self):
+        return sum(r[1] for r in self.rows)
+
+    @property
+    def after(self):
+        return sum(r[2] for r in self.rows)
+
+    def format(self, top=8):
+        saved = self.before - self.after
+        pct = 100.0 * saved / self.before if self.before else 0.0
+        lines = [f'[web_optimize] assets {self.before / 1e6:.2f} MB -> {self.after / 1e6:.2f} MB '
+                 f'(saved {saved / 1e6:.2f} MB, {pct:.0f}%)']
+        rows = sorted(self.rows, key=lambda r: r[2] - r[1])
+        for rel, before, after, action in rows[:top]:
+            if after < before:
+                lines.append(f'  {rel}: {before // 1024} KB -> {after // 1024} KB ({action})')
+        return lines
+
+
+# --- tools -------------------------------------------------------------------
+def _pil():
+    try:
+        from PIL import Image
+        return Image
+    except Exception:
+        return None
+
+
+def find_encoder():
+    """Return ('ffmpeg'|'oggenc', path) for the first OGG encoder on PATH, or None."""
+    for name in ('ffmpeg', 'oggenc'):
+        path = shutil.which(name)
+        if path:
+            return name, path
+    return None
+
+
+def _encode_ogg(encoder, src, dst):
+    name, path = encoder
+    if name == 'ffmpeg':
+        cmd = [path, '-y', '-loglevel', 'error', '-i', src, '-c:a', 'libvorbis',
+               '-q:a', str(OGG_QUALITY), '-ar', str(WEB_RATE), dst]
+    else:
+        cmd = [path, '-Q', '-q', str(OGG_QUALITY), '--resample', str(WEB_RATE), '-o', dst, src]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
+
+# --- audio -------------------------------------------------------------------
+def _pcm16(data, width):
+    """Little-endian PCM of the given sample width -> 16-bit (None if unsupported)."""
+    if width == 2:
+        return data
+    if width == 3:
+        out = bytearray(len(data) // 3 * 2)
+        out[0::2] = data[1::3]
+        out[1::2] = data[2::3]
+        return bytes(out)
+    return None
+
+
+def resample_wav(src, dst, rate=WEB_RATE):
+    """Write src as 16-bit PCM at rate (never upsampled). False if unsupported."""
+    with wave.open(src, 'rb') as wf:
+        channels, width, src_rate = wf.getnchannels(), wf.getsampwidth(), wf.getframerate()
+        data = wf.readframes(wf.getnframes())
+    pcm = _pcm16(data, width)
+    if pcm is None:
+        return False
+    if sys.byteorder == 'big':
+        # music_stream.convert expects little-endian input
+        return False
+    out_rate = min(rate, src_rate)
+    pcm = music_stream.convert(pcm, src_rate, channels, out_rate, channels)
+    with wave.open(dst, 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(out_rate)
+        wf.writeframes(pcm)
+    return True
+
+
+def _optimize_wav(src, out_root, rel, encoder):
+    if rel not in STREAMED_MUSIC and encoder is not None:
+        ogg_rel = rel[:-4] + '.ogg'
+        dst = os.path.join(out_root, ogg_rel)
+        try:
+            _encode_ogg(encoder, src, dst)
+            return ogg_rel, 'ogg'
+        except Exception as e:
+            print(f'[web_optimize] {encoder[0]} failed on {rel}: {e}')
+    dst = os.path.join(out_root, rel)
+    try:
+        if resample_wav(src, dst):
+            return rel, f'{WEB_RATE} Hz'
+    except Exception as e:
+        print(f'[web_optimize] could not resample {rel}: {e}')
+    return None, None
+
+
+# --- images ------------------------------------------------------------------
+def image_rule(rel):
+    for pattern, box, trim in IMAGE_RULES:
+        if fnmatch.fnmatch(rel, pattern):
+            return box, trim
+    return None
+
+
+def scale_factor(size, box, bbox_size=None):
+    """Largest downscale (<= 1) that keeps the measured area covering box."""
+    w, h = bbox_size or size
+    return min(1.0, max(box[0] / float(w), box[1] / float(h)))
+
+
+def _optimize_image(src, dst, rel):
+    Image = _pil()
+    if Image is None:
+        return False, None
+    img = Image.open(src)
+    img.load()
+    fmt = img.format
+    if fmt not in ('PNG', 'JPEG'):
+        return False, None
+    actions = []
+    resized = False
+    rule = image_rule(rel)
+    if rule is not None:
+        box, trim = rule
+        bbox_size = None
+        if trim and img.mode in ('RGBA', 'LA', 'P'):
+            bbox = img.convert('RGBA').split()[-1].getbbox()
+            if bbox:
+                bbox_size = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+        factor = scale_factor(img.size, box, bbox_size)
+        if factor < 1.0:
+            size = (max(1, round(img.width * factor)), max(1, round(img.height * factor)))
+            img = img.resize(size, Image.LANCZOS)
+            resized = True
+            actions.append(f'{size[0]}x{size[1]}')
+    buf = io.BytesIO()
+    if fmt == 'JPEG':
+        img.convert('RGB').save(buf, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        actions.append(f'q{JPEG_QUALITY}')
+    else:
+        if img.mode == 'RGB' and img.getcolors(256) is not None:
+            # exact: every colour fits in the palette
+            img = img.convert('P', palette=Image.ADAPTIVE, colors=256)
+            actions.append('palette')
+        img.save(buf, 'PNG', optimize=True)
+        actions.append('optimized')
+    data = buf.getvalue()
+    if not resized and len(data) >= os.path.getsize(src):
+        # recompression only: keep whichever is smaller
+        return False, None
+    with open(dst, 'wb') as fh:
+        fh.write(data)
+    return True, ' '.join(actions)
+
+
+# --- entry points ------------------------------------------------------------
+def excluded(rel):
+    return any(fnmatch.fnmatch(rel, p) for p in EXCLUDE)
+
+
+def optimize_file(src, out_root, rel, report=None, encoder=None):
+    """Write the optimized form of src (project-relative rel) under out_root.
+
+    Returns the list of output paths relative to out_root ([] if the file
+    is dropped). encoder comes from find_encoder().
+    """
+    if excluded(rel):
+        if report is not None:
+            report.add(rel, os.path.getsize(src), 0, 'dropped')
+        return []
+    before = os.path.getsize(src)
+    dst = os.path.join(out_root, rel)
+    os.makedirs(os.path.dirname(dst) or out_root, exist_ok=True)
+    out_rel, action = rel, None
+    lower = rel.lower()
+    try:
+        if lower.endswith('.wav'):
+            out_rel, action = _optimize_wav(src, out_root, rel, encoder)
+            out_rel = out_rel or rel
+        elif lower.endswith(('.png', '.jpg', '.jpeg')):
+            written, action = _optimize_image(src, dst, rel)
+            if not written:
+                action = None
+    except Exception as e:
+        print(f'[web_optimize] {rel}: {e}; copying unchanged')
+        out_rel, action = rel, None
+    if action is None:
+        shutil.copy2(src, dst)
+    after = os.path.getsize(os.path.join(out_root, out_rel))
+    if report is not None:
+        report.add(rel, before, after, action or 'copied')
+    return [out_rel]